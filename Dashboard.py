@@ -3,6 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import sys
+import json
+import altair as alt
 from PIL import Image
 
 # === PAGE SETUP ===
@@ -14,12 +17,128 @@ st.markdown("Explore national GDP projections and sector-specific forecasts acro
 base_dir = os.path.dirname(os.path.abspath(__file__))
 results_dir = os.path.join(base_dir, "results", "national")
 data_dir = os.path.join(base_dir, "data", "processed")
-
-# === MAIN TABS ===
-main_tab1, main_tab2 = st.tabs(["📊 National GDP", "📂 Sectoral GDP"])
-
-# === NATIONAL GDP TAB ===
-with main_tab1:
+sectoral_store_path = os.path.join(base_dir, "results", "sectoral", "sectoral_results.json")
+release_root = os.path.join(base_dir, "models", "releases")
+sys.path.append(os.path.join(base_dir, "scripts", "common"))
+from artifact_store import ReleaseWatcher
+
+# === STRUCTURED SECTORAL RESULTS (one read, cached until the file changes) ===
+@st.cache_data
+def load_sectoral_results(path, mtime):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def sectoral_results():
+    if not os.path.exists(sectoral_store_path):
+        return {}
+    return load_sectoral_results(sectoral_store_path, os.path.getmtime(sectoral_store_path))
+
+# === NATIONAL RESULTS (published release, swapped in by a background watcher) ===
+NATIONAL_FILES = {
+    "forecast_baseline": os.path.join(results_dir, "gdp_forecast_baseline_2025_2026.csv"),
+    "forecast_reform": os.path.join(results_dir, "gdp_forecast_reform_2027_2030.csv"),
+    "forecast_crisis": os.path.join(results_dir, "gdp_forecast_crisis_2027_2030.csv"),
+    "forecast_mixed": os.path.join(results_dir, "gdp_forecast_mixed_2027_2030.csv"),
+    "sarimax_predictions": os.path.join(data_dir, "sarimax_predictions.csv"),
+    "processed": os.path.join(data_dir, "processed_data.csv")
+}
+
+def read_national_frames(files):
+    return {key: pd.read_csv(files[key]) for key in NATIONAL_FILES}
+
+@st.cache_resource
+def national_release_watcher(root):
+    # One watcher per server: a retrain's pointer swap is loaded off the request path
+    return ReleaseWatcher(root, lambda release: read_national_frames(release["files"])).start()
+
+def national_frames():
+    frames = national_release_watcher(release_root).current
+    if frames is None:
+        # Nothing published yet: the in-place files
+        frames = read_national_frames(NATIONAL_FILES)
+    # Copies, since the tab adds columns and the watcher's frames are shared by every session
+    return {key: frame.copy() for key, frame in frames.items()}
+
+# === FORECAST CUBE (memory-mapped, queried without loading the models) ===
+@st.cache_resource
+def load_forecast_cube(cube_dir, mtime):
+    sys.path.append(os.path.join(base_dir, "scripts", "national"))
+    from forecast_cube import ForecastCube
+    return ForecastCube(cube_dir)
+
+def format_crop_summary(row):
+    return "\n".join([
+        f"📍 Current Production: {row['Current_Production']:,.2f} tonnes",
+        f"🔮 Forecasted Production (10yr avg): {row['Forecasted_Production']:,.2f} tonnes",
+        f"📈 10-Year Growth Rate: {row['Growth_Rate']:.2%}",
+        f"💰 Average Price: ₹{row['Avg_Price']:,.2f}",
+        f"🌱 Soil Score: {row['Soil_Score']}/5",
+        f"🏆 10-Year Investment Score: {row['Score']:,.2f}"
+    ])
+
+# === CHART HELPERS (charts are drawn client-side from the stored series) ===
+THUMB_WIDTH = 800
+
+def series_frame(series, name=None):
+    history = pd.DataFrame({"Year": series["history_years"], "Value": series["history"], "Type": "Historical"})
+    forecast = pd.DataFrame({"Year": series["forecast_years"], "Value": series["forecast"], "Type": "Forecast",
+                             "Lower": series["lower"], "Upper": series["upper"]})
+    frame = pd.concat([history, forecast], ignore_index=True)
+    if name is not None:
+        frame["Series"] = name
+    return frame
+
+def forecast_chart(series, title, y_label):
+    frame = series_frame(series)
+    base = alt.Chart(frame).encode(x=alt.X("Year:O", title="Year"))
+    band = base.transform_filter(alt.datum.Type == "Forecast").mark_area(color="pink", opacity=0.3).encode(
+        y=alt.Y("Lower:Q", title=y_label), y2="Upper:Q")
+    lines = base.mark_line(strokeWidth=2).encode(
+        y=alt.Y("Value:Q", title=y_label),
+        color=alt.Color("Type:N", scale=alt.Scale(domain=["Historical", "Forecast"], range=["blue", "red"])),
+        strokeDash=alt.StrokeDash("Type:N", scale=alt.Scale(domain=["Historical", "Forecast"], range=[[1, 0], [6, 4]])))
+    return (band + lines).properties(title=title, height=380)
+
+@st.cache_data
+def load_thumbnail(path, mtime):
+    # Downsampled copy of a pipeline PNG, cached on disk next to the original
+    thumb_dir = os.path.join(os.path.dirname(path), "thumbs")
+    thumb_path = os.path.join(thumb_dir, os.path.basename(path))
+    if os.path.exists(path) and (not os.path.exists(thumb_path) or os.path.getmtime(thumb_path) < mtime):
+        os.makedirs(thumb_dir, exist_ok=True)
+        image = Image.open(path)
+        image.thumbnail((THUMB_WIDTH, THUMB_WIDTH))
+        image.save(thumb_path)
+    return Image.open(thumb_path)
+
+def static_chart(plot_dir, filename):
+    # Static fallback: prefer the thumbnail cache, build it from the full PNG if needed
+    full_path = os.path.join(plot_dir, filename)
+    thumb_path = os.path.join(plot_dir, "thumbs", filename)
+    if os.path.exists(full_path):
+        return load_thumbnail(full_path, os.path.getmtime(full_path))
+    if os.path.exists(thumb_path):
+        return Image.open(thumb_path)
+    return None
+
+# === VIEWS (only the selected one runs) ===
+# st.tabs runs every tab body on each rerun. A radio picks one view function
+# instead, so an interaction pays only for the view on screen.
+def remembered(widget, label, options, key, **kwargs):
+    # Streamlit drops a widget's state while its view is hidden; the last choice
+    # is kept under a plain session key so it survives switching views
+    options = list(options)
+    last = st.session_state.get(f"{key}_last")
+    default = kwargs.pop("index", 0)
+    choice = widget(label, options, index=options.index(last) if last in options else default, key=key, **kwargs)
+    st.session_state[f"{key}_last"] = choice
+    return choice
+
+def view_selector(views, key):
+    return remembered(st.radio, key, views, key, horizontal=True, label_visibility="collapsed")
+
+# === NATIONAL GDP VIEW ===
+def national_view():
     st.header("National GDP Forecast (1980–2030)")
 
     def clean_columns(df):
@@ -33,12 +152,13 @@ with main_tab1:
         numeric_cols = df.select_dtypes(include="number").columns.tolist()
         return numeric_cols[-1]
 
-    baseline = clean_columns(pd.read_csv(os.path.join(results_dir, "gdp_forecast_baseline_2025_2026.csv")))
-    reform = clean_columns(pd.read_csv(os.path.join(results_dir, "gdp_forecast_reform_2027_2030.csv")))
-    crisis = clean_columns(pd.read_csv(os.path.join(results_dir, "gdp_forecast_crisis_2027_2030.csv")))
-    mixed = clean_columns(pd.read_csv(os.path.join(results_dir, "gdp_forecast_mixed_2027_2030.csv")))
-    sarimax_df = pd.read_csv(os.path.join(data_dir, "sarimax_predictions.csv"))
-    df = pd.read_csv(os.path.join(data_dir, "processed_data.csv"))
+    frames = national_frames()
+    baseline = clean_columns(frames["forecast_baseline"])
+    reform = clean_columns(frames["forecast_reform"])
+    crisis = clean_columns(frames["forecast_crisis"])
+    mixed = clean_columns(frames["forecast_mixed"])
+    sarimax_df = frames["sarimax_predictions"]
+    df = frames["processed"]
 
     for frame in [baseline, reform, crisis, mixed, sarimax_df, df]:
         frame["Year"] = frame["Year"].astype(int)
@@ -67,6 +187,12 @@ with main_tab1:
         for scenario in forecast_df["Scenario"].dropna().unique():
             subset = forecast_df[forecast_df["Scenario"] == scenario]
             ax1.plot(subset["Year"], subset[forecast_col], label=f"{scenario} Forecast", linestyle='--', marker='o', color=scenario_colors.get(scenario, 'gray'))
+            # Widest conformal band written by the forecast stage, if any
+            lower_cols = sorted(col for col in subset.columns if col.startswith("Lower ") and subset[col].notna().all())
+            if lower_cols:
+                upper_col = lower_cols[-1].replace("Lower", "Upper")
+                ax1.fill_between(subset["Year"], subset[lower_cols[-1]], subset[upper_col],
+                                 color=scenario_colors.get(scenario, 'gray'), alpha=0.12)
         ax1.set_xlabel("Year")
         ax1.set_ylabel("GDP Growth (%)")
         ax1.set_title("Actual vs Forecast")
@@ -99,6 +225,19 @@ with main_tab1:
     table.index = table.index.astype(int).astype(str)
     st.dataframe(table.style.format("{:.2f}"), use_container_width=True)
 
+    cube_dir = os.path.join(results_dir, "forecast_cube")
+    if os.path.exists(os.path.join(cube_dir, "forecast_cube.json")):
+        st.subheader("🎛️ Scenario Sensitivity Sweep")
+        cube = load_forecast_cube(cube_dir, os.path.getmtime(os.path.join(cube_dir, "forecast_cube.json")))
+        sweep_col1, sweep_col2 = st.columns(2)
+        sweep_scenario = remembered(sweep_col1.selectbox, "Scenario", cube.scenarios, "sweep_scenario",
+                                    index=min(1, len(cube.scenarios) - 1))
+        sweep_feature = remembered(sweep_col2.selectbox, "Shocked driver (extra drift per year)", cube.features, "sweep_feature")
+        sweep = cube.sweep(sweep_scenario, sweep_feature)
+        sweep.index = [f"{value:+.3g}" for value in sweep.index]
+        sweep.columns = sweep.columns.astype(str)
+        st.dataframe(sweep.style.format("{:.2f}"), use_container_width=True)
+
     st.subheader("🧭 2025 Economic Recommendations")
     rec_path = os.path.join(results_dir, "recommendations_2025.txt")
     if os.path.exists(rec_path):
@@ -107,152 +246,234 @@ with main_tab1:
     else:
         st.warning("⚠️ Recommendations file not found.")
 
-# === SECTORAL GDP TAB ===
-with main_tab2:
-    st.header("📂 Sectoral GDP Forecast (Agriculture & IT)")
-    st.markdown("Explore forecasts for India's agriculture and IT sectors, including investment insights.")
-    st.markdown("---")
+# === AGRICULTURE VIEWS ===
+AGRI_PLOTS_PATH = os.path.join(base_dir, "results", "sectoral", "agriculture", "plots")
+AGRI_REPORTS_PATH = os.path.join(base_dir, "results", "sectoral", "agriculture", "reports")
 
-    agri_tab, it_tab = st.tabs(["🌾 Agriculture Sector", "💻 IT Sector"])
+def agriculture_state_view(agri_results):
+    st.markdown("#### 📑 State Forecast Report")
+    if agri_results:
+        states = sorted(agri_results["states"])
+    else:
+        states = sorted([
+            f.replace("_report.txt", "").replace("_", " ")
+            for f in os.listdir(AGRI_REPORTS_PATH)
+            if f.endswith("_report.txt") and not f.startswith("national")
+        ])
+    selected_state = remembered(st.selectbox, "Select State", states, "agri_state")
+    st.markdown(f"##### 📊 Forecast Plot for {selected_state}")
+    state_series = agri_results.get("series", {}).get(selected_state) if agri_results else None
+
+    if state_series:
+        ranked_crops = [row["Crop"] for row in agri_results["states"].get(selected_state, []) if row["Crop"] in state_series]
+        selected_crop = remembered(st.selectbox, "Select Crop", ranked_crops or list(state_series), "agri_crop")
+        st.altair_chart(
+            forecast_chart(state_series[selected_crop], f"{selected_crop} Production Forecast in {selected_state}",
+                           "Production (tonnes)"),
+            use_container_width=True
+        )
+    else:
+        state_prefix = selected_state.replace(" ", "_")
+        thumb_dir = os.path.join(AGRI_PLOTS_PATH, "thumbs")
+        plot_files = sorted({
+            f for folder in [AGRI_PLOTS_PATH, thumb_dir] if os.path.isdir(folder)
+            for f in os.listdir(folder)
+            if f.startswith(state_prefix) and f.endswith(".png")
+        })
+        for plot_file in plot_files:
+            col_center = st.columns([1, 10, 1])[1]
+            with col_center:
+                st.image(static_chart(AGRI_PLOTS_PATH, plot_file), caption=plot_file, width=THUMB_WIDTH)
+
+    st.markdown(f"##### 📄 Forecast Report for {selected_state}")
+    state_rankings = agri_results["states"].get(selected_state) if agri_results else None
+
+    if state_rankings:
+        top_crop = state_rankings[0]
+        st.code(f"🏆 TOP CROP: {top_crop['Crop'].upper()}\n" + format_crop_summary(top_crop), language="text")
+        st.markdown("###### 📋 Crop Rankings")
+        rankings_df = pd.DataFrame(state_rankings)
+        rankings_df = rankings_df[[col for col in ["Crop", "Score", "Growth_Rate", "Avg_Price", "Soil_Score", "Fit_Method"]
+                                   if col in rankings_df.columns]]
+        st.dataframe(rankings_df.style.format({"Score": "{:,.2f}", "Growth_Rate": "{:.2%}", "Avg_Price": "₹{:,.2f}"}),
+                     use_container_width=True)
+    else:
+        filename = f"{selected_state.replace(' ', '_')}_report.txt"
+        report_path = os.path.join(AGRI_REPORTS_PATH, filename)
+
+        try:
+            with open(report_path, "r", encoding='utf-8') as file:
+                report_text = file.read()
+                st.code(report_text, language="text")
+        except FileNotFoundError:
+            st.warning(f"Report not found for {selected_state}")
+
+def agriculture_picks_view(agri_results):
+    st.markdown("#### 🌐 Investment Recommendations")
+    national_report_path = os.path.join(AGRI_REPORTS_PATH, "national_top_5_report.txt")
+
+    if agri_results and agri_results.get("national_top"):
+        for rank, pick in enumerate(agri_results["national_top"], 1):
+            with st.expander(f"📌 RECOMMENDATION #{rank}: {pick['Crop'].upper()} in {pick['State'].upper()}"):
+                st.markdown("##### 📊 Forecast Summary")
+                st.code(format_crop_summary(pick), language="text")
+
+                if pick.get("Rationale"):
+                    st.markdown("##### 💡 Investment Rationale")
+                    st.markdown(f"🔎 **Why invest in {pick['Crop']} in {pick['State']}?**")
+                    for line in pick["Rationale"]:
+                        st.markdown(f"- {line}")
+                else:
+                    st.info("ℹ️ No rationale available.")
+
+    # Legacy path for reports produced before the structured store existed
+    elif os.path.exists(national_report_path):
+        with open(national_report_path, "r", encoding='utf-8') as file:
+            national_text = file.read()
+
+        # --- Parse rationale blocks ---
+        sections = national_text.split("🏆 RECOMMENDATION")
+        rationale_map = {}
+
+        # Split using "🔍 Why invest in", skip the first empty split
+        rationale_blocks = national_text.split("🔍 Why invest in")[1:]
+
+        for block in rationale_blocks:
+            try:
+                title_line, *content_lines = block.strip().splitlines()
+                title = title_line.replace("?", "").strip().lower()  # e.g., 'jute in west bengal'
+                content = [line.strip('• ').strip() for line in content_lines if line.strip()]
+                rationale_map[title] = content
+            except Exception as e:
+                print(f"Error parsing rationale block: {block[:50]}...", e)
+
+        # --- Render RECOMMENDATION blocks with their rationale ---
+        for rec_section in sections[1:]:
+            lines = rec_section.strip().splitlines()
+            title_line = lines[0].strip()
+
+            # Crop/State extraction
+            crop, state = "UNKNOWN", "UNKNOWN"
+            try:
+                parts = title_line.split(":")[1].strip().split(" in ")
+                crop = parts[0].strip().lower()
+                state = parts[1].strip().lower()
+            except:
+                pass
+
+            lookup_key = f"{crop} in {state}".lower()
+
+            # Trim summary only until rationale starts
+            summary_lines = []
+            for line in lines[1:]:
+                if line.strip().startswith("🔍 Why invest in"):
+                    break
+                summary_lines.append(line)
+            summary_part = "\n".join(summary_lines).strip()
+
+            with st.expander(f"📌 RECOMMENDATION {title_line}"):
+                st.markdown("##### 📊 Forecast Summary")
+                st.code(summary_part, language="text")
+
+                if lookup_key in rationale_map:
+                    st.markdown("##### 💡 Investment Rationale")
+                    st.markdown(f"🔎 **Why invest in {crop.title()} in {state.title()}?**")
+                    for line in rationale_map[lookup_key]:
+                        st.markdown(f"- {line}")
+                else:
+                    st.info("ℹ️ No rationale available.")
+    else:
+        st.warning("National summary report not found.")
 
-    # === AGRICULTURE TAB ===
-    with agri_tab:
-        st.markdown("### 🌱 Agriculture Sector Forecast")
-        st.info("Use the tabs below to view state-level forecasts or national investment opportunities.")
-        state_tab, national_tab = st.tabs(["📍 State-wise Forecast", "🌐 National Investment Picks"])
+def agriculture_view(agri_results):
+    st.markdown("### 🌱 Agriculture Sector Forecast")
+    st.info("Use the selector below to view state-level forecasts or national investment opportunities.")
+    views = {"📍 State-wise Forecast": agriculture_state_view, "🌐 National Investment Picks": agriculture_picks_view}
+    views[view_selector(views, "agri_view")](agri_results)
 
-        AGRI_PLOTS_PATH = os.path.join(base_dir, "results", "sectoral", "agriculture", "plots")
-        AGRI_REPORTS_PATH = os.path.join(base_dir, "results", "sectoral", "agriculture", "reports")
+# === IT VIEW ===
+def it_view(it_results):
+    st.markdown("### 💻 IT Sector Forecast")
+    st.info("View IT revenue trends and top growth states over the next 10 years.")
 
-        with state_tab:
-            st.markdown("#### 📑 State Forecast Report")
-            states = sorted([
-                f.replace("_report.txt", "").replace("_", " ")
-                for f in os.listdir(AGRI_REPORTS_PATH)
-                if f.endswith("_report.txt") and not f.startswith("national")
-            ])
-            selected_state = st.selectbox("Select State", states, key="agri_state")
-            st.markdown(f"##### 📊 Forecast Plot for {selected_state}")
-
-            plot_files = [
-                f for f in os.listdir(AGRI_PLOTS_PATH)
-                if f.startswith(selected_state.replace(" ", "_"))
-            ]
-            for plot_file in plot_files:
-                col_center = st.columns([1, 10, 1])[1]
-                with col_center:
-                    st.image(
-                        Image.open(os.path.join(AGRI_PLOTS_PATH, plot_file)),
-                        caption=plot_file,
-                        width=1000
-                    )
-
-            st.markdown(f"##### 📄 Forecast Report for {selected_state}")
-            filename = f"{selected_state.replace(' ', '_')}_report.txt"
-            report_path = os.path.join(AGRI_REPORTS_PATH, filename)
+    IT_PLOTS_PATH = os.path.join(base_dir, "results", "sectoral", "IT", "plots")
+    IT_REPORTS_PATH = os.path.join(base_dir, "results", "sectoral", "IT", "reports")
 
-            try:
-                with open(report_path, "r", encoding='utf-8') as file:
-                    report_text = file.read()
-                    st.code(report_text, language="text")
-            except FileNotFoundError:
-                st.warning(f"Report not found for {selected_state}")
-
-        with national_tab:
-            st.markdown("#### 🌐 Investment Recommendations")
-            national_report_path = os.path.join(AGRI_REPORTS_PATH, "national_top_5_report.txt")
-
-            if os.path.exists(national_report_path):
-                with open(national_report_path, "r", encoding='utf-8') as file:
-                    national_text = file.read()
-
-                # --- Parse rationale blocks ---
-                sections = national_text.split("🏆 RECOMMENDATION")
-                rationale_map = {}
-
-                # Split using "🔍 Why invest in", skip the first empty split
-                rationale_blocks = national_text.split("🔍 Why invest in")[1:]
-
-                for block in rationale_blocks:
-                    try:
-                        title_line, *content_lines = block.strip().splitlines()
-                        title = title_line.replace("?", "").strip().lower()  # e.g., 'jute in west bengal'
-                        content = [line.strip('• ').strip() for line in content_lines if line.strip()]
-                        rationale_map[title] = content
-                    except Exception as e:
-                        print(f"Error parsing rationale block: {block[:50]}...", e)
-
-                # --- Render RECOMMENDATION blocks with their rationale ---
-                for rec_section in sections[1:]:
-                    lines = rec_section.strip().splitlines()
-                    title_line = lines[0].strip()
-
-                    # Crop/State extraction
-                    crop, state = "UNKNOWN", "UNKNOWN"
-                    try:
-                        parts = title_line.split(":")[1].strip().split(" in ")
-                        crop = parts[0].strip().lower()
-                        state = parts[1].strip().lower()
-                    except:
-                        pass
-
-                    lookup_key = f"{crop} in {state}".lower()
-
-                    # Trim summary only until rationale starts
-                    summary_lines = []
-                    for line in lines[1:]:
-                        if line.strip().startswith("🔍 Why invest in"):
-                            break
-                        summary_lines.append(line)
-                    summary_part = "\n".join(summary_lines).strip()
-
-                    with st.expander(f"📌 RECOMMENDATION {title_line}"):
-                        st.markdown("##### 📊 Forecast Summary")
-                        st.code(summary_part, language="text")
-
-                        if lookup_key in rationale_map:
-                            st.markdown("##### 💡 Investment Rationale")
-                            st.markdown(f"🔎 **Why invest in {crop.title()} in {state.title()}?**")
-                            for line in rationale_map[lookup_key]:
-                                st.markdown(f"- {line}")
-                        else:
-                            st.info("ℹ️ No rationale available.")
-            else:
-                st.warning("National summary report not found.")
-
-
-
-    # === IT TAB ===
-    with it_tab:
-        st.markdown("### 💻 IT Sector Forecast")
-        st.info("View IT revenue trends and top growth states over the next 10 years.")
-
-        IT_PLOTS_PATH = os.path.join(base_dir, "results", "sectoral", "IT", "plots")
-        IT_REPORTS_PATH = os.path.join(base_dir, "results", "sectoral", "IT", "reports")
-
-        trend_path = os.path.join(IT_PLOTS_PATH, "combined_forecast_trends.png")
-        bar_path = os.path.join(IT_PLOTS_PATH, "top3_growth_bar_chart.png")
-        strategy_path = os.path.join(IT_REPORTS_PATH, "top3_investment_strategy.txt")
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### 📈 IT Revenue Trends")
-            if os.path.exists(trend_path):
-                st.image(Image.open(trend_path), use_column_width=True)
-            else:
-                st.warning("IT revenue trend chart not found.")
-
-        with col2:
-            st.markdown("#### 📊 Top 3 States by Growth")
-            if os.path.exists(bar_path):
-                st.image(Image.open(bar_path), use_column_width=True)
-            else:
-                st.warning("Top 3 IT growth chart not found.")
-
-        st.markdown("#### 🧭 Strategic Investment Plan for Top 3 States")
-        if os.path.exists(strategy_path):
-            with open(strategy_path, "r", encoding='utf-8') as file:
-                strategy_text = file.read()
-                st.code(strategy_text, language="text")
+    strategy_path = os.path.join(IT_REPORTS_PATH, "top3_investment_strategy.txt")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 📈 IT Revenue Trends")
+        if it_results and it_results.get("series"):
+            trend_df = pd.concat([series_frame(series, name) for name, series in it_results["series"].items()],
+                                 ignore_index=True)
+            trend_chart = alt.Chart(trend_df).mark_line().encode(
+                x=alt.X("Year:O"),
+                y=alt.Y("Value:Q", title="Revenue (₹ Cr)"),
+                color=alt.Color("Series:N", title="State"),
+                strokeDash=alt.StrokeDash("Type:N", scale=alt.Scale(domain=["Historical", "Forecast"], range=[[1, 0], [6, 4]])),
+                tooltip=["Series", "Year", "Type", alt.Tooltip("Value:Q", format=",.0f")]
+            ).properties(height=380)
+            st.altair_chart(trend_chart, use_container_width=True)
+        elif (chart := static_chart(IT_PLOTS_PATH, "combined_forecast_trends.png")) is not None:
+            st.image(chart, use_column_width=True)
         else:
-            st.warning("Strategy report not found.")
+            st.warning("IT revenue trend chart not found.")
+
+    with col2:
+        st.markdown("#### 📊 Top 3 States by Growth")
+        if it_results and it_results.get("top_strategies"):
+            growth_df = pd.DataFrame([
+                {"State": plan["state"], "Growth": plan["growth_rate"]} for plan in it_results["top_strategies"]
+            ])
+            growth_chart = alt.Chart(growth_df).mark_bar().encode(
+                x=alt.X("State:N", sort=None),
+                y=alt.Y("Growth:Q", title="10-Year Growth Projection", axis=alt.Axis(format="%")),
+                color=alt.Color("State:N", sort=None, legend=None,
+                                scale=alt.Scale(range=["gold", "silver", "lightblue"])),
+                tooltip=["State", alt.Tooltip("Growth:Q", format=".2%")]
+            ).properties(height=380)
+            st.altair_chart(growth_chart, use_container_width=True)
+        elif (chart := static_chart(IT_PLOTS_PATH, "top3_growth_bar_chart.png")) is not None:
+            st.image(chart, use_column_width=True)
+        else:
+            st.warning("Top 3 IT growth chart not found.")
+
+    st.markdown("#### 🧭 Strategic Investment Plan for Top 3 States")
+    if it_results and it_results.get("top_strategies"):
+        for plan in it_results["top_strategies"]:
+            growth_rate = plan["growth_rate"]
+            with st.expander(f"🏆 #{plan['rank']}: {plan['state'].upper()} (Projected Growth: {growth_rate:.2%})", expanded=plan["rank"] == 1):
+                st.markdown("##### Why invest here?")
+                st.markdown("\n".join([
+                    f"- Growth rate ({growth_rate:.2%}) {'exceeds' if growth_rate > plan['national_growth'] else 'is below'} the national average ({plan['national_growth']:.2%})",
+                    f"- Urban Unemployment Rate: {plan['unemployment']:.2f}% (National Avg: {plan['national_unemployment']:.2f}%)",
+                    f"- Internet Penetration: {plan['internet_penetration']:.2f}% (National Avg: {plan['national_internet_penetration']:.2f}%)",
+                    f"- Revenue Volatility: {plan['revenue_volatility']:.2%}",
+                    f"- Forecast Confidence Interval Width: ₹±{plan['conf_width']:.2f} Cr"
+                ]))
+                st.markdown("##### Core allocation")
+                st.markdown("\n".join(f"- {share}% to {target}" for share, target in plan["allocation"]))
+                st.markdown("##### Special initiatives")
+                st.markdown("\n".join(f"- {item}" for item in plan["initiatives"]))
+    elif os.path.exists(strategy_path):
+        with open(strategy_path, "r", encoding='utf-8') as file:
+            strategy_text = file.read()
+            st.code(strategy_text, language="text")
+    else:
+        st.warning("Strategy report not found.")
+
+# === SECTORAL GDP VIEW ===
+def sectoral_view():
+    st.header("📂 Sectoral GDP Forecast (Agriculture & IT)")
+    st.markdown("Explore forecasts for India's agriculture and IT sectors, including investment insights.")
+    st.markdown("---")
+
+    results = sectoral_results()
+    views = {"🌾 Agriculture Sector": (agriculture_view, "agriculture"), "💻 IT Sector": (it_view, "it")}
+    view, section = views[view_selector(views, "sector_view")]
+    view(results.get(section))
+
+# === MAIN VIEW ===
+VIEWS = {"📊 National GDP": national_view, "📂 Sectoral GDP": sectoral_view}
+VIEWS[view_selector(VIEWS, "main_view")]()
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# === pytest setup ===
+# The pipeline modules import each other by bare name (as gdp.py arranges), so
+# the script folders go on sys.path. testing/ holds runnable scripts, not
+# tests; run_all_test.py would launch the whole pipeline on import.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for folder in ["scripts/national", "scripts/sectoral", "scripts/common"]:
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+collect_ignore = ["testing"]
@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import runpy
+
+# === gdp: one entry point for every stage ===
+# python gdp.py <command> [<command> ...]
+# Commands run in order in one process, from the project root, so chained
+# stages share the libraries they import. Nothing heavy is imported here: each
+# command imports its own modules when it runs, and `gdp list`, `recommend` or
+# `validate` never load statsmodels, xgboost or matplotlib. Options stay in the
+# environment variables each stage documents (GDP_COUNTRIES, GDP_EXOG_MODE, ...).
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIRS = ["scripts/national", "scripts/sectoral", "scripts/common"]
+
+
+def _script(path):
+    # Run a script file as __main__, the way `python <path>` would
+    def run():
+        runpy.run_path(os.path.join(ROOT, path), run_name="__main__")
+    return run
+
+
+def _national_stage(name):
+    def run():
+        from pipeline import PlotQueue, country_paths, preprocess, engineer_features, train_sarimax, \
+            train_residual_booster, run_forecasts
+        paths = country_paths()
+        if name == "preprocess":
+            preprocess(paths)
+        elif name == "features":
+            engineer_features(paths)
+        elif name == "sarimax":
+            with PlotQueue() as plots:
+                train_sarimax(paths, plots)
+        elif name == "xgboost":
+            with PlotQueue() as plots:
+                train_residual_booster(paths, plots)
+        elif name == "forecast":
+            run_forecasts(paths)
+    return run
+
+
+def _countries():
+    from pipeline import run_countries
+    run_countries()
+
+
+def _dashboard():
+    import subprocess
+    subprocess.run([sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "Dashboard.py")], check=True)
+
+
+# name -> (description, runner); GROUPS names expand to several commands
+COMMANDS = {
+    "preprocess": ("Stage 1: clean the national indicators", _national_stage("preprocess")),
+    "features": ("Stage 2: lag, rolling and trend features", _national_stage("features")),
+    "sarimax": ("Stage 3: train SARIMAX on GDP growth", _national_stage("sarimax")),
+    "xgboost": ("Stage 4: train the XGBoost residual booster", _national_stage("xgboost")),
+    "forecast": ("Stage 5: baseline and scenario forecasts", _national_stage("forecast")),
+    "recommend": ("Policy recommendations from the baseline forecast", _script("scripts/national/recommendation_engine.py")),
+    "countries": ("Stages 1-5 for every country in GDP_COUNTRIES", _countries),
+    "frequency-bench": ("Quarterly/monthly pipeline benchmark", _script("scripts/national/frequency_benchmark.py")),
+    "cube": ("Build the scenario forecast cube", _script("scripts/national/forecast_cube.py")),
+    "solve": ("Inverse solver for GDP_TARGET_GROWTH in GDP_TARGET_YEAR", _script("scripts/national/inverse_solver.py")),
+    "sensitivity": ("Scenario x year x feature sensitivity tensor", _script("scripts/national/sensitivity.py")),
+    "session": ("Incremental scenario editing demo", _script("scripts/national/scenario_session.py")),
+    "conformal": ("Calibrate conformal forecast intervals", _script("scripts/national/conformal.py")),
+    "direct": ("Train and run the direct multi-horizon models", _script("scripts/national/direct_forecast.py")),
+    "prune": ("Feature pruning report for the residual booster", _script("scripts/national/feature_pruning.py")),
+    "design": ("Rebuild and time the shared design matrix", _script("scripts/national/design_matrix.py")),
+    "registry": ("List model releases and compare versions (GDP_COMPARE)", _script("scripts/national/model_registry.py")),
+    "drivers": ("Project exogenous drivers for all pipelines", _script("scripts/common/driver_forecasts.py")),
+    "agriculture": ("State x crop agricultural forecasts and reports", _script("scripts/sectoral/agriculture.py")),
+    "it": ("State IT revenue forecasts and strategies", _script("scripts/sectoral/ITsector.py")),
+    "reconcile": ("Reconcile sectoral forecasts across the hierarchy", _script("scripts/sectoral/reconciliation.py")),
+    "backtest": ("Backtest the hybrid model on 2020-2024", _script("testing/scripts/backtest.py")),
+    "evaluate": ("Evaluation metrics and scenario plots", _script("testing/scripts/evaluation.py")),
+    "shap": ("SHAP summary of the residual booster", _script("testing/scripts/shap_analysis.py")),
+    "accuracy": ("Directional accuracy of the backtest", _script("testing/scripts/directional_accruracy.py")),
+    "assertions": ("Scenario forecast sanity assertions", _script("testing/scripts/sceanario_assertions.py")),
+    "validate": ("Input data validation", _script("testing/scripts/data_validation.py")),
+    "dashboard-check": ("Check the files the dashboard reads", _script("testing/scripts/dashboard_check.py")),
+    "dashboard": ("Launch the Streamlit dashboard", _dashboard)
+}
+GROUPS = {
+    "national": ["preprocess", "features", "sarimax", "xgboost", "forecast", "recommend"],
+    "sectoral": ["agriculture", "it", "reconcile"],
+    "tests": ["validate", "backtest", "evaluate", "accuracy", "assertions", "dashboard-check"]
+}
+GROUPS["all"] = GROUPS["national"] + GROUPS["sectoral"]
+
+
+def print_commands():
+    print("Usage: python gdp.py <command> [<command> ...]\n")
+    width = max(map(len, list(COMMANDS) + list(GROUPS)))
+    for name, (description, _) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+    print()
+    for name, members in GROUPS.items():
+        print(f"  {name:<{width}}  {' → '.join(members)}")
+
+
+def expand(names):
+    commands = []
+    for name in names:
+        if name in GROUPS:
+            commands.extend(GROUPS[name])
+        elif name in COMMANDS:
+            commands.append(name)
+        else:
+            raise KeyError(name)
+    return commands
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("list", "-h", "--help", "help"):
+        print_commands()
+        return 0
+    try:
+        commands = expand(argv)
+    except KeyError as e:
+        print(f"❌ Unknown command {e}. Run `python gdp.py list` for the available commands.")
+        return 2
+
+    os.chdir(ROOT)
+    for folder in SCRIPT_DIRS:
+        path = os.path.join(ROOT, folder)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    for name in commands:
+        start = time.perf_counter()
+        COMMANDS[name][1]()
+        if len(commands) > 1:
+            print(f"⏱️ gdp {name}: {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
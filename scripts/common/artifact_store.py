@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# === Versioned artifact releases ===
+# Retraining rewrites the models and forecast CSVs in place, so a dashboard or
+# service reading at the wrong moment could get half a file. Writers now go
+# through atomic_output (temp file + os.replace). After stage 5, the pipeline
+# also copies every file a consumer reads into an immutable release directory,
+# <releases>/<version>/, and then swaps the CURRENT pointer file with
+# os.replace. That swap is atomic on Windows too and needs no symlink
+# privilege. A reader resolves the pointer once and gets a complete release.
+# ReleaseWatcher polls the pointer from a background thread and loads a new
+# release off the request path. Consumers only read .current.
+#
+# GDP_PUBLISH=on         publish and make the release current (default)
+# GDP_PUBLISH=candidate  publish without moving CURRENT (promote it later)
+# GDP_PUBLISH=off        write in place only, no release
+# GDP_RELEASE_KEEP=5     old releases kept on disk besides the current one
+# GDP_RELEASE_POLL=2     watcher poll interval in seconds
+PUBLISH = os.environ.get("GDP_PUBLISH", "on").lower()
+RELEASE_KEEP = int(os.environ.get("GDP_RELEASE_KEEP", 5))
+RELEASE_POLL = float(os.environ.get("GDP_RELEASE_POLL", 2))
+POINTER = "CURRENT"
+MANIFEST = "release.json"
+
+
+@contextmanager
+def atomic_output(path):
+    # Yields a temp path next to `path` (same extension, so writers that pick a
+    # format from it still do) and moves it into place only if the write succeeded
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_json(path, payload):
+    with atomic_output(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+
+
+def file_digest(path):
+    # Short content hash (sha256) identifying the data a model was trained on
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def current_version(root):
+    pointer = os.path.join(root, POINTER)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, encoding="utf-8") as f:
+        return json.load(f)["version"]
+
+
+def load_release(root, version=None):
+    # {"version", "published", "metadata", "files": {key: path}} of a release, or None before the first
+    version = version or current_version(root)
+    if version is None:
+        return None
+    folder = os.path.join(root, version)
+    with open(os.path.join(folder, MANIFEST), encoding="utf-8") as f:
+        release = json.load(f)
+    release["files"] = {key: os.path.join(folder, name) for key, name in release["files"].items()}
+    return release
+
+
+def list_releases(root):
+    # Complete release versions, oldest first (the version is a timestamp)
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root)
+                  if not name.startswith(".") and os.path.isfile(os.path.join(root, name, MANIFEST)))
+
+
+def promote(root, version):
+    # Point CURRENT at an existing release; watchers pick it up on their next poll
+    if not os.path.isfile(os.path.join(root, version, MANIFEST)):
+        raise FileNotFoundError(f"No release {version} in {root}")
+    _write_json(os.path.join(root, POINTER), {"version": version, "published": time.strftime("%Y-%m-%d %H:%M:%S")})
+
+
+def publish_release(root, artifacts, metadata=None, keep=None, promote_release=True, log=print):
+    # Copy {key: path} into a new release directory, then point CURRENT at it
+    # (unless it's a candidate). copy2 keeps sizes and mtimes, so fingerprints
+    # taken of the sources still match
+    version = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    staging = os.path.join(root, f".staging-{version}")
+    os.makedirs(staging)
+    files = {}
+    for key, path in artifacts.items():
+        if path and os.path.exists(path):
+            name = os.path.basename(path)
+            shutil.copy2(path, os.path.join(staging, name))
+            files[key] = name
+    manifest = {"version": version, "published": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "metadata": metadata or {}, "files": files}
+    with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # A complete directory first, the pointer last: readers never see a partial release
+    os.rename(staging, os.path.join(root, version))
+    if promote_release:
+        promote(root, version)
+    log(f"🚀 {'Release' if promote_release else 'Candidate release'} {version} published to {root} ({len(files)} artifacts)")
+    prune_releases(root, RELEASE_KEEP if keep is None else keep)
+    return version
+
+
+def prune_releases(root, keep):
+    # Drop all but the newest `keep` old releases, so a slow reader of the
+    # previous one isn't cut off, and any staging left by a crashed publish
+    current = current_version(root)
+    staging = [name for name in os.listdir(root) if name.startswith(".staging-")]
+    old = [name for name in list_releases(root) if name != current]
+    for name in staging + old[:max(0, len(old) - keep)]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def release_paths(paths, release=None):
+    # An artifact path dict with every file the current release holds swapped
+    # for its released copy; unchanged before the first release
+    release = release or load_release(paths["releases"])
+    if release is None:
+        return dict(paths)
+    return dict(paths, **release["files"], release=release["version"])
+
+
+class ReleaseWatcher:
+    # Keeps loader(release) for the current release and replaces it when the
+    # pointer moves. The swap is one attribute assignment, so readers get the
+    # old or the new state, never a mix. A failed load keeps the old state
+    def __init__(self, root, loader, interval=None, log=print):
+        self.root = root
+        self.loader = loader
+        self.interval = RELEASE_POLL if interval is None else interval
+        self.log = log
+        self._state = (None, None)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._state[0]
+
+    @property
+    def current(self):
+        return self._state[1]
+
+    def poll(self):
+        # Load the current release if it isn't the one held; True if it swapped
+        try:
+            version = current_version(self.root)
+            if version is None or version == self.version:
+                return False
+            value = self.loader(load_release(self.root, version))
+        except Exception as e:
+            self.log(f"⚠️ Release reload from {self.root} failed, keeping {self.version}: {type(e).__name__}: {e}")
+            return False
+        self._state = (version, value)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.poll():
+                self.log(f"🔄 Reloaded release {self.version}")
+
+    def start(self):
+        # The first load happens here so .current is ready when start() returns
+        self.poll()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="release-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Publish releases while a watcher serves reads: every read sees one whole release
+    with tempfile.TemporaryDirectory() as scratch:
+        source = os.path.join(scratch, "model.json")
+        root = os.path.join(scratch, "releases")
+
+        def load(release):
+            with open(release["files"]["model"], encoding="utf-8") as f:
+                return json.load(f)
+
+        def write_model(n):
+            # A few MB, so an in-place rewrite would be visible half-way
+            with atomic_output(source) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"n": n, "weights": [n] * 500000}, f)
+
+        write_model(0)
+        publish_release(root, {"model": source}, log=lambda *_: None)
+        with ReleaseWatcher(root, load, interval=0.01, log=lambda *_: None) as watcher:
+            reads, torn, stop = [0], [0], threading.Event()
+
+            def serve():
+                while not stop.is_set():
+                    model = watcher.current
+                    torn[0] += model["weights"][-1] != model["n"]
+                    reads[0] += 1
+
+            server = threading.Thread(target=serve)
+            server.start()
+            start = time.perf_counter()
+            for n in range(1, 6):
+                write_model(n)
+                publish_release(root, {"model": source}, keep=2, log=lambda *_: None)
+                time.sleep(0.05)
+            stop.set()
+            server.join()
+            time.sleep(0.05)
+            print(f"🔄 5 releases in {time.perf_counter() - start:.2f}s while serving {reads[0]:,} reads: "
+                  f"{torn[0]} torn, now on n={watcher.current['n']} ({len(os.listdir(root)) - 1} releases kept)")
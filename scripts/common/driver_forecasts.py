@@ -0,0 +1,169 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# === Exogenous driver forecasting ===
+# Instead of holding exogenous drivers at their last value or a recent mean,
+# project them with a VAR(1) on their year-over-year changes, fitted for every
+# series of every pipeline at once: all series are stacked into one padded
+# (series, time, driver) array, the normal equations are solved as one batched
+# ridge regression (on standardized changes) and paths are iterated for all
+# series and draws together. Missing years are masked; drivers a series doesn't
+# have are zero-padded and drop out with zero coefficients.
+#
+# GDP_EXOG_MODE=hold    keep the original carry-forward / recent-mean exogs (default)
+# GDP_EXOG_MODE=driver  feed the pipelines the projected driver mean paths
+EXOG_MODE = os.environ.get("GDP_EXOG_MODE", "hold").lower()
+DRIVER_DRAWS = int(os.environ.get("GDP_DRIVER_DRAWS", 1000))
+DRIVER_RIDGE = float(os.environ.get("GDP_DRIVER_RIDGE", 1.0))
+MAX_RADIUS = 0.95  # spectral radius cap keeping every fitted VAR stable
+
+
+def pad_drivers(df, key_cols, time_col, driver_cols):
+    # (keys, levels) with each series right-aligned in NaN padding, so the last
+    # column is every series' latest observation
+    grouped = df.sort_values(([key_cols] if isinstance(key_cols, str) else list(key_cols)) + [time_col],
+                             kind="stable").groupby(key_cols, sort=False, observed=True)
+    keys, blocks = zip(*[(key, group[driver_cols].to_numpy(dtype=float)) for key, group in grouped])
+    levels = np.full((len(blocks), max(len(b) for b in blocks), len(driver_cols)), np.nan)
+    for i, block in enumerate(blocks):
+        levels[i, levels.shape[1] - len(block):] = block
+    return list(keys), levels
+
+
+class DriverVAR:
+    def __init__(self, ridge=None, max_radius=MAX_RADIUS):
+        self.ridge = DRIVER_RIDGE if ridge is None else ridge
+        self.max_radius = max_radius
+
+    def fit(self, levels):
+        levels = np.asarray(levels, dtype=float)
+        n, _, k = levels.shape
+        changes = np.diff(levels, axis=1)
+        self.mu = np.nan_to_num(np.nanmean(changes, axis=1))
+        sd = np.nanstd(changes, axis=1)
+        self.sd = np.where(np.isfinite(sd) & (sd > 0), sd, 1.0)
+        z = (changes - self.mu[:, None]) / self.sd[:, None]
+
+        # z[t] = c + A z[t-1] + e, masked where either year is missing
+        x, y = z[:, :-1], z[:, 1:]
+        mask = (np.isfinite(x).all(axis=2) & np.isfinite(y).all(axis=2)).astype(float)
+        x, y = np.nan_to_num(x) * mask[..., None], np.nan_to_num(y) * mask[..., None]
+        design = np.concatenate([mask[..., None], x], axis=2)
+        penalty = np.diag(np.r_[0.0, np.full(k, self.ridge)])
+        gram = np.einsum("ntp,ntq->npq", design, design) + penalty + 1e-9 * np.eye(k + 1)
+        coef = np.linalg.solve(gram, np.einsum("ntp,ntk->npk", design, y))
+        self.c = coef[:, 0]
+        self.A = np.transpose(coef[:, 1:], (0, 2, 1))
+
+        radius = np.abs(np.linalg.eigvals(self.A)).max(axis=1)
+        self.A *= np.minimum(1.0, self.max_radius / np.maximum(radius, 1e-12))[:, None, None]
+
+        resid = (y - self.c[:, None] - np.einsum("nkj,ntj->ntk", self.A, x)) * mask[..., None]
+        dof = np.maximum(mask.sum(axis=1) - k - 1, 1)
+        sigma = np.einsum("ntk,ntj->nkj", resid, resid) / dof[:, None, None]
+        self.chol = np.linalg.cholesky(sigma + 1e-9 * np.eye(k))
+
+        # Starting point: last level and last standardized change per series
+        self.last_level = np.nan_to_num(levels[:, -1])
+        self.last_z = np.nan_to_num(z[:, -1])
+        self.n_obs_ = mask.sum(axis=1)
+        return self
+
+    def _paths(self, steps, shocks):
+        # shocks: (series, draws, steps, drivers) standardized innovations
+        n, draws = shocks.shape[:2]
+        z = np.broadcast_to(self.last_z[:, None], (n, draws, self.last_z.shape[1]))
+        level = np.broadcast_to(self.last_level[:, None], z.shape)
+        out = np.empty(shocks.shape)
+        for h in range(steps):
+            z = self.c[:, None] + np.einsum("nkj,ndj->ndk", self.A, z) + shocks[:, :, h]
+            level = level + self.mu[:, None] + self.sd[:, None] * z
+            out[:, :, h] = level
+        return out
+
+    def forecast(self, steps):
+        # Conditional mean path of every driver: (series, steps, drivers)
+        return self._paths(steps, np.zeros((len(self.c), 1, steps, self.c.shape[1])))[:, 0]
+
+    def simulate(self, steps, draws=None, seed=0):
+        # (series, draws, steps, drivers) paths with correlated Gaussian innovations
+        draws = DRIVER_DRAWS if draws is None else draws
+        rng = np.random.default_rng(seed)
+        noise = rng.standard_normal((len(self.c), draws, steps, self.c.shape[1]))
+        return self._paths(steps, np.einsum("nkj,ndhj->ndhk", self.chol, noise))
+
+
+def project_panels(panels, steps, draws=0, seed=0):
+    # panels: {name: (keys, levels (series, time, drivers))}. One stacked fit and
+    # one projection for all of them; returns {name: {"keys", "mean", "draws"}}
+    n_time = max(levels.shape[1] for _, levels in panels.values())
+    n_drivers = max(levels.shape[2] for _, levels in panels.values())
+    blocks, spans, start = [], {}, 0
+    for name, (keys, levels) in panels.items():
+        block = np.zeros((len(keys), n_time, n_drivers))
+        block[:, :n_time - levels.shape[1]] = np.nan
+        block[:, n_time - levels.shape[1]:, :levels.shape[2]] = levels
+        blocks.append(block)
+        spans[name] = (start, start + len(keys), levels.shape[2])
+        start += len(keys)
+
+    model = DriverVAR().fit(np.concatenate(blocks))
+    mean = model.forecast(steps)
+    paths = model.simulate(steps, draws, seed) if draws else None
+    projections = {}
+    for name, (lo, hi, k) in spans.items():
+        projections[name] = {
+            "keys": panels[name][0],
+            "mean": mean[lo:hi, :, :k],
+            "draws": paths[lo:hi, :, :, :k] if paths is not None else None
+        }
+    return projections
+
+
+def driver_paths(df, key_cols, time_col, driver_cols, steps):
+    # Mean driver path per series key, as (steps, drivers) arrays
+    keys, levels = pad_drivers(df, key_cols, time_col, driver_cols)
+    mean = project_panels({"panel": (keys, levels)}, steps)["panel"]["mean"]
+    return {key: mean[i] for i, key in enumerate(keys)}
+
+
+if __name__ == "__main__":
+    from typed_loaders import load_typed
+
+    national = pd.read_csv("data/processed/cleaned_data.csv")
+    national["Country"] = "IND"
+    crops = load_typed("data/raw/crop_export_production_stable.csv", "crop_production")
+    climate = load_typed("data/raw/india_climate_soil_1961_2017.csv", "climate_soil")
+    crops = crops.astype({"State": str}).merge(climate.astype({"State": str})[["State", "Year", "Annual Rainfall (mm)"]],
+                                               on=["State", "Year"], how="left")
+    it = load_typed("data/raw/IT_Sector_India_2010_2020.csv", "it_sector").dropna()
+
+    drivers = {
+        "national": ["Inflation Rate (%)", "Fiscal Deficit (% of GDP)", "Interest Rate (%)",
+                     "Money Supply (M3) Growth (%)", "Exchange Rate (USD/INR)", "Unemployment Rate (%)",
+                     "Bank Credit Growth (%)", "FDI (Billion USD)", "Exports (Billion USD)",
+                     "Fixed Capital Formation (% of GDP)"],
+        "agriculture": ["Export Volume", "Annual Rainfall (mm)"],
+        "it": ["Repo_Rate(%)", "Global_Economic_Index"]
+    }
+    panels = {
+        "national": pad_drivers(national, "Country", "Year", drivers["national"]),
+        "agriculture": pad_drivers(crops, ["State", "Crop"], "Year", drivers["agriculture"]),
+        "it": pad_drivers(it, "State", "Year", drivers["it"])
+    }
+    steps, draws = 10, DRIVER_DRAWS
+    start = time.perf_counter()
+    projections = project_panels(panels, steps, draws)
+    seconds = time.perf_counter() - start
+    n_series = sum(len(keys) for keys, _ in panels.values())
+    print(f"🧭 Projected {n_series} driver series × {draws:,} draws × {steps} years for all three pipelines "
+          f"in {seconds:.2f}s ({n_series * draws / seconds:,.0f} paths/s)")
+    for name, projection in projections.items():
+        keys, levels = panels[name]
+        fan = np.percentile(projection["draws"][0, :, -1], [5, 50, 95], axis=0)
+        print(f"\n📈 {name} ({len(keys)} series), {keys[0]} in year +{steps}:")
+        print(pd.DataFrame({"Last": levels[0, -1], "Mean": projection["mean"][0, -1],
+                            "P5": fan[0], "P50": fan[1], "P95": fan[2]},
+                           index=drivers[name]).to_string(float_format=lambda v: f"{v:,.3g}"))
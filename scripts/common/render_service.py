@@ -0,0 +1,231 @@
+import os
+import sys
+import atexit
+import types
+import multiprocessing
+from contextlib import contextmanager
+
+# === Deferred plot rendering ===
+# Pipeline scripts queue figure specs (plot type + plain data) instead of drawing
+# inline. A background process pool renders them on the Agg backend, so model
+# compute never waits on matplotlib or image encoding. Sync mode draws with the
+# calling process's own backend; only pool workers are switched to Agg.
+#
+# GDP_PLOTS=async  render in a background process pool (default)
+# GDP_PLOTS=sync   render inline in the calling process
+# GDP_PLOTS=off    skip plots entirely (headless batch runs)
+PLOT_MODE = os.environ.get("GDP_PLOTS", "async").lower()
+PLOT_WORKERS = int(os.environ.get("GDP_PLOT_WORKERS", min(4, os.cpu_count() or 1)))
+
+RENDERERS = {}
+
+
+def renderer(kind):
+    def register(func):
+        RENDERERS[kind] = func
+        return func
+    return register
+
+
+def _use_agg():
+    # Pool worker initializer: workers never show a window
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render(spec):
+    import matplotlib.pyplot as plt
+
+    fig = RENDERERS[spec["kind"]](plt, **spec["data"])
+    folder = os.path.dirname(spec["path"])
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    fig.savefig(spec["path"], **spec["savefig"])
+    plt.close(fig)
+    return spec["path"]
+
+
+@contextmanager
+def _bare_main():
+    # The pipeline scripts run their work at module level without a __main__
+    # guard. Spawned workers (Windows, macOS) re-import __main__, so hide it
+    # while the pool starts or every worker would re-run the whole script.
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class PlotQueue:
+    def __init__(self, mode=None, workers=None):
+        self.mode = (mode or PLOT_MODE).lower()
+        self.workers = workers or PLOT_WORKERS
+        self._pool = None
+        self._pending = []
+        self._done = []
+        atexit.register(self.close)
+
+    def submit(self, kind, path, savefig=None, **data):
+        if self.mode == "off":
+            return
+        spec = {"kind": kind, "path": path, "data": data, "savefig": savefig or {}}
+        if self.mode == "sync":
+            try:
+                self._done.append(render(spec))
+            except Exception as e:
+                print(f"⚠️ Plot failed: {path} ({e})")
+            return
+        if self._pool is None:
+            context = multiprocessing.get_context()
+            if context.get_start_method() == "fork":
+                self._pool = context.Pool(self.workers, initializer=_use_agg)
+            else:
+                with _bare_main():
+                    self._pool = context.Pool(self.workers, initializer=_use_agg)
+        self._pending.append((path, self._pool.apply_async(render, (spec,))))
+
+    def close(self):
+        # Wait for queued figures and report failures instead of losing them
+        for path, result in self._pending:
+            try:
+                self._done.append(result.get())
+            except Exception as e:
+                print(f"⚠️ Plot failed: {path} ({e})")
+        self._pending = []
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        # Closed queues aren't kept alive by the exit hook
+        atexit.unregister(self.close)
+        done, self._done = self._done, []
+        return done
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === Renderers: plain data in, matplotlib figure out ===
+@renderer("lines")
+def render_lines(plt, series, figsize=(12, 6), title=None, xlabel=None, ylabel=None, hlines=(),
+                 grid=True, legend=True, legend_kwargs=None, title_kwargs=None, ylim=None):
+    fig, ax = plt.subplots(figsize=figsize)
+    for line in series:
+        ax.plot(line["x"], line["y"], **line.get("style", {}))
+    for hline in hlines:
+        ax.axhline(**hline)
+    if title:
+        ax.set_title(title, **(title_kwargs or {}))
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    if ylim:
+        ax.set_ylim(*ylim)
+    if grid:
+        ax.grid(True, **(grid if isinstance(grid, dict) else {}))
+    if legend:
+        ax.legend(**(legend_kwargs or {}))
+    fig.tight_layout()
+    return fig
+
+
+@renderer("forecast_band")
+def render_forecast_band(plt, history_years, history, forecast_years, forecast, lower, upper,
+                         title, xlabel, ylabel, figsize=(14, 7)):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.plot(history_years, history, 'b-', label='Historical', linewidth=2)
+    ax.plot(forecast_years, forecast, 'r--', label=f'{len(forecast_years)}-Year Forecast', linewidth=2)
+    ax.fill_between(forecast_years, lower, upper, color='pink', alpha=0.3, label='Confidence Interval')
+    ax.set_title(title, pad=20)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+
+@renderer("bar")
+def render_bar(plt, labels, values, colors=None, bar_labels=None, value_format=None, title=None,
+               xlabel=None, ylabel=None, figsize=(10, 6), legend_title=None, xtick_rotation=None,
+               title_pad=20):
+    fig, ax = plt.subplots(figsize=figsize)
+    bars = []
+    for i, (label, value) in enumerate(zip(labels, values)):
+        bars.extend(ax.bar(label, value,
+                           color=colors[i % len(colors)] if colors else None,
+                           label=bar_labels[i] if bar_labels else None))
+    if value_format:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2., height, format(height, value_format),
+                    ha='center', va='bottom')
+    if title:
+        ax.set_title(title, pad=title_pad)
+    if xlabel:
+        ax.set_xlabel(xlabel, labelpad=10)
+    if ylabel:
+        ax.set_ylabel(ylabel, labelpad=10)
+    if xtick_rotation:
+        ax.tick_params(axis='x', labelrotation=xtick_rotation)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    if bar_labels:
+        ax.legend(title=legend_title)
+    fig.tight_layout()
+    return fig
+
+
+@renderer("grouped_bar")
+def render_grouped_bar(plt, categories, groups, width=0.35, title=None, ylabel=None, figsize=(8, 5)):
+    import numpy as np
+
+    x = np.arange(len(categories))
+    offsets = (np.arange(len(groups)) - (len(groups) - 1) / 2) * width
+    fig, ax = plt.subplots(figsize=figsize)
+    for offset, group in zip(offsets, groups):
+        ax.bar(x + offset, group["values"], width, label=group["label"], color=group.get("color"))
+    ax.set_xticks(x)
+    ax.set_xticklabels(categories)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    if title:
+        ax.set_title(title)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+@renderer("histogram")
+def render_histogram(plt, values, bins=20, kde=True, color="skyblue", title=None, xlabel=None, figsize=(8, 5)):
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.histplot(values, kde=kde, color=color, bins=bins, ax=ax)
+    if title:
+        ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+@renderer("heatmap")
+def render_heatmap(plt, matrix, title=None, figsize=(16, 12), heatmap_kwargs=None, title_fontsize=14,
+                   tick_fontsize=9, xtick_rotation=45):
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.heatmap(matrix, ax=ax, **(heatmap_kwargs or {}))
+    plt.setp(ax.get_xticklabels(), rotation=xtick_rotation, ha='right', fontsize=tick_fontsize)
+    plt.setp(ax.get_yticklabels(), fontsize=tick_fontsize)
+    if title:
+        ax.set_title(title, fontsize=title_fontsize)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,116 @@
+import os
+import numpy as np
+import pandas as pd
+
+# === Schema-driven, memory-lean CSV loaders ===
+# String keys load as categoricals, integers take the smallest integer type and
+# float columns drop to float32 when float32 can give back the stored values.
+# The column's stored decimal places are the smallest number (at most
+# FLOAT32_DECIMALS) that leaves every value unchanged. A column passes if each
+# value, cast to float32 and rounded back to those places, equals the original.
+# This fails for values with more digits than float32 keeps at their magnitude,
+# and for computed columns with no short decimal form. Columns listed under
+# "exact" always stay float64: they feed SARIMAX fits, which can amplify
+# float32 rounding on short series.
+FLOAT32_DECIMALS = int(os.environ.get("GDP_FLOAT32_DECIMALS", 6))
+
+SCHEMAS = {
+    "crop_production": {
+        "categorical": ["State", "Crop"],
+        "integer": ["Year"],
+        "exact": ["Production Quantity", "Export Volume"]
+    },
+    "climate_soil": {
+        "categorical": ["State", "Soil Type"],
+        "integer": ["Year"],
+        "exact": ["Annual Rainfall (mm)"]
+    },
+    "it_sector": {
+        "categorical": ["State"],
+        "integer": ["Year"],
+        "exact": ["State_IT_Revenue(Cr)", "Repo_Rate(%)", "Global_Economic_Index"]
+    },
+    "national_features": {
+        "integer": ["Year"],
+        "exact": ["GDP Growth (%)"]
+    }
+}
+
+
+def stored_decimals(values, max_decimals=None):
+    # Fewest decimal places that reproduce every value, or None past max_decimals
+    max_decimals = FLOAT32_DECIMALS if max_decimals is None else max_decimals
+    for decimals in range(max_decimals + 1):
+        if (np.round(values, decimals) == values).all():
+            return decimals
+    return None
+
+
+def float32_safe(values, max_decimals=None):
+    # True if every value comes back from float32 once rounded to the column's decimals
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return True
+    decimals = stored_decimals(values, max_decimals)
+    if decimals is None:
+        return False
+    return bool((np.round(values.astype(np.float32).astype(np.float64), decimals) == values).all())
+
+
+def apply_schema(df, schema, max_decimals=None):
+    exact = set(schema.get("exact", []))
+    for col in schema.get("categorical", []):
+        df[col] = df[col].astype("category")
+    for col in schema.get("integer", []):
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.columns:
+        if col in exact or df[col].dtype != np.float64:
+            continue
+        if float32_safe(df[col].values, max_decimals):
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def load_typed(path, schema, max_decimals=None):
+    # Categoricals are parsed directly by read_csv, so no object column is built
+    schema = SCHEMAS[schema] if isinstance(schema, str) else schema
+    dtype = {col: "category" for col in schema.get("categorical", [])}
+    return apply_schema(pd.read_csv(path, dtype=dtype), schema, max_decimals)
+
+
+def memory_usage(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(datasets, max_decimals=None):
+    # Compare default read_csv against the typed loader for each (name, path, schema)
+    rows = []
+    for name, path, schema in datasets:
+        default = pd.read_csv(path)
+        typed = load_typed(path, schema, max_decimals)
+        rows.append({
+            "Dataset": name,
+            "Columns": default.shape[1],
+            "float32 Columns": int((typed.dtypes == np.float32).sum()),
+            "Default (KB)": memory_usage(default) / 1024,
+            "Typed (KB)": memory_usage(typed) / 1024
+        })
+    report = pd.DataFrame(rows)
+    report["Saving (%)"] = 100 * (1 - report["Typed (KB)"] / report["Default (KB)"])
+    return report
+
+
+if __name__ == "__main__":
+    datasets = [
+        ("Crop production", "data/raw/crop_export_production_stable.csv", "crop_production"),
+        ("Climate & soil", "data/raw/india_climate_soil_1961_2017.csv", "climate_soil"),
+        ("IT sector", "data/raw/IT_Sector_India_2010_2020.csv", "it_sector"),
+        ("National features", "data/processed/processed_data.csv", "national_features")
+    ]
+    report = memory_report(datasets)
+    print("💾 Memory footprint, default vs typed loaders:")
+    print(report.round(1).to_string(index=False))
+    total_default, total_typed = report["Default (KB)"].sum(), report["Typed (KB)"].sum()
+    print(f"✅ Total: {total_default:,.1f} KB → {total_typed:,.1f} KB "
+          f"({100 * (1 - total_typed / total_default):.1f}% saved)")
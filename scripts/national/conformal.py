@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# === Conformal prediction intervals ===
+# The hybrid forecast's error on a year it never saw is actual - (SARIMAX +
+# clipped correction) = residual - clipped correction, and stage 4 already
+# stores residual and correction for every out-of-fold year. Split-conformal
+# offsets are those errors' tail ranks, with the (n + 1) finite-sample
+# correction. They are calibrated once when the booster is trained and then
+# added to any array of point forecasts. A band costs two additions per row
+# and needs no refit.
+#
+# GDP_CONFORMAL_LEVELS=0.8,0.95   coverage levels written next to every forecast
+CONFORMAL_LEVELS = [float(level) for level in os.environ.get("GDP_CONFORMAL_LEVELS", "0.8,0.95").split(",")]
+CORRECTION_CLIP = 1.0  # forecast_gdp clips the booster correction to ±1 pt
+
+
+def oof_errors(predictions):
+    # Errors of the final forecast on the out-of-fold years
+    correction = predictions["Predicted_Residual"].clip(-CORRECTION_CLIP, CORRECTION_CLIP)
+    return (predictions["True_Residual"] - correction).to_numpy(dtype=float)
+
+
+def calibrate(errors, levels=None):
+    # Signed offsets per level: each tail holds (1 - level) / 2 of the errors.
+    # A level the sample is too small to support gets the widest observed error
+    errors = np.sort(np.asarray(errors, dtype=float))
+    n = len(errors)
+    levels = levels or CONFORMAL_LEVELS
+    labels = [level_label(level) for level in levels]
+    if len(set(labels)) < len(labels):
+        raise ValueError(f"Conformal levels {levels} repeat a band label; each level needs its own columns")
+    intervals = {}
+    for level in levels:
+        k = min(n, int(np.ceil((n + 1) * (1 - (1 - level) / 2))))
+        intervals[f"{level:g}"] = [float(errors[n - k]), float(errors[k - 1])]
+    return {"n_calibration": n, "intervals": intervals}
+
+
+def calibrate_from_paths(paths, levels=None):
+    from artifact_store import atomic_output
+
+    calibration = calibrate(oof_errors(pd.read_csv(paths["xgb_predictions"])), levels)
+    with atomic_output(paths["conformal"]) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, indent=2)
+    return calibration
+
+
+def load_calibration(paths):
+    # Stored offsets, or a fresh calibration for artifacts trained before they were written
+    if os.path.exists(paths["conformal"]):
+        with open(paths["conformal"], encoding="utf-8") as f:
+            return json.load(f)
+    if os.path.exists(paths["xgb_predictions"]):
+        return calibrate_from_paths(paths)
+    return None
+
+
+def level_label(level):
+    # As many digits as the level has: 0.975 is "97.5%", not "98%"
+    return f"{float(level) * 100:.10g}%"
+
+
+def interval_columns(level):
+    return f"Lower {level_label(level)}", f"Upper {level_label(level)}"
+
+
+def interval_bands(point, calibration):
+    # {column: array} bands for point forecasts of any shape
+    point = np.asarray(point, dtype=float)
+    bands = {}
+    for level, (lower, upper) in calibration["intervals"].items():
+        lower_col, upper_col = interval_columns(level)
+        bands[lower_col] = point + lower
+        bands[upper_col] = point + upper
+    return bands
+
+
+def add_intervals(df, calibration, point_col="Final GDP Forecast (%)"):
+    for col, values in interval_bands(df[point_col].to_numpy(), calibration).items():
+        df[col] = values
+    return df
+
+
+if __name__ == "__main__":
+    from pipeline import country_paths
+    from scenario_engine import ScenarioEngine
+
+    paths = country_paths()
+    calibration = calibrate_from_paths(paths)
+    print(f"📏 Calibrated on {calibration['n_calibration']} out-of-fold years → {paths['conformal']}")
+    for level, (lower, upper) in calibration["intervals"].items():
+        print(f"   {level_label(level)}: [{lower:+.2f}, {upper:+.2f}] pp")
+
+    # Bands for 10,000 random drift scenarios: one batched forecast, then two additions per row
+    engine = ScenarioEngine.from_paths(paths)
+    years = list(range(2025, 2031))
+    drivers = engine.drift_columns()
+    steps = engine.drift_steps(drivers)
+    rng = np.random.default_rng(0)
+    shocks = rng.normal(0.0, 1.0, (10_000, len(years), len(drivers))) * np.array([steps[d] for d in drivers])
+    _, final = engine.forecast(engine.scenario_drifts("baseline", years, shocks, drivers))
+    start = time.perf_counter()
+    bands = interval_bands(final, calibration)
+    seconds = time.perf_counter() - start
+    print(f"\n🎯 Bands for {final.size:,} scenario-years in {seconds * 1000:.2f} ms (no model fits)")
+    print(pd.DataFrame({col: values[:3, -1] for col, values in {"Final GDP Forecast (%)": final, **bands}.items()},
+                       index=[f"scenario {i}" for i in range(3)]).round(2).to_string())
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from feature_pruning import load_feature_list
+
+# === Shared national design matrix ===
+# Training, forecasting, the scenario engine, SHAP, the backtest and the
+# evaluation script all need the same thing: the processed rows with event
+# flags and the SARIMAX fit merged on, and the booster's feature columns. Stage 4
+# writes that once, as one C-contiguous float64 .npy and a JSON manifest. The
+# booster's features come first, so the feature matrix is a view and not a
+# copy. They are followed by every other numeric column, then SARIMAX_Pred and
+# Residual. Consumers memory-map the array. The manifest records its source
+# files' sizes and mtimes, and a stale or older-version cache is rebuilt on load.
+# Stage 5 adds the exog mode its forecasts used (hold when absent), so the
+# batched consumers know whether they can reproduce them.
+DESIGN_VERSION = 1
+TARGET_COLS = ["SARIMAX_Pred", "Residual"]
+
+
+def _fingerprint(path):
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _sources(paths):
+    return {key: _fingerprint(paths[key]) for key in ("processed", "sarimax_predictions", "xgb_features")}
+
+
+def build_design_matrix(paths, log=print):
+    # pipeline imports this module, so its helpers are imported on use
+    from pipeline import add_event_flags, residual_features, time_cols
+    from artifact_store import atomic_output
+
+    key = time_cols(paths["frequency"])[0]
+    df = add_event_flags(pd.read_csv(paths["processed"]))
+    sarimax_df = pd.read_csv(paths["sarimax_predictions"])
+    df = df.merge(sarimax_df[[key, "SARIMAX_Pred"]], on=key, how="left")
+    df["Residual"] = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
+
+    features = load_feature_list(paths) or residual_features(df)
+    numeric = [col for col in df.columns if df[col].dtype.kind in "ifb" and col not in TARGET_COLS]
+    columns = features + [col for col in numeric if col not in features] + TARGET_COLS
+    values = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64))
+
+    # Array first, manifest last, each swapped in whole as the forecast cube does
+    with atomic_output(paths["design_matrix"]) as tmp_path:
+        np.save(tmp_path, values)
+    manifest = {
+        "version": DESIGN_VERSION,
+        "frequency": paths["frequency"],
+        "rows": int(values.shape[0]),
+        "columns": columns,
+        "n_features": len(features),
+        "sources": _sources(paths)
+    }
+    _write_manifest(paths, manifest)
+    log(f"🧱 Design matrix {values.shape[0]}×{values.shape[1]} ({len(features)} features) saved to {paths['design_matrix']}")
+    return manifest
+
+
+def _write_manifest(paths, manifest):
+    from artifact_store import atomic_output
+
+    with atomic_output(paths["design_manifest"]) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+
+def record_exog_mode(paths, design, exog_mode):
+    # Stage 5: note how the forecasts it wrote projected the exogenous inputs
+    if design.exog_mode != exog_mode:
+        design.manifest["exog_mode"] = exog_mode
+        _write_manifest(paths, design.manifest)
+
+
+class DesignMatrix:
+    def __init__(self, values, manifest):
+        self.values = values
+        self.manifest = manifest
+        self.columns = manifest["columns"]
+        self.col_pos = {col: i for i, col in enumerate(self.columns)}
+        self.feature_cols = self.columns[:manifest["n_features"]]
+
+    @property
+    def exog_mode(self):
+        return self.manifest.get("exog_mode", "hold")
+
+    @property
+    def features(self):
+        # (rows, features) view in the booster's column order
+        return self.values[:, :len(self.feature_cols)]
+
+    def inputs(self):
+        # Every column but the SARIMAX fit and residual: what the forecast stage reads
+        return pd.DataFrame(self.values[:, :-len(TARGET_COLS)], columns=self.columns[:-len(TARGET_COLS)], copy=False)
+
+    def column(self, name):
+        return self.values[:, self.col_pos[name]]
+
+    def frame(self, columns=None):
+        # Every column as a read-only view of the mapped array, or a copy of the selected ones
+        if columns is None:
+            return pd.DataFrame(self.values, columns=self.columns, copy=False)
+        return pd.DataFrame(self.values[:, [self.col_pos[col] for col in columns]], columns=list(columns))
+
+    def feature_frame(self):
+        return pd.DataFrame(self.features, columns=self.feature_cols, copy=False)
+
+    def rows(self, years):
+        # Row positions of the given years, in the order asked
+        year = self.column("Year")
+        return np.array([np.flatnonzero(year == y)[0] for y in years])
+
+
+def load_design_matrix(paths, rebuild=True, log=print):
+    manifest = None
+    if os.path.exists(paths["design_manifest"]) and os.path.exists(paths["design_matrix"]):
+        with open(paths["design_manifest"], encoding="utf-8") as f:
+            manifest = json.load(f)
+    if manifest is None or manifest.get("version") != DESIGN_VERSION or manifest.get("sources") != _sources(paths):
+        if not rebuild:
+            raise FileNotFoundError(f"No current design matrix at {paths['design_matrix']}; rerun stage 4")
+        manifest = build_design_matrix(paths, log)
+    return DesignMatrix(np.load(paths["design_matrix"], mmap_mode="r"), manifest)
+
+
+if __name__ == "__main__":
+    from pipeline import country_paths, add_event_flags, residual_features
+
+    paths = country_paths()
+    load_design_matrix(paths)
+    repeats = 200
+
+    # What every consumer used to do: read, flag, merge, filter columns
+    start = time.perf_counter()
+    for _ in range(repeats):
+        df = add_event_flags(pd.read_csv(paths["processed"]))
+        df = df.merge(pd.read_csv(paths["sarimax_predictions"])[["Year", "SARIMAX_Pred"]], on="Year", how="left")
+        X = df[load_feature_list(paths) or residual_features(df)].to_numpy(dtype=float)
+    rebuild = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        X_cached = np.asarray(load_design_matrix(paths).features)
+    cached = (time.perf_counter() - start) / repeats
+    print(f"📦 Rebuilding the feature frame: {rebuild * 1000:.2f} ms; memory-mapped cache: {cached * 1000:.2f} ms "
+          f"({rebuild / cached:.0f}× faster), identical: {np.array_equal(X, X_cached, equal_nan=True)}")
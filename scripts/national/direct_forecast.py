@@ -0,0 +1,159 @@
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.metrics import mean_squared_error
+
+from pipeline import XGB_PARAMS, country_paths, residual_features, run_forecasts
+from design_matrix import load_design_matrix
+
+# === Direct multi-horizon forecasts ===
+# The recursive forecast feeds synthetic GDP lags forward one year at a time.
+# The direct strategy fits one model per horizon instead: model h maps the
+# features of year t to GDP growth in year t + h. The horizons are trained in
+# parallel worker processes from the same processed data. At forecast time
+# every model reads the same row, the last observation (t = T), so year T + h
+# comes from model h alone and no year depends on another.
+#
+# Direct forecasts are scenario-agnostic. Model h is conditioned on the origin
+# year only, so scenario drifts (which describe the path to the target year)
+# have no valid place in its input. There is one direct path, written to one
+# CSV next to the recursive scenario forecasts as a reference. Giving the
+# models the path as explicit features was tried: with ~45 annual rows the
+# boosters ignored it, and some horizons stop after a few trees.
+#
+# GDP_DIRECT_HORIZONS=6   horizons h=1..N (years past the last observation)
+# GDP_DIRECT_WORKERS      training processes (default: one per CPU)
+DIRECT_HORIZONS = int(os.environ.get("GDP_DIRECT_HORIZONS", 6))
+DIRECT_WORKERS = int(os.environ.get("GDP_DIRECT_WORKERS", os.cpu_count() or 1))
+TARGET_COL = "GDP Growth (%)"
+
+
+def direct_paths(paths):
+    models = f"{paths['models']}/direct"
+    return {
+        "models": models,
+        "model": lambda h: f"{models}/xgb_direct_h{h}.json",
+        "forecast": f"{paths['results']}/direct/gdp_forecast_direct.csv"
+    }
+
+
+def direct_features(df):
+    # The booster's features plus this year's GDP growth, which the target year hasn't seen yet
+    return [TARGET_COL] + residual_features(df)
+
+
+def _train_horizon(h, X, y, feature_cols, model_path, nthread):
+    # One horizon's model, in a worker process; the last time-series fold stops the boosting
+    train_idx, val_idx = list(TimeSeriesSplit(n_splits=3).split(X))[-1]
+    dtrain = xgb.DMatrix(X[train_idx], label=y[train_idx], feature_names=feature_cols)
+    dval = xgb.DMatrix(X[val_idx], label=y[val_idx], feature_names=feature_cols)
+    model = xgb.train(dict(XGB_PARAMS, nthread=nthread), dtrain, num_boost_round=350,
+                      evals=[(dtrain, "train"), (dval, "eval")], early_stopping_rounds=20, verbose_eval=False)
+    rmse = float(np.sqrt(mean_squared_error(y[val_idx], model.predict(dval))))
+    model.save_model(model_path)
+    return {"Horizon": h, "Rows": len(X), "Validation RMSE": rmse, "Trees": model.best_iteration + 1}
+
+
+def train_direct(paths=None, horizons=None, workers=None, log=print):
+    paths = paths or country_paths()
+    if paths["frequency"] != "annual":
+        raise ValueError("Direct horizons are counted in years; use annual data")
+    horizons = horizons or DIRECT_HORIZONS
+    direct = direct_paths(paths)
+    os.makedirs(direct["models"], exist_ok=True)
+    df = load_design_matrix(paths).inputs()
+    feature_cols = direct_features(df)
+    X_all = df[feature_cols].to_numpy(dtype=float)
+    target = df[TARGET_COL].to_numpy(dtype=float)
+
+    workers = max(1, min(workers or DIRECT_WORKERS, horizons))
+    nthread = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_train_horizon, h, X_all[:-h], target[h:], feature_cols, direct["model"](h), nthread)
+                   for h in range(1, horizons + 1)]
+        metrics = pd.DataFrame([future.result() for future in futures])
+    for row in metrics.to_dict("records"):
+        log(f"📉 h={row['Horizon']}: {row['Rows']} rows, validation RMSE {row['Validation RMSE']:.3f}, "
+            f"{row['Trees']} trees")
+    return metrics
+
+
+def load_direct(paths=None, horizons=None):
+    direct = direct_paths(paths or country_paths())
+    models = {}
+    for h in range(1, (horizons or DIRECT_HORIZONS) + 1):
+        models[h] = xgb.Booster()
+        models[h].load_model(direct["model"](h))
+    return models
+
+
+def horizon_rows(df, feature_cols, horizons=None):
+    # The origin row (last observation) once per horizon, keyed by target year
+    horizons = np.arange(1, (horizons or DIRECT_HORIZONS) + 1)
+    last_year = int(df["Year"].iloc[-1])
+    keys = pd.DataFrame({"Year": last_year + horizons, "Horizon": horizons})
+    rows = np.repeat(df.iloc[[-1]][feature_cols].to_numpy(dtype=float), len(horizons), axis=0)
+    return keys, rows
+
+
+def predict_direct(models, keys, rows):
+    # Each row goes to its horizon's model (in direct_features order), with one
+    # inplace_predict per horizon (no DMatrix, as in the scenario engine). One
+    # multi-output booster would answer every horizon in a single call, but it
+    # needs rows with all targets present. That drops the last N years from
+    # every horizon, and the horizons could no longer stop early or train in
+    # parallel on their own
+    rows = np.asarray(rows, dtype=np.float32)
+    predicted = np.full(len(rows), np.nan)
+    horizons = keys["Horizon"].to_numpy()
+    for h, model in models.items():
+        idx = np.flatnonzero(horizons == h)
+        if len(idx):
+            predicted[idx] = model.inplace_predict(rows[idx])
+    if np.isnan(predicted).any():
+        missing = sorted(set(horizons[np.isnan(predicted)]))
+        raise ValueError(f"No direct model for horizon(s) {missing}; raise GDP_DIRECT_HORIZONS")
+    return predicted
+
+
+def run_direct_forecasts(paths=None, horizons=None, log=print):
+    paths = paths or country_paths()
+    df = load_design_matrix(paths).inputs()
+    feature_cols = direct_features(df)
+    models = load_direct(paths, horizons)
+    keys, rows = horizon_rows(df, feature_cols, horizons)
+    keys["Direct GDP Forecast (%)"] = predict_direct(models, keys, rows)
+
+    out_path = direct_paths(paths)["forecast"]
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    keys.to_csv(out_path, index=False)
+    log(f"✅ Direct forecasts for {len(keys)} years saved to {out_path}")
+    return keys
+
+
+if __name__ == "__main__":
+    paths = country_paths()
+    start = time.perf_counter()
+    train_direct(paths)
+    print(f"🏋️ Trained {DIRECT_HORIZONS} horizon models in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    direct = run_direct_forecasts(paths)
+    direct_seconds = time.perf_counter() - start
+    # The recursive stage is timed into a scratch directory, without publishing a release
+    with tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        recursive = run_forecasts(dict(paths, results=scratch), log=lambda message: None, publish="off")
+        recursive_seconds = time.perf_counter() - start
+    print(f"⏱️ Direct forecast stage {direct_seconds * 1000:.0f} ms vs recursive {recursive_seconds * 1000:.0f} ms")
+
+    # The one direct path next to each recursive scenario
+    comparison = direct.set_index("Year")
+    for scenario, frame in recursive.items():
+        comparison[scenario.title()] = frame.set_index("Year")["Final GDP Forecast (%)"]
+    print(comparison.round(2).to_string())
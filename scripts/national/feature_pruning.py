@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# === Residual model feature pruning ===
+# The booster sees ~100 numeric columns for ~45 rows, many of them near copies:
+# a macro column, its lags and its 3-year mean. Pruning runs in two passes.
+# 1. Correlation clustering: one matrix product gives every pairwise
+#    correlation, and complete linkage at PRUNE_CORRELATION groups columns
+#    that are all near-duplicates of each other. Each cluster keeps the member
+#    most correlated with the residual.
+# 2. Cross-validated importance: boosters fitted on time-series folds rank the
+#    survivors by their share of total gain. Columns below PRUNE_MIN_SHARE are
+#    dropped, but at least PRUNE_MIN_FEATURES are kept.
+# Stage 4 selects inside each training fold, from that fold's rows only, so the
+# fold RMSE and the out-of-fold residuals (which calibrate the conformal bands)
+# stay out of sample. The last fold's list is the final model's and is saved
+# next to the booster. Forecasting, the scenario engine and SHAP all read it,
+# so they build the same smaller matrix.
+#
+# GDP_FEATURE_PRUNING=on   prune before training (default off: every numeric column)
+FEATURE_PRUNING = os.environ.get("GDP_FEATURE_PRUNING", "off").lower() == "on"
+PRUNE_CORRELATION = float(os.environ.get("GDP_PRUNE_CORRELATION", 0.95))
+PRUNE_MIN_SHARE = float(os.environ.get("GDP_PRUNE_MIN_SHARE", 0.005))
+PRUNE_MIN_FEATURES = int(os.environ.get("GDP_PRUNE_MIN_FEATURES", 12))
+PRUNE_ROUNDS = 200
+
+
+def correlation_matrix(X):
+    # |corr| of every column pair in one product; constant columns correlate with nothing
+    X = np.asarray(X, dtype=float)
+    centered = X - X.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    z = np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 0)
+    return np.abs(z.T @ z), norms > 0
+
+
+def correlation_clusters(X, threshold=None):
+    # Cluster label per column; columns in one cluster all pairwise exceed the threshold
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.spatial.distance import squareform
+
+    threshold = PRUNE_CORRELATION if threshold is None else threshold
+    corr, _ = correlation_matrix(X)
+    if corr.shape[0] < 2:
+        return np.ones(corr.shape[0], dtype=int)
+    distance = np.clip(1.0 - corr, 0.0, None)
+    np.fill_diagonal(distance, 0.0)
+    tree = linkage(squareform(distance, checks=False), method="complete")
+    return fcluster(tree, t=1.0 - threshold, criterion="distance")
+
+
+def cv_importance(X, y, params, n_splits=3, rounds=PRUNE_ROUNDS):
+    # Mean share of total gain per column over time-series folds (0 if never split on)
+    import xgboost as xgb
+    from sklearn.model_selection import TimeSeriesSplit
+
+    shares = np.zeros(X.shape[1])
+    columns = list(X.columns)
+    for train_idx, _ in TimeSeriesSplit(n_splits=n_splits).split(X):
+        dtrain = xgb.DMatrix(X.iloc[train_idx], label=y.iloc[train_idx])
+        gain = xgb.train(params, dtrain, num_boost_round=rounds).get_score(importance_type="total_gain")
+        fold = np.array([gain.get(col, 0.0) for col in columns])
+        if fold.sum() > 0:
+            shares += fold / fold.sum()
+    return pd.Series(shares / n_splits, index=columns)
+
+
+def select_features(X, y, params, log=print):
+    # Returns (kept columns, per-column report)
+    columns = list(X.columns)
+    _, varying = correlation_matrix(X.to_numpy(dtype=float))
+    clusters = correlation_clusters(X.to_numpy(dtype=float))
+    target_corr = X.corrwith(y).abs().fillna(0.0)
+
+    report = pd.DataFrame({"Cluster": clusters, "Target |corr|": target_corr.values}, index=columns)
+    report["Stage"] = "kept"
+    report.loc[~varying, "Stage"] = "constant"
+    # Representative per cluster: the member closest to the residual
+    candidates = report[report["Stage"] == "kept"]
+    representatives = candidates.groupby("Cluster")["Target |corr|"].idxmax()
+    duplicates = candidates.index.difference(representatives.values)
+    report.loc[duplicates, "Stage"] = "duplicate"
+
+    survivors = [col for col in columns if report.at[col, "Stage"] == "kept"]
+    importance = cv_importance(X[survivors], y, params)
+    report["CV gain share"] = importance.reindex(columns)
+    ranked = importance.sort_values(ascending=False)
+    keep = set(ranked.index[:PRUNE_MIN_FEATURES]) | set(ranked.index[ranked >= PRUNE_MIN_SHARE])
+    report.loc[[col for col in survivors if col not in keep], "Stage"] = "low importance"
+
+    kept = [col for col in columns if col in keep]
+    counts = report["Stage"].value_counts()
+    log(f"✂️ Feature pruning: {len(columns)} → {len(kept)} columns "
+        f"({counts.get('duplicate', 0)} near-duplicates, {counts.get('low importance', 0)} low importance, "
+        f"{counts.get('constant', 0)} constant)")
+    return kept, report
+
+
+def save_feature_list(path, features, report=None):
+    from artifact_store import atomic_output
+
+    payload = {"features": list(features), "pruned": report is not None}
+    if report is not None:
+        payload["dropped"] = {stage: list(group.index) for stage, group in report.groupby("Stage") if stage != "kept"}
+    with atomic_output(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+
+
+def load_feature_list(paths):
+    # The residual booster's feature list, or None for models trained before it was saved
+    if not os.path.exists(paths["xgb_features"]):
+        return None
+    with open(paths["xgb_features"], encoding="utf-8") as f:
+        return json.load(f)["features"]
+
+
+if __name__ == "__main__":
+    import xgboost as xgb
+    from pipeline import XGB_PARAMS, add_event_flags, country_paths, residual_features
+
+    paths = country_paths()
+    df = pd.read_csv(paths["processed"]).merge(pd.read_csv(paths["sarimax_predictions"])[["Year", "SARIMAX_Pred"]],
+                                                on="Year", how="left")
+    df["Residual"] = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
+    df = add_event_flags(df.dropna(subset=["Residual"]))
+    X, y = df[residual_features(df)], df["Residual"]
+
+    start = time.perf_counter()
+    kept, report = select_features(X, y, XGB_PARAMS)
+    print(f"⏱️ Selection took {time.perf_counter() - start:.2f}s")
+    for label, cols in [("all", list(X.columns)), ("pruned", kept)]:
+        start = time.perf_counter()
+        for _ in range(20):
+            xgb.train(XGB_PARAMS, xgb.DMatrix(X[cols], label=y), num_boost_round=100)
+        print(f"🏋️ {label:>6}: {len(cols):3d} columns, {(time.perf_counter() - start) / 20 * 1000:.1f} ms per DMatrix + 100 rounds")
+    print("\n🔝 Top kept features by CV gain share:")
+    print(report.loc[kept, "CV gain share"].sort_values(ascending=False).head(10).round(3).to_string())
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import itertools
+import numpy as np
+import pandas as pd
+
+# === Materialized forecast cube ===
+# Final GDP forecasts over (scenario, shock level on each drift feature, year).
+# A shock is an extra per-year drift on one feature, in multiples of that
+# feature's typical year-over-year change. The full-factorial grid is evaluated
+# by the batched ScenarioEngine and written chunk by chunk into a float32 .npy
+# that readers open memory-mapped, so a query touches only the pages it reads
+# and never loads the models. Years a scenario doesn't cover are NaN.
+#
+# GDP_CUBE_LEVELS     shock multiples on every feature (default -1,0,1)
+# GDP_CUBE_FEATURES   "|"-separated drift features (default: every drifted feature)
+CUBE_DIR = "results/national/forecast_cube"
+CUBE_LEVELS = [float(x) for x in os.environ.get("GDP_CUBE_LEVELS", "-1,0,1").split(",")]
+CUBE_FEATURES = [f for f in os.environ.get("GDP_CUBE_FEATURES", "").split("|") if f]
+CUBE_CHUNK_PATHS = int(os.environ.get("GDP_CUBE_CHUNK_PATHS", 20000))
+
+
+def _level_key(value):
+    return round(float(value), 9)
+
+
+class ForecastCube:
+    def __init__(self, cube_dir=CUBE_DIR):
+        with open(os.path.join(cube_dir, "forecast_cube.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.values = np.load(os.path.join(cube_dir, "forecast_cube.npy"), mmap_mode="r")
+        if list(self.values.shape) != self.meta["shape"]:
+            raise ValueError(f"forecast cube shape {self.values.shape} != metadata {self.meta['shape']}")
+        self.scenarios = self.meta["scenarios"]
+        self.years = self.meta["years"]
+        self.features = self.meta["features"]
+        self.levels = {feature: np.array(levels) for feature, levels in self.meta["levels"].items()}
+        self._scenario_pos = {name: i for i, name in enumerate(self.scenarios)}
+        self._year_pos = {year: i for i, year in enumerate(self.years)}
+        self._level_pos = {feature: {_level_key(v): i for i, v in enumerate(levels)}
+                           for feature, levels in self.levels.items()}
+        # Queries leave unspecified features at zero shock, so every axis needs that level
+        missing = [f for f in self.features if 0.0 not in self._level_pos[f]]
+        if missing:
+            raise ValueError(f"forecast cube has no zero-shock level for {missing}; rebuild it with 0 in GDP_CUBE_LEVELS")
+        self._zero = tuple(self._level_pos[f][0.0] for f in self.features)
+
+    def _grid_index(self, scenario, shocks=None):
+        # Unspecified features sit at zero shock
+        index = list(self._zero)
+        for feature, value in (shocks or {}).items():
+            try:
+                index[self.features.index(feature)] = self._level_pos[feature][_level_key(value)]
+            except (ValueError, KeyError):
+                raise KeyError(f"{feature}: shock {value} is not on the cube grid "
+                               f"{self.levels.get(feature, np.array([])).round(4).tolist()}") from None
+        return (self._scenario_pos[scenario],) + tuple(index)
+
+    # --- queries ---
+    def point(self, scenario, year, shocks=None):
+        return float(self.values[self._grid_index(scenario, shocks) + (self._year_pos[year],)])
+
+    def path(self, scenario, shocks=None):
+        # Forecast by year for one grid point (years outside the scenario dropped)
+        return pd.Series(self.values[self._grid_index(scenario, shocks)], index=self.years,
+                         name="Final GDP Forecast (%)").dropna()
+
+    def sweep(self, scenario, feature, shocks=None):
+        # One feature across all its shock levels, the others held fixed
+        index = list(self._grid_index(scenario, shocks))
+        axis = 1 + self.features.index(feature)
+        index[axis] = slice(None)
+        frame = pd.DataFrame(self.values[tuple(index)], index=self.levels[feature], columns=self.years)
+        frame.index.name = feature
+        return frame.dropna(axis=1, how="all")
+
+    def slice(self, scenario, features, shocks=None, year=None):
+        # Long table over every level combination of the free features
+        index = list(self._grid_index(scenario, shocks))
+        for feature in features:
+            index[1 + self.features.index(feature)] = slice(None)
+        if year is not None:
+            index.append(self._year_pos[year])
+        block = np.asarray(self.values[tuple(index)])
+        axes = [self.levels[f] for f in features] + ([[year]] if year is not None else [self.years])
+        block = block.reshape([len(axis) for axis in axes])
+        rows = pd.MultiIndex.from_product(axes, names=list(features) + ["Year"])
+        return pd.DataFrame({"Final GDP Forecast (%)": block.ravel()}, index=rows).dropna().reset_index()
+
+
+def build_cube(engine, runs, cube_dir=CUBE_DIR, features=None, multiples=None, chunk_paths=None):
+    features = list(features or CUBE_FEATURES or engine.drift_columns())
+    multiples = list(multiples or CUBE_LEVELS)
+    if 0 not in multiples:
+        raise ValueError(f"cube multiples {multiples} must include 0, the level unspecified features sit at")
+    chunk_paths = chunk_paths or CUBE_CHUNK_PATHS
+    steps = engine.drift_steps(features)
+    levels = np.array([[m * steps[f] for m in multiples] for f in features])
+    years = sorted({year for _, run_years, _ in runs for year in run_years})
+    grid_shape = (len(multiples),) * len(features)
+    n_points = len(multiples) ** len(features)
+    shape = (len(runs),) + grid_shape + (len(years),)
+
+    os.makedirs(cube_dir, exist_ok=True)
+    tmp_path = os.path.join(cube_dir, "forecast_cube.tmp.npy")
+    cube = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=shape)
+    for s, (scenario, run_years, _) in enumerate(runs):
+        flat = cube[s].reshape(n_points, len(years))
+        flat[:] = np.nan
+        year_pos = [years.index(year) for year in run_years]
+        for start in range(0, n_points, chunk_paths):
+            grid = np.array(np.unravel_index(np.arange(start, min(start + chunk_paths, n_points)), grid_shape)).T
+            shocks = levels[np.arange(len(features)), grid]
+            _, final = engine.forecast(engine.scenario_drifts(scenario, run_years, shocks, features))
+            flat[start:start + len(shocks), year_pos] = final
+    cube.flush()
+    del cube
+
+    meta = {
+        "scenarios": [scenario for scenario, _, _ in runs],
+        "years": years,
+        "features": features,
+        "multiples": multiples,
+        "steps": steps,
+        "levels": {f: levels[i].tolist() for i, f in enumerate(features)},
+        "shape": list(shape),
+        "built": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    # Data first, metadata last: readers validate the shape against it
+    os.replace(tmp_path, os.path.join(cube_dir, "forecast_cube.npy"))
+    tmp_meta = os.path.join(cube_dir, "forecast_cube.tmp.json")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, os.path.join(cube_dir, "forecast_cube.json"))
+    return ForecastCube(cube_dir)
+
+
+if __name__ == "__main__":
+    from pipeline import FORECAST_RUNS, country_paths
+    from scenario_engine import ScenarioEngine
+
+    paths = country_paths()
+    engine = ScenarioEngine.from_paths(paths)
+    start = time.perf_counter()
+    cube = build_cube(engine, FORECAST_RUNS)
+    n_paths = int(np.prod(cube.values.shape[:-1]))
+    print(f"🧊 Forecast cube: {n_paths:,} scenario paths × {len(cube.years)} years, "
+          f"{cube.values.nbytes / 1e6:.1f} MB, built in {time.perf_counter() - start:.1f}s")
+
+    # Zero-shock points reproduce the scenario CSVs
+    for scenario, years, filename in FORECAST_RUNS:
+        saved = pd.read_csv(f"{paths['results']}/{filename}")
+        gap = max(abs(cube.point(scenario, int(y)) - v) for y, v in zip(saved["Year"], saved["Final GDP Forecast (%)"]))
+        print(f"🔁 {scenario}: max gap vs {filename} = {gap:.1e}")
+
+    rng = np.random.default_rng(0)
+    queries = [(cube.scenarios[rng.integers(len(cube.scenarios))],
+                {f: cube.levels[f][rng.integers(len(cube.levels[f]))] for f in cube.features}) for _ in range(10000)]
+    start = time.perf_counter()
+    for scenario, shocks in queries:
+        cube.path(scenario, shocks)
+    path_us = (time.perf_counter() - start) / len(queries) * 1e6
+    start = time.perf_counter()
+    for (scenario, shocks), year in zip(queries, itertools.cycle([2025, 2027, 2030])):
+        cube.values[cube._grid_index(scenario, shocks) + (cube._year_pos[year],)]
+    point_us = (time.perf_counter() - start) / len(queries) * 1e6
+    print(f"⚡ Query latency: point {point_us:.1f} µs, full path {path_us:.1f} µs")
+    print(cube.sweep("reform", cube.features[0]).round(3).to_string())
@@ -0,0 +1,91 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Benchmarks don't need figures; set before pipeline reads GDP_PLOTS
+os.environ.setdefault("GDP_PLOTS", "off")
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pipeline import FREQUENCIES, COUNTRY_SOURCES, COUNTRY_WORKERS, run_countries
+
+# === Frequency throughput benchmark ===
+# Quarterly and monthly data have 4x / 12x the rows of the annual series, and
+# the seasonal SARIMAX block grows with the period. This runs the full country
+# pipeline at every frequency on synthetic panels derived from the India
+# indicators (interpolated between years, plus seasonality and noise) and
+# projects the wall time of a nightly batch of GDP_NIGHTLY_COUNTRIES countries
+# against GDP_NIGHTLY_BUDGET_MIN minutes.
+BENCH_COUNTRIES = int(os.environ.get("GDP_BENCH_COUNTRIES", 4))
+NIGHTLY_COUNTRIES = int(os.environ.get("GDP_NIGHTLY_COUNTRIES", 36))
+NIGHTLY_BUDGET_MIN = float(os.environ.get("GDP_NIGHTLY_BUDGET_MIN", 60))
+
+
+def synthesize(annual, frequency, seed):
+    # Spread each annual indicator over the periods of its year
+    periods_per_year = FREQUENCIES[frequency]["periods_per_year"]
+    rng = np.random.default_rng(seed)
+    years = annual["Year"].values.astype(float)
+    steps = np.arange(len(years) * periods_per_year)
+    fine = years[0] + steps / periods_per_year
+    season = steps % periods_per_year + 1
+
+    out = {"Year": fine.astype(int)}
+    if frequency == "quarterly":
+        out["Quarter"] = season
+    elif frequency == "monthly":
+        out["Month"] = season
+    numeric = annual.drop(columns="Year").select_dtypes("number").interpolate(limit_direction="both")
+    for col in numeric.columns:
+        values = np.interp(fine, years, numeric[col].values)
+        scale = numeric[col].std() or 1.0
+        values = values + rng.normal(0.0, 0.05 * scale, len(values))
+        if col == "GDP Growth (%)" and periods_per_year > 1:
+            values = values + 0.3 * scale * np.sin(2 * np.pi * season / periods_per_year)
+        out[col] = values
+    return pd.DataFrame(out)
+
+
+def benchmark(countries=BENCH_COUNTRIES, workers=None):
+    annual = pd.read_csv(COUNTRY_SOURCES["IND"])
+    workers = max(1, min(workers or COUNTRY_WORKERS, countries))
+    codes = [f"B{i:02d}" for i in range(1, countries + 1)]
+    rows = []
+    home = os.getcwd()
+    # Artifacts go to a scratch tree; worker processes inherit the working directory
+    with tempfile.TemporaryDirectory() as scratch:
+        os.makedirs(os.path.join(scratch, "data", "raw", "countries"))
+        os.chdir(scratch)
+        try:
+            for frequency in FREQUENCIES:
+                suffix = "" if frequency == "annual" else f"_{frequency}"
+                for i, code in enumerate(codes):
+                    synthesize(annual, frequency, i).to_csv(f"data/raw/countries/{code}{suffix}.csv", index=False)
+
+                start = time.perf_counter()
+                summary = run_countries(codes, workers=workers, frequency=frequency)
+                seconds = time.perf_counter() - start
+                ok = summary[summary["Status"] == "ok"]
+                per_country = seconds * workers / countries
+                projected = per_country * NIGHTLY_COUNTRIES / workers / 60
+                rows.append({
+                    "Frequency": frequency,
+                    "Rows/Country": int(ok["Rows"].mean()) if len(ok) else 0,
+                    "Countries OK": f"{len(ok)}/{countries}",
+                    "Seconds": seconds,
+                    "Sec/Country/Worker": per_country,
+                    "Rows/s": ok["Rows"].sum() / seconds,
+                    f"Nightly {NIGHTLY_COUNTRIES} (min)": projected,
+                    "Within Budget": projected <= NIGHTLY_BUDGET_MIN
+                })
+        finally:
+            os.chdir(home)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = benchmark()
+    print(f"\n⏱️ Pipeline throughput by frequency ({BENCH_COUNTRIES} countries per run, "
+          f"budget {NIGHTLY_BUDGET_MIN:.0f} min):")
+    print(report.round(2).to_string(index=False))
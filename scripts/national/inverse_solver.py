@@ -0,0 +1,133 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from pipeline import FORECAST_RUNS
+from scenario_engine import ScenarioEngine, MAX_HORIZON
+
+# === Inverse scenario solver ===
+# Which driver drifts reach a target GDP growth in a given year? The decision
+# variables are extra per-year drifts on the chosen drivers, added on top of a
+# base scenario and bounded to ±SOLVER_BOUND_STEPS of each driver's typical
+# year-over-year change. Differential evolution (rand/1/bin) searches them: each
+# generation is one batched ScenarioEngine evaluation of the whole population.
+# Among paths that hit the target, smaller drifts are preferred.
+#
+# GDP_TARGET_GROWTH=8 GDP_TARGET_YEAR=2028 GDP_SOLVER_BASE=baseline python inverse_solver.py
+SOLVER_DRIVERS = [
+    "FDI (Billion USD)_lag1",
+    "Exports (Billion USD)_lag1",
+    "Bank Credit Growth (%)_lag1",
+    "Fixed Capital Formation (% of GDP)"
+]
+SOLVER_BOUND_STEPS = float(os.environ.get("GDP_SOLVER_BOUND_STEPS", 3.0))
+SOLVER_POPULATION = int(os.environ.get("GDP_SOLVER_POPULATION", 1024))
+SOLVER_GENERATIONS = int(os.environ.get("GDP_SOLVER_GENERATIONS", 150))
+SOLVER_PATIENCE = 25
+SOLVER_TOLERANCE = 0.05  # percentage points counted as "on target"
+DRIFT_PENALTY = 1e-3     # weight of the squared drift size (in steps) against the squared gap
+
+
+def solver_years(base, year):
+    # The base scenario's forecast years, extended or cut to end at the target year
+    run_years = dict((scenario, years) for scenario, years, _ in FORECAST_RUNS)[base]
+    years = list(range(run_years[0], year + 1))
+    if not years:
+        raise ValueError(f"{year} is before the first {base} forecast year {run_years[0]}")
+    if len(years) > MAX_HORIZON:
+        raise ValueError(f"{len(years)}-year horizon exceeds the engine's {MAX_HORIZON}")
+    return years
+
+
+def solve(engine, target, year, drivers=None, base="baseline", bound_steps=None, population=None,
+          generations=None, seed=0, mutation=0.7, crossover=0.8):
+    drivers = list(drivers or SOLVER_DRIVERS)
+    bound_steps = SOLVER_BOUND_STEPS if bound_steps is None else bound_steps
+    population = population or SOLVER_POPULATION
+    generations = generations or SOLVER_GENERATIONS
+    years = solver_years(base, year)
+    target_pos = years.index(year)
+    steps = engine.drift_steps(drivers)
+    # One variable per (year, driver), scaled so every bound is ±bound_steps
+    scale = np.tile([steps[d] for d in drivers], len(years))
+    n_vars = len(scale)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    def evaluate(units):
+        shocks = (units * scale).reshape(len(units), len(years), len(drivers))
+        _, final = engine.forecast(engine.scenario_drifts(base, years, shocks, drivers))
+        reached = final[:, target_pos]
+        cost = (reached - target) ** 2 + DRIFT_PENALTY * (units ** 2).mean(axis=1)
+        return cost, reached
+
+    pop = rng.uniform(-bound_steps, bound_steps, (population, n_vars))
+    pop[0] = 0.0  # the unchanged base scenario competes too
+    cost, reached = evaluate(pop)
+    best_cost, stall, evaluations = cost.min(), 0, population
+    for generation in range(generations):
+        # Three random partners per member; self-picks only slow the search down
+        r = rng.integers(0, population, (3, population))
+        mutant = np.clip(pop[r[0]] + mutation * (pop[r[1]] - pop[r[2]]), -bound_steps, bound_steps)
+        cross = rng.random((population, n_vars)) < crossover
+        cross[np.arange(population), rng.integers(0, n_vars, population)] = True
+        trial = np.where(cross, mutant, pop)
+        trial_cost, trial_reached = evaluate(trial)
+        evaluations += population
+
+        better = trial_cost <= cost
+        pop[better], cost[better], reached[better] = trial[better], trial_cost[better], trial_reached[better]
+        if cost.min() < best_cost - 1e-9:
+            best_cost, stall = cost.min(), 0
+        else:
+            stall += 1
+            if stall >= SOLVER_PATIENCE:
+                break
+
+    best = int(np.argmin(cost))
+    extra = (pop[best] * scale).reshape(len(years), len(drivers))
+    base_table = engine.drift_table(base, years)
+    sarimax, final = engine.forecast(engine.scenario_drifts(base, years, extra[None], drivers))
+
+    # Total drift per year in SCENARIO_DRIFTS form (base scenario + solution)
+    drift_by_year = {}
+    for i, y in enumerate(years):
+        drift = {col: float(base_table[i, engine.col_pos[col]]) for col in engine.columns
+                 if base_table[i, engine.col_pos[col]] != 0}
+        for j, driver in enumerate(drivers):
+            drift[driver] = drift.get(driver, 0.0) + float(extra[i, j])
+        drift_by_year[y] = drift
+
+    return {
+        "target": target,
+        "year": year,
+        "base": base,
+        "reached": float(final[0, target_pos]),
+        "on_target": bool(abs(final[0, target_pos] - target) <= SOLVER_TOLERANCE),
+        "extra_drift": pd.DataFrame(extra, index=years, columns=drivers),
+        "extra_steps": pd.DataFrame(pop[best].reshape(len(years), len(drivers)), index=years, columns=drivers),
+        "drift_by_year": drift_by_year,
+        "forecast": pd.DataFrame({"Year": years, "SARIMAX_Pred": sarimax[0], "Final GDP Forecast (%)": final[0]}),
+        "generations": generation + 1,
+        "evaluations": evaluations,
+        "seconds": time.perf_counter() - start
+    }
+
+
+if __name__ == "__main__":
+    target = float(os.environ.get("GDP_TARGET_GROWTH", 8.0))
+    year = int(os.environ.get("GDP_TARGET_YEAR", 2028))
+    base = os.environ.get("GDP_SOLVER_BASE", "baseline")
+
+    engine = ScenarioEngine.from_paths()
+    result = solve(engine, target, year, base=base)
+    status = "✅ reached" if result["on_target"] else "⚠️ closest within bounds"
+    print(f"🎯 Target {target:.2f}% in {year} on the {base} scenario: {status} {result['reached']:.2f}% "
+          f"({result['evaluations']:,} paths, {result['generations']} generations, {result['seconds']:.2f}s)")
+    print("\n📐 Extra drift per year (driver units):")
+    print(result["extra_drift"].round(3).to_string())
+    print("\n📏 Same, in typical year-over-year changes:")
+    print(result["extra_steps"].round(2).to_string())
+    print("\n📈 Resulting forecast:")
+    print(result["forecast"].round(3).to_string(index=False))
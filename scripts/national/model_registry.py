@@ -0,0 +1,159 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from pipeline import FORECAST_RUNS, country_paths
+from scenario_engine import ScenarioEngine
+from artifact_store import current_version, list_releases, load_release, promote, release_paths
+
+# === Model registry ===
+# Every published release (common/artifact_store.py) is a registry entry. It
+# holds the SARIMAX and residual booster pair, the booster's feature list, the
+# design matrix it was trained on, and metadata with metrics and a hash of the
+# training data. A reference is "current", "latest", a version or a unique
+# prefix of one. Several versions load side by side, each as a ScenarioEngine
+# over its own memory-mapped design matrix. compare() runs one scenario batch
+# through all of them: each version forecasts every scenario and shock variant
+# in one stacked call. Checking a candidate retrain (GDP_PUBLISH=candidate)
+# against production is a single call, not a file swap and a 5_forecast.py rerun.
+# The engine rebuilds annual hold-mode point forecasts. A release published in
+# GDP_EXOG_MODE=driver is refused rather than recomputed in hold mode. Quantile
+# mode only adds bands, so those releases compare on their point forecasts.
+#
+# GDP_COMPARE=current,latest   versions the __main__ comparison loads
+COMPARE_REFS = [ref.strip() for ref in os.environ.get("GDP_COMPARE", "current,latest").split(",") if ref.strip()]
+
+
+def release_mode(metadata):
+    # "exog/residual" mode a release was forecast in (older releases: hold/point)
+    return f"{metadata.get('exog_mode', 'hold')}/{metadata.get('residual_mode', 'point')}"
+
+
+class ModelRegistry:
+    def __init__(self, paths=None):
+        self.paths = paths or country_paths()
+        self.root = self.paths["releases"]
+        self._engines = {}
+
+    def versions(self):
+        # One row per release, oldest first
+        current = current_version(self.root)
+        rows = []
+        for version in list_releases(self.root):
+            release = load_release(self.root, version)
+            metadata = release["metadata"]
+            rows.append({
+                "Version": version,
+                "Current": version == current,
+                "Published": release["published"],
+                "Mode": release_mode(metadata),
+                "Features": metadata.get("n_features"),
+                "Data Hash": metadata.get("data_hash"),
+                **metadata.get("metrics", {})
+            })
+        return pd.DataFrame(rows)
+
+    def resolve(self, ref):
+        versions = list_releases(self.root)
+        if ref in ("current", "production"):
+            matches = [version for version in [current_version(self.root)] if version]
+        elif ref == "latest":
+            matches = versions[-1:]
+        else:
+            matches = [version for version in versions if version.startswith(ref)]
+        if len(matches) != 1:
+            raise KeyError(f"'{ref}' matches {len(matches)} releases in {self.root}")
+        return matches[0]
+
+    def promote(self, ref):
+        version = self.resolve(ref)
+        promote(self.root, version)
+        return version
+
+    def engine(self, ref):
+        # Loaded once per version: releases never change after publishing
+        version = self.resolve(ref)
+        if version not in self._engines:
+            release = load_release(self.root, version)
+            metadata = release["metadata"]
+            if metadata.get("exog_mode", "hold") != "hold":
+                raise ValueError(f"Release {version} was forecast in {release_mode(metadata)} mode; the scenario "
+                                 f"engine rebuilds hold-mode forecasts only, so it can't be compared")
+            self._engines[version] = ScenarioEngine.from_paths(release_paths(self.paths, release))
+        return self._engines[version]
+
+    def load(self, refs):
+        return {self.resolve(ref): self.engine(ref) for ref in refs}
+
+    def compare(self, refs, runs=FORECAST_RUNS, shocks=None, shock_cols=()):
+        # Long frame (Version, Scenario, Variant, Year, SARIMAX_Pred, Final GDP
+        # Forecast (%)) of every run for every version. shocks is (batch,
+        # len(shock_cols)) extra drift per year, as in scenario_drifts; without
+        # it each run is its single named scenario (Variant 0)
+        horizon = max(len(years) for _, years, _ in runs)
+        frames = []
+        for version, engine in self.load(refs).items():
+            # A shocked column a version doesn't read (pruned away) changes nothing for it
+            kept = [i for i, col in enumerate(shock_cols) if col in engine.col_pos]
+            blocks = []
+            for scenario, years, _ in runs:
+                version_shocks = None if shocks is None else np.asarray(shocks, dtype=float)[:, kept]
+                drifts = engine.scenario_drifts(scenario, years, version_shocks, [shock_cols[i] for i in kept])
+                # Pad to the longest run with zero drift; a year never depends on later ones
+                blocks.append(np.pad(drifts, ((0, 0), (0, horizon - len(years)), (0, 0))))
+            sarimax, final = engine.forecast(np.concatenate(blocks))
+
+            start = 0
+            for (scenario, years, _), block in zip(runs, blocks):
+                batch = len(block)
+                frames.append(pd.DataFrame({
+                    "Version": version,
+                    "Scenario": scenario,
+                    "Variant": np.repeat(np.arange(batch), len(years)),
+                    "Year": np.tile(years, batch),
+                    "SARIMAX_Pred": sarimax[start:start + batch, :len(years)].ravel(),
+                    "Final GDP Forecast (%)": final[start:start + batch, :len(years)].ravel()
+                }))
+                start += batch
+        return pd.concat(frames, ignore_index=True)
+
+
+def compare_table(comparison, value="Final GDP Forecast (%)"):
+    # (Scenario, Year) x Version for the named scenarios, plus each version's gap to the first
+    table = comparison[comparison["Variant"] == 0].pivot_table(index=["Scenario", "Year"], columns="Version",
+                                                               values=value, sort=False)
+    first = table.columns[0]
+    for version in table.columns[1:]:
+        table[f"Δ {version}"] = table[version] - table[first]
+    return table
+
+
+if __name__ == "__main__":
+    registry = ModelRegistry()
+    versions = registry.versions()
+    if versions.empty:
+        print(f"⚠️ No releases in {registry.root}; run stage 5 with GDP_PUBLISH=on or candidate")
+        raise SystemExit(1)
+    print(f"📚 {len(versions)} release(s) in {registry.root}:")
+    print(versions.round(4).to_string(index=False))
+
+    refs = list(dict.fromkeys(registry.resolve(ref) for ref in COMPARE_REFS))
+    start = time.perf_counter()
+    try:
+        registry.load(refs)
+    except ValueError as e:
+        print(f"\n⚠️ {e}")
+        raise SystemExit(1)
+    print(f"\n📦 Loaded {len(refs)} version(s) side by side in {time.perf_counter() - start:.2f}s")
+    print(compare_table(registry.compare(refs)).round(3).to_string())
+
+    # A shock sweep through every version at once
+    engine = registry.engine(refs[0])
+    shock_cols = engine.drift_columns()[:4]
+    shocks = np.random.default_rng(0).normal(size=(10000, len(shock_cols)))
+    start = time.perf_counter()
+    sweep = registry.compare(refs, shocks=shocks, shock_cols=shock_cols)
+    seconds = time.perf_counter() - start
+    print(f"\n⚡ {len(refs)} version(s) × {len(FORECAST_RUNS)} scenarios × {len(shocks):,} shock variants "
+          f"({len(sweep):,} forecasts) in {seconds:.2f}s")
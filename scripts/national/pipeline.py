@@ -0,0 +1,764 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+# statsmodels, xgboost and scikit-learn are imported by the stages that use
+# them, so preprocessing, features and the gdp CLI start without them
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from render_service import PlotQueue, PLOT_MODE
+from typed_loaders import load_typed
+from artifact_store import PUBLISH, atomic_output, file_digest, publish_release
+from driver_forecasts import EXOG_MODE, DriverVAR
+from conformal import add_intervals, calibrate_from_paths, interval_columns, load_calibration, oof_errors
+from feature_pruning import FEATURE_PRUNING, load_feature_list, save_feature_list, select_features
+from design_matrix import build_design_matrix, load_design_matrix, record_exog_mode
+
+# === Per-country national pipeline ===
+# Preprocessing, features, SARIMAX, XGBoost residual and forecast as stages that
+# read and write through a country's artifact paths. The numbered scripts run
+# them for India in the original layout (country_paths()); run_countries() runs
+# the whole chain for every country in GDP_COUNTRIES, one worker process per
+# country, and combines the per-country metrics and forecasts into one table.
+#
+# GDP_COUNTRIES=IND,BRA,ZAF   countries to model (default IND)
+# GDP_COUNTRY_RAW             raw CSV pattern for countries not in COUNTRY_SOURCES
+# GDP_COUNTRY_WORKERS         worker processes (default: one per CPU)
+# GDP_FREQUENCY               annual (default), quarterly or monthly indicators
+# GDP_EXOG_MODE               hold (default) or driver: project the macro drivers
+#                             with common/driver_forecasts.py instead of holding them
+# GDP_RESIDUAL_MODE           point (default) or quantile: also fit one multi-quantile
+#                             residual booster and forecast GDP_RESIDUAL_QUANTILES
+# GDP_FEATURE_PRUNING         off (default) or on: train the booster on a pruned
+#                             feature list (see feature_pruning.py)
+# GDP_PUBLISH                 on (default), candidate or off: publish each forecast
+#                             run as a versioned release (see common/artifact_store.py);
+#                             a candidate isn't made current until it's promoted
+COUNTRIES = [c.strip().upper() for c in os.environ.get("GDP_COUNTRIES", "IND").split(",") if c.strip()]
+COUNTRY_RAW_PATTERN = os.environ.get("GDP_COUNTRY_RAW", "data/raw/countries/{country}.csv")
+COUNTRY_SOURCES = {"IND": "data/raw/national_economic_indicators_1980_2024.csv"}
+COUNTRY_WORKERS = int(os.environ.get("GDP_COUNTRY_WORKERS", os.cpu_count() or 1))
+SUMMARY_PATH = "results/national/countries_summary.csv"
+
+# === Sampling frequencies ===
+# Lags and the short moving average count periods; the GDP trend window, the
+# year-over-year change and the year-ago lag (_lagY) span whole years. Annual
+# data keeps its original (1,1,1,4) seasonal block so published results don't
+# move; quarterly and monthly data use the period of their calendar.
+FREQUENCIES = {
+    "annual": {"periods_per_year": 1, "seasonal_period": 4, "pandas_freq": "Y"},
+    "quarterly": {"periods_per_year": 4, "seasonal_period": 4, "pandas_freq": "Q"},
+    "monthly": {"periods_per_year": 12, "seasonal_period": 12, "pandas_freq": "M"}
+}
+FREQUENCY = os.environ.get("GDP_FREQUENCY", "annual").lower()
+
+IQR_COLS = [
+    "GDP Growth (%)", "Inflation Rate (%)", "Interest Rate (%)",
+    "Fiscal Deficit (% of GDP)", "Unemployment Rate (%)"
+]
+
+MACRO_COLS = [
+    "GDP Growth (%)", "Inflation Rate (%)", "Interest Rate (%)",
+    "Exchange Rate (USD/INR)", "Fiscal Deficit (% of GDP)",
+    "Unemployment Rate (%)", "Money Supply (M3) Growth (%)",
+    "Bank Credit Growth (%)", "Exports (Billion USD)",
+    "Imports (Billion USD)", "FDI (Billion USD)"
+]
+
+EXOG_COLS = [
+    "Inflation Rate (%)_lag2",
+    "Fiscal Deficit (% of GDP)_lag1",
+    "Interest Rate (%)_lag1",
+    "Money Supply (M3) Growth (%)_lag1",
+    "Exchange Rate (USD/INR)_lag1",
+    "Unemployment Rate (%)_lag1",
+    "Bank Credit Growth (%)_lag1",
+    "FDI (Billion USD)_lag1",
+    "Exports (Billion USD)_lag1",
+    "Fixed Capital Formation (% of GDP)"
+]
+
+# Raw indicators projected in driver mode (everything but the target)
+NATIONAL_DRIVERS = [col for col in MACRO_COLS if col != "GDP Growth (%)"] + ["Fixed Capital Formation (% of GDP)"]
+
+EXCLUDE_COLS = ["Year", "Period", "GDP Growth (%)", "SARIMAX_Pred", "Residual"]
+
+XGB_PARAMS = {
+    "objective": "reg:squarederror",
+    "learning_rate": 0.025,
+    "max_depth": 4,
+    "lambda": 2.0,
+    "alpha": 1.0,
+    "eval_metric": "rmse"
+}
+
+# One booster predicting every residual quantile (one output per quantile_alpha)
+RESIDUAL_MODE = os.environ.get("GDP_RESIDUAL_MODE", "point").lower()
+RESIDUAL_QUANTILES = [float(q) for q in os.environ.get("GDP_RESIDUAL_QUANTILES", "0.05,0.5,0.95").split(",")]
+QUANTILE_PARAMS = dict(XGB_PARAMS, objective="reg:quantileerror", eval_metric="quantile")
+
+# (scenario, years, output file); sub-annual runs forecast every period of each year
+FORECAST_RUNS = [
+    ("baseline", [2025, 2026], "gdp_forecast_baseline_2025_2026.csv"),
+    ("reform", [2027, 2028, 2029, 2030], "gdp_forecast_reform_2027_2030.csv"),
+    ("crisis", [2027, 2028, 2029, 2030], "gdp_forecast_crisis_2027_2030.csv"),
+    ("mixed", [2027, 2028, 2029, 2030], "gdp_forecast_mixed_2027_2030.csv")
+]
+
+SCENARIO_DRIFTS = {
+    "reform": {
+        2027: {"FDI (Billion USD)_lag1": 5.0, "Exports (Billion USD)_lag1": 8.0, "Fixed Capital Formation (% of GDP)": 0.8},
+        2028: {"FDI (Billion USD)_lag1": 6.0, "Bank Credit Growth (%)_lag1": 1.2, "Reform_Policy_Boost": 1},
+        2029: {"Exports (Billion USD)_lag1": 10.0, "Money Supply (M3) Growth (%)_lag1": 0.5},
+        2030: {"GDP Growth (%)_lag1": 0.5, "Bank Credit Growth (%)_lag1": 1.0, "Fixed Capital Formation (% of GDP)": 1.0}
+    },
+    "crisis": {
+        2027: {"Inflation Rate (%)_lag2": 1.2, "Unemployment Rate (%)_lag1": 1.0, "FDI (Billion USD)_lag1": -2.0},
+        2028: {"Exports (Billion USD)_lag1": -5.0, "Bank Credit Growth (%)_lag1": -1.5},
+        2029: {"GDP Growth (%)_lag1": -0.6, "Reform_Policy_Boost": -1},
+        2030: {"Money Supply (M3) Growth (%)_lag1": -0.8, "Interest Rate (%)_lag1": 1.5}
+    },
+    "mixed": {
+        2027: {"Inflation Rate (%)_lag2": 1.0, "Exports (Billion USD)_lag1": -3.0},
+        2028: {"GDP Growth (%)_lag1": -0.3, "Bank Credit Growth (%)_lag1": -1.0},
+        2029: {"FDI (Billion USD)_lag1": 3.0, "Reform_Policy_Boost": 0.5, "Fixed Capital Formation (% of GDP)": 0.5},
+        2030: {"Exports (Billion USD)_lag1": 5.0, "GDP Growth (%)_lag1": 0.4}
+    },
+    "baseline": {
+        2027: {"Inflation Rate (%)_lag2": 0.2, "Bank Credit Growth (%)_lag1": 0.5, "GDP Growth (%)_lag1": -0.2},
+        2028: {"Inflation Rate (%)_lag2": -0.1, "FDI (Billion USD)_lag1": 2.0, "GDP Growth (%)_lag1": 0.1},
+        2029: {"Interest Rate (%)_lag1": -0.1, "Exports (Billion USD)_lag1": 3.0},
+        2030: {"Money Supply (M3) Growth (%)_lag1": 0.3, "Fixed Capital Formation (% of GDP)": 0.5}
+    }
+}
+
+
+def country_paths(country=None, frequency=None):
+    # country=None is the original single-country layout of the numbered scripts;
+    # a country code gets its own data, model and results directories, with a
+    # sub-directory per sub-annual frequency
+    frequency = (frequency or FREQUENCY).lower()
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{frequency}', expected one of {list(FREQUENCIES)}")
+    if country is None:
+        raw = COUNTRY_SOURCES["IND"]
+        data, models, results = "data/processed", "models", "results/national"
+    else:
+        raw = COUNTRY_SOURCES.get(country, COUNTRY_RAW_PATTERN.format(country=country))
+        data = f"data/processed/national/{country}"
+        models = f"models/national/{country}"
+        results = f"results/national/countries/{country}"
+    if frequency != "annual":
+        # Sub-annual indicators come from e.g. data/raw/countries/IND_quarterly.csv
+        raw = COUNTRY_RAW_PATTERN.format(country=f"{country or 'IND'}_{frequency}")
+        data, models, results = f"{data}/{frequency}", f"{models}/{frequency}", f"{results}/{frequency}"
+    return {
+        "frequency": frequency,
+        "raw": raw,
+        "cleaned": f"{data}/cleaned_data.csv",
+        "processed": f"{data}/processed_data.csv",
+        "sarimax_predictions": f"{data}/sarimax_predictions.csv",
+        "xgb_predictions": f"{data}/xgb_residual_predictions.csv",
+        "design_matrix": f"{data}/design_matrix.npy",
+        "design_manifest": f"{data}/design_matrix.json",
+        "models": models,
+        "sarimax_model": f"{models}/sarimax_gdp_model.pkl",
+        "xgb_model": f"{models}/xgb_residual.json",
+        "xgb_quantile_model": f"{models}/xgb_residual_quantiles.json",
+        "xgb_features": f"{models}/xgb_residual_features.json",
+        "conformal": f"{models}/conformal_intervals.json",
+        "releases": f"{models}/releases",
+        "results": results,
+        "plots": f"{results}/plots"
+    }
+
+
+def _ensure_dir(path):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+
+def time_cols(frequency):
+    # Columns identifying a row: Year, or the Period label ("2024Q1", "2024-03") and its Year
+    return ["Year"] if frequency == "annual" else ["Period", "Year"]
+
+
+def time_axis(df, frequency):
+    # Fractional years for plotting (2024.0, 2024.25, ...)
+    if frequency == "annual":
+        return df["Year"].values
+    return (df["Year"] + (df["Season"] - 1) / FREQUENCIES[frequency]["periods_per_year"]).values
+
+
+def add_period_columns(df, frequency):
+    # Sub-annual raw files carry a Date column, or Year plus a Quarter/Month number
+    spec = FREQUENCIES[frequency]
+    step = 12 // spec["periods_per_year"]
+    if "Date" in df.columns:
+        dates = pd.to_datetime(df.pop("Date"))
+    else:
+        season_col = "Quarter" if frequency == "quarterly" else "Month"
+        if season_col not in df.columns:
+            raise ValueError(f"{frequency} indicators need a Date column or Year + {season_col}")
+        months = (df.pop(season_col).astype(int) - 1) * step + 1
+        dates = pd.to_datetime(pd.DataFrame({"year": df["Year"].astype(int), "month": months, "day": 1}))
+    periods = pd.PeriodIndex(dates, freq=spec["pandas_freq"])
+    df["Year"] = periods.year
+    df["Season"] = (periods.month - 1) // step + 1
+    df.insert(0, "Period", periods.astype(str))
+    return df
+
+
+# === Stage 1: preprocessing ===
+def iqr_filter(df, col, log=print):
+    # Fix extreme outliers only for selected columns using IQR — non-cumulatively
+    Q1, Q3 = df[col].quantile(0.25), df[col].quantile(0.75)
+    IQR = Q3 - Q1
+    lower, upper = Q1 - 3 * IQR, Q3 + 3 * IQR
+    outliers = df[(df[col] < lower) | (df[col] > upper)].shape[0]
+    log(f"{col}: removing {outliers} outlier(s)")
+    df.loc[(df[col] < lower) | (df[col] > upper), col] = None  # replace with NaN
+
+
+def preprocess(paths, log=print):
+    df = pd.read_csv(paths["raw"])
+    log(f"Initial shape: {df.shape}")
+
+    # Strip column names and remove duplicates
+    df.columns = df.columns.str.strip()
+    df = df.drop_duplicates()
+
+    # Remove any rows with invalid/missing Year or GDP Growth
+    frequency = paths["frequency"]
+    if frequency != "annual" and "Date" in df.columns:
+        df["Year"] = pd.to_datetime(df["Date"]).dt.year
+    df = df[df["Year"].notna() & df["GDP Growth (%)"].notna()].copy()
+    df["Year"] = df["Year"].astype(int)
+    if frequency != "annual":
+        df = add_period_columns(df, frequency)
+
+    for col in IQR_COLS:
+        if col in df.columns:
+            iqr_filter(df, col, log)
+
+    # Interpolate missing numeric values (linear method), then forward/backward fill
+    numeric_cols = df.select_dtypes(include=["float64", "int64"]).columns.tolist()
+    df[numeric_cols] = df[numeric_cols].interpolate(method='linear', limit_direction='both')
+
+    # Final cleanup
+    df = df.sort_values(time_cols(frequency)[0]).reset_index(drop=True)
+    _ensure_dir(paths["cleaned"])
+    df.to_csv(paths["cleaned"], index=False)
+    log(f"✅ Cleaned dataset saved: {paths['cleaned']} ({df.shape[0]} rows)")
+    return df
+
+
+# === Stage 2: feature engineering ===
+def engineer_features(paths, log=print):
+    frequency = paths["frequency"]
+    periods_per_year = FREQUENCIES[frequency]["periods_per_year"]
+    df = pd.read_csv(paths["cleaned"])
+    df = df.sort_values(time_cols(frequency)[0])
+
+    # Lag and rolling features (in periods), plus the year-ago value for sub-annual data
+    for col in MACRO_COLS:
+        if col in df.columns:
+            df[f"{col}_lag1"] = df[col].shift(1)
+            df[f"{col}_lag2"] = df[col].shift(2)
+            df[f"{col}_ma3"] = df[col].rolling(window=3).mean()
+            if periods_per_year > 1:
+                df[f"{col}_lagY"] = df[col].shift(periods_per_year)
+
+    # GDP-specific indicators (5-year trend, change on the same period last year)
+    df["GDP_Trend_RollMean5"] = df["GDP Growth (%)"].rolling(window=5 * periods_per_year).mean()
+    df["GDP_Change_YoY"] = df["GDP Growth (%)"].diff(periods_per_year)
+
+    # Policy reform boost flag
+    df["Reform_Policy_Boost"] = df["Year"].apply(lambda y: 1 if y in [2025, 2026] else 0)
+
+    # Fill NA values (backward + forward)
+    df = df.bfill().ffill()
+
+    _ensure_dir(paths["processed"])
+    df.to_csv(paths["processed"], index=False)
+    log(f"✅ Feature engineering complete. Saved to {paths['processed']}")
+    return df
+
+
+# === Stage 3: SARIMAX ===
+def train_sarimax(paths, plots, log=print):
+    import statsmodels.api as sm
+    from sklearn.metrics import mean_squared_error
+
+    frequency = paths["frequency"]
+    df = pd.read_csv(paths["processed"])
+    df = df.dropna(subset=["GDP Growth (%)"])
+    y = df["GDP Growth (%)"]
+    exog = df[EXOG_COLS]
+
+    model = sm.tsa.SARIMAX(
+        y,
+        exog=exog,
+        order=(1, 1, 1),
+        seasonal_order=(1, 1, 1, FREQUENCIES[frequency]["seasonal_period"]),
+        enforce_stationarity=False,
+        enforce_invertibility=False
+    )
+    result = model.fit(disp=False)
+
+    os.makedirs(paths["models"], exist_ok=True)
+    with atomic_output(paths["sarimax_model"]) as tmp_path:
+        result.save(tmp_path)
+    log("✅ SARIMAX model saved.")
+
+    # In-sample predictions
+    df["SARIMAX_Pred"] = result.predict(start=0, end=len(y)-1, exog=exog)
+    _ensure_dir(paths["sarimax_predictions"])
+    df[time_cols(frequency) + ["GDP Growth (%)", "SARIMAX_Pred"]].to_csv(paths["sarimax_predictions"], index=False)
+    log(f"📈 In-sample predictions saved to {paths['sarimax_predictions']}")
+
+    rmse = mean_squared_error(df["GDP Growth (%)"], df["SARIMAX_Pred"]) ** 0.5
+    log(f"📉 SARIMAX RMSE: {rmse:.3f}")
+
+    residuals = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
+    plot_path = f"{paths['plots']}/sarimax_residuals.png"
+    plots.submit(
+        "lines", plot_path,
+        series=[{"x": time_axis(df, frequency), "y": residuals.values, "style": {"label": "Residual"}}],
+        hlines=[{"y": 0, "color": "red", "linestyle": "--"}],
+        figsize=(10, 5),
+        title="SARIMAX Residuals Over Time",
+        xlabel="Year",
+        ylabel="Residual (Actual - Predicted)"
+    )
+    if plot_path in plots.close():
+        log(f"🖼️ Residual plot saved to {plot_path}")
+    return rmse
+
+
+# === Stage 4: XGBoost on SARIMAX residuals ===
+def add_event_flags(df):
+    # Event-aware flags; zero for every forecast year
+    df["Crisis_2020"] = (df["Year"] == 2020).astype(int)
+    df["Recovery_2021_2022"] = df["Year"].isin([2021, 2022]).astype(int)
+    df["Policy_Push_2023"] = (df["Year"] == 2023).astype(int)
+    return df
+
+
+def residual_features(df):
+    # Numeric columns only; the typed loader may have narrowed integer columns
+    return [col for col in df.columns if col not in EXCLUDE_COLS and df[col].dtype.kind in "if"]
+
+
+def quantile_columns(quantiles=None):
+    return [f"Final GDP Forecast q{q * 100:02.0f} (%)" for q in quantiles or RESIDUAL_QUANTILES]
+
+
+def train_quantile_booster(X_train, y_train, X_val, y_val, params, quantiles=None, log=print):
+    # Every quantile from one set of trees: training and predict cost stay close to one model
+    import xgboost as xgb
+    quantiles = quantiles or RESIDUAL_QUANTILES
+    params = dict(params, quantile_alpha=np.array(quantiles))
+    dtrain = xgb.DMatrix(X_train, label=y_train)
+    dval = xgb.DMatrix(X_val, label=y_val)
+    model = xgb.train(params, dtrain, num_boost_round=350, evals=[(dtrain, "train"), (dval, "eval")],
+                      early_stopping_rounds=20, verbose_eval=False)
+    predicted = np.sort(model.predict(dval), axis=1)
+    coverage = ", ".join(f"q{q * 100:02.0f} {np.mean(y_val.values <= predicted[:, i]):.0%}"
+                         for i, q in enumerate(quantiles))
+    log(f"📐 Quantile booster ({len(quantiles)} outputs) — share of last-fold residuals below: {coverage}")
+    return model
+
+
+def train_residual_booster(paths, plots, log=print, nthread=None, mode=None, prune=None):
+    import xgboost as xgb
+    from sklearn.model_selection import TimeSeriesSplit
+    from sklearn.metrics import mean_squared_error
+
+    mode = (mode or RESIDUAL_MODE).lower()
+    prune = FEATURE_PRUNING if prune is None else prune
+    frequency = paths["frequency"]
+    key = time_cols(frequency)[0]
+    df = load_typed(paths["processed"], "national_features")
+    sarimax_df = pd.read_csv(paths["sarimax_predictions"])
+
+    # Residuals: Actual - SARIMAX (rows without a prediction are dropped)
+    df = df.merge(sarimax_df[[key, "SARIMAX_Pred"]], on=key, how="left")
+    df["Residual"] = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
+    df.dropna(subset=["Residual"], inplace=True)
+    df = add_event_flags(df)
+
+    feature_cols = residual_features(df)
+    params = dict(XGB_PARAMS, nthread=nthread) if nthread else XGB_PARAMS
+    prune_report = None
+    X_all = df[feature_cols]
+    y = df["Residual"]
+    os.makedirs(paths["models"], exist_ok=True)
+
+    # Time Series Split for evaluation
+    tscv = TimeSeriesSplit(n_splits=3)
+    rmse_scores = []
+    results_df = pd.DataFrame()
+    fold_lines = []
+
+    for i, (train_idx, val_idx) in enumerate(tscv.split(X_all)):
+        # Pruning sees the fold's training rows only, so its validation years stay out of sample
+        if prune:
+            feature_cols, prune_report = select_features(X_all.iloc[train_idx], y.iloc[train_idx], params, log)
+        X = X_all[feature_cols]
+        X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
+        y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
+
+        dtrain = xgb.DMatrix(X_train, label=y_train)
+        dval = xgb.DMatrix(X_val, label=y_val)
+
+        model = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=350,
+            evals=[(dtrain, "train"), (dval, "eval")],
+            early_stopping_rounds=20,
+            verbose_eval=False
+        )
+
+        y_pred = model.predict(dval)
+        rmse = np.sqrt(mean_squared_error(y_val, y_pred))
+        rmse_scores.append(rmse)
+        log(f"📉 Fold {i+1} RMSE: {rmse:.3f}")
+
+        fold_result = pd.DataFrame({
+            "Fold": i + 1,
+            "Index": val_idx,
+            "Year": df.iloc[val_idx]["Year"].values,
+            "True_Residual": y_val.values,
+            "Predicted_Residual": y_pred
+        })
+        results_df = pd.concat([results_df, fold_result], ignore_index=True)
+
+        fold_years = time_axis(df.iloc[val_idx], frequency)
+        fold_lines.append({"x": fold_years, "y": y_val.values, "style": {"label": f"Actual Fold {i+1}", "linestyle": "--"}})
+        fold_lines.append({"x": fold_years, "y": y_pred, "style": {"label": f"Predicted Fold {i+1}"}})
+
+    log(f"\n✅ Residual Model Average RMSE: {np.mean(rmse_scores):.3f}")
+    log("🧠 Final Features Used for Training:")
+    log(feature_cols)
+
+    # The last fold's model (trained on the most history) is the one used to forecast
+    with atomic_output(paths["xgb_model"]) as tmp_path:
+        model.save_model(tmp_path)
+    save_feature_list(paths["xgb_features"], feature_cols, prune_report)
+    log(f"📦 Model saved to {paths['xgb_model']} (features in {paths['xgb_features']})")
+
+    # Quantile mode: one multi-output booster on the same last-fold split
+    if mode == "quantile":
+        quantile_params = dict(QUANTILE_PARAMS, nthread=nthread) if nthread else QUANTILE_PARAMS
+        quantile_model = train_quantile_booster(X.iloc[train_idx], y.iloc[train_idx], X.iloc[val_idx],
+                                                y.iloc[val_idx], quantile_params, log=log)
+        with atomic_output(paths["xgb_quantile_model"]) as tmp_path:
+            quantile_model.save_model(tmp_path)
+        log(f"📦 Quantile model saved to {paths['xgb_quantile_model']}")
+
+    _ensure_dir(paths["xgb_predictions"])
+    results_df.to_csv(paths["xgb_predictions"], index=False)
+    log(f"📝 Residual predictions saved to {paths['xgb_predictions']}")
+    calibrate_from_paths(paths)
+    log(f"📏 Conformal interval offsets saved to {paths['conformal']}")
+    build_design_matrix(paths, log)
+
+    plot_path = f"{paths['plots']}/xgb_residual_plot.png"
+    plots.submit(
+        "lines", plot_path,
+        savefig={"dpi": 300},
+        series=fold_lines,
+        figsize=(14, 6),
+        title="📈 Residual Predictions vs Actual (All Folds)",
+        xlabel="Year",
+        ylabel="Residuals"
+    )
+    if plot_path in plots.close():
+        log(f"📊 Residual prediction plot saved to {plot_path}")
+    return float(np.mean(rmse_scores))
+
+
+# === Stage 5: scenario forecasts ===
+def future_periods(years, frequency="annual"):
+    # Forecast horizon in periods: every period of each scenario year
+    spec = FREQUENCIES[frequency]
+    if frequency == "annual":
+        return [(year, None) for year in years]
+    step = 12 // spec["periods_per_year"]
+    return [(year, pd.Period(year=year, month=season * step, freq=spec["pandas_freq"]))
+            for year in years for season in range(1, spec["periods_per_year"] + 1)]
+
+
+def driver_feature_paths(df, last_year):
+    # Driver-mode inputs per year up to last_year: each driver's level, lags and
+    # 3-year mean, from its history extended by the projected mean path
+    drivers = [col for col in NATIONAL_DRIVERS if col in df.columns]
+    first_year = int(df["Year"].iloc[-1]) + 1
+    levels = df.set_index("Year")[drivers]
+    if last_year >= first_year:
+        projected = DriverVAR().fit(levels.to_numpy(dtype=float)[None]).forecast(last_year - first_year + 1)[0]
+        levels = pd.concat([levels, pd.DataFrame(projected, index=range(first_year, last_year + 1), columns=drivers)])
+    features = {}
+    for col in drivers:
+        features[col] = levels[col]
+        features[f"{col}_lag1"] = levels[col].shift(1)
+        features[f"{col}_lag2"] = levels[col].shift(2)
+        features[f"{col}_ma3"] = levels[col].rolling(window=3).mean()
+    features = pd.DataFrame(features)
+    return features[[col for col in features.columns if col in df.columns]]
+
+
+def simulate_future_features(df, years, scenario_type="baseline", frequency="annual", driver_features=None):
+    # Roll the last observed row forward, applying the scenario's drift per
+    # year (spread evenly over the periods of a sub-annual year). With
+    # driver_features (annual only) each year's drivers move with their
+    # projection on top of the drift instead of staying at the last observation
+    observed = df.iloc[-1]
+    periods_per_year = FREQUENCIES[frequency]["periods_per_year"]
+    last_row = df.iloc[-1].copy()
+    second_last = df.iloc[-2].copy()
+    ma3 = df["GDP Growth (%)"].tail(3).mean()
+    gdp_history = list(df["GDP Growth (%)"])
+    drift_by_year = SCENARIO_DRIFTS.get(scenario_type, SCENARIO_DRIFTS["baseline"])
+    simulated = []
+
+    for year, period in future_periods(years, frequency):
+        row = last_row.copy()
+        row["Year"] = year
+        if period is not None:
+            row["Period"] = str(period)
+            row["Season"] = (period.month - 1) // (12 // periods_per_year) + 1
+
+        # Apply drift
+        drift = drift_by_year.get(year, {})
+        for col, delta in drift.items():
+            if col in row:
+                row[col] += delta / periods_per_year
+            else:
+                row[col] = delta / periods_per_year
+
+        # Update lags
+        row["GDP Growth (%)_lag1"] = last_row["GDP Growth (%)"]
+        row["GDP Growth (%)_lag2"] = second_last["GDP Growth (%)"]
+        row["GDP Growth (%)_ma3"] = np.mean([
+            row["GDP Growth (%)_lag1"],
+            row["GDP Growth (%)_lag2"],
+            ma3
+        ])
+        if periods_per_year > 1:
+            row["GDP Growth (%)_lagY"] = gdp_history[-periods_per_year]
+        gdp_history.append(row["GDP Growth (%)"])
+
+        # Ensure Reform_Boost exists
+        if "Reform_Policy_Boost" not in row:
+            row["Reform_Policy_Boost"] = 0
+
+        # Update history
+        second_last = last_row.copy()
+        last_row = row.copy()
+
+        if driver_features is not None:
+            row = row.copy()
+            row[driver_features.columns] += driver_features.loc[year] - observed[driver_features.columns]
+        simulated.append(row)
+
+    # Rows mixing a Period label with numbers come out as object columns
+    return pd.DataFrame(simulated).infer_objects()
+
+
+def forecast_gdp(future_df, xgb_model, sarimax_model, exog_cols, feature_cols, filename, log=print,
+                 output_time_cols=("Year",), calibration=None, quantile_model=None):
+    # SARIMAX forecast plus the residual booster's correction, clipped to ±1 pt,
+    # with conformal bands when a calibration is given and residual quantile
+    # forecasts (one predict for all quantiles, left unclipped) when a quantile
+    # booster is
+    import xgboost as xgb
+
+    sarimax_forecast = sarimax_model.get_forecast(steps=len(future_df), exog=future_df[exog_cols])
+    future_df["SARIMAX_Pred"] = sarimax_forecast.predicted_mean.values
+
+    dmatrix = xgb.DMatrix(future_df[feature_cols])
+    correction = xgb_model.predict(dmatrix)
+    correction = np.clip(correction, -1.0, 1.0)
+
+    future_df["Final GDP Forecast (%)"] = future_df["SARIMAX_Pred"] + correction
+    output_cols = list(output_time_cols) + ["SARIMAX_Pred", "Final GDP Forecast (%)"]
+    if quantile_model is not None:
+        # Sorting per row keeps crossing quantiles in order
+        quantiles = np.sort(quantile_model.predict(dmatrix).reshape(len(future_df), -1), axis=1)
+        columns = quantile_columns()
+        future_df[columns] = future_df["SARIMAX_Pred"].to_numpy()[:, None] + quantiles
+        output_cols += columns
+    if calibration is not None:
+        add_intervals(future_df, calibration)
+        output_cols += [col for level in calibration["intervals"] for col in interval_columns(level)]
+    with atomic_output(filename) as tmp_path:
+        future_df[output_cols].to_csv(tmp_path, index=False)
+    log(f"✅ Forecast saved to {filename}")
+    return future_df
+
+
+def run_forecasts(paths, log=print, publish=None):
+    # publish: on, candidate or off (default GDP_PUBLISH); timing runs pass off
+    import xgboost as xgb
+    from statsmodels.tsa.statespace.sarimax import SARIMAXResults
+
+    frequency = paths["frequency"]
+    design = load_design_matrix(paths, log=log)
+    df = design.inputs()
+    sarimax_model = SARIMAXResults.load(paths["sarimax_model"])
+    xgb_model = xgb.Booster()
+    xgb_model.load_model(paths["xgb_model"])
+    feature_cols = design.feature_cols
+    calibration = load_calibration(paths)
+    quantile_model = None
+    if RESIDUAL_MODE == "quantile":
+        if os.path.exists(paths["xgb_quantile_model"]):
+            quantile_model = xgb.Booster()
+            quantile_model.load_model(paths["xgb_quantile_model"])
+        else:
+            log(f"⚠️ No quantile booster at {paths['xgb_quantile_model']}; rerun stage 4 with GDP_RESIDUAL_MODE=quantile")
+
+    driver_features = None
+    if EXOG_MODE == "driver":
+        if frequency == "annual":
+            driver_features = driver_feature_paths(df, max(max(years) for _, years, _ in FORECAST_RUNS))
+            log("🧭 Driver mode: macro drivers follow their VAR projection")
+        else:
+            log(f"⚠️ Driver mode is annual-only; holding {frequency} drivers at their last values")
+
+    os.makedirs(paths["results"], exist_ok=True)
+    forecasts = {}
+    for scenario, years, filename in FORECAST_RUNS:
+        future_df = simulate_future_features(df, years, scenario_type=scenario, frequency=frequency,
+                                             driver_features=driver_features)
+        forecasts[scenario] = forecast_gdp(future_df, xgb_model, sarimax_model, EXOG_COLS, feature_cols,
+                                           f"{paths['results']}/{filename}", log, time_cols(frequency),
+                                           calibration, quantile_model)
+    # Released with the design manifest: the scenario engine can't rebuild driver-mode paths
+    record_exog_mode(paths, design, "hold" if driver_features is None else "driver")
+    publish = (publish or PUBLISH).lower()
+    if publish != "off":
+        publish_artifacts(paths, log, promote_release=publish != "candidate")
+    return forecasts
+
+
+# Everything a consumer reads, by artifact key; forecast CSVs are keyed by scenario
+RELEASE_ARTIFACTS = ["processed", "sarimax_predictions", "xgb_predictions", "design_matrix", "design_manifest",
+                     "sarimax_model", "xgb_model", "xgb_quantile_model", "xgb_features", "conformal"]
+
+
+def release_metrics(paths):
+    # Fit quality recomputed from the stage 3 and 4 outputs: in-sample SARIMAX
+    # RMSE, the booster's mean fold RMSE and the hybrid's out-of-fold RMSE
+    sarimax_df = pd.read_csv(paths["sarimax_predictions"])
+    oof = pd.read_csv(paths["xgb_predictions"])
+    squared = (oof["True_Residual"] - oof["Predicted_Residual"]) ** 2
+    return {
+        "sarimax_rmse": float(np.sqrt(np.mean((sarimax_df["GDP Growth (%)"] - sarimax_df["SARIMAX_Pred"]) ** 2))),
+        "residual_rmse": float(np.sqrt(squared.groupby(oof["Fold"]).mean()).mean()),
+        "hybrid_oof_rmse": float(np.sqrt(np.mean(oof_errors(oof) ** 2)))
+    }
+
+
+def publish_artifacts(paths, log=print, promote_release=True):
+    # Snapshot the current models, inputs and forecasts as one release, with
+    # what the model registry lists: metrics, feature count and a hash of the
+    # training data
+    artifacts = {key: paths[key] for key in RELEASE_ARTIFACTS}
+    for scenario, _, filename in FORECAST_RUNS:
+        artifacts[f"forecast_{scenario}"] = f"{paths['results']}/{filename}"
+    metadata = {
+        "frequency": paths["frequency"],
+        "exog_mode": EXOG_MODE,
+        "residual_mode": RESIDUAL_MODE,
+        "n_features": len(load_feature_list(paths) or []),
+        "data_hash": file_digest(paths["processed"]),
+        "metrics": release_metrics(paths)
+    }
+    return publish_release(paths["releases"], artifacts, metadata, promote_release=promote_release, log=log)
+
+
+# === Full chain for one country (runs inside a worker process) ===
+def run_country(country, plot_mode=None, nthread=None, frequency=None):
+    paths = country_paths(country, frequency)
+    os.makedirs(paths["results"], exist_ok=True)
+    start = time.perf_counter()
+    # Each worker logs to its own file so parallel countries don't interleave
+    with open(f"{paths['results']}/run.log", "w", encoding="utf-8") as log_file:
+        def log(message):
+            print(message, file=log_file, flush=True)
+
+        with PlotQueue(mode=plot_mode) as plots:
+            cleaned = preprocess(paths, log)
+            engineer_features(paths, log)
+            sarimax_rmse = train_sarimax(paths, plots, log)
+            residual_rmse = train_residual_booster(paths, plots, log, nthread)
+            forecasts = run_forecasts(paths, log)
+
+    row = {
+        "Country": country,
+        "Status": "ok",
+        "Frequency": paths["frequency"],
+        "Rows": len(cleaned),
+        "First Year": int(cleaned["Year"].min()),
+        "Last Year": int(cleaned["Year"].max()),
+        "SARIMAX RMSE": sarimax_rmse,
+        "Residual RMSE": residual_rmse
+    }
+    # Sub-annual forecasts are averaged per year so every frequency shares one table layout
+    for scenario, future_df in forecasts.items():
+        yearly = future_df.groupby("Year")["Final GDP Forecast (%)"].mean()
+        for year, value in yearly.items():
+            row[f"{scenario.title()} {int(year)} (%)"] = value
+    row["Seconds"] = time.perf_counter() - start
+    return row
+
+
+def _run_country_safe(country, plot_mode, nthread, frequency):
+    # One country's failure (missing file, bad data) must not abort the batch
+    try:
+        return run_country(country, plot_mode, nthread, frequency)
+    except Exception as e:
+        return {"Country": country, "Status": f"failed: {type(e).__name__}: {e}"}
+
+
+def run_countries(countries=None, workers=None, summary_path=None, frequency=None):
+    countries = countries or COUNTRIES
+    frequency = (frequency or FREQUENCY).lower()
+    if summary_path is None:
+        summary_path = SUMMARY_PATH if frequency == "annual" else SUMMARY_PATH.replace(".csv", f"_{frequency}.csv")
+    workers = max(1, min(workers or COUNTRY_WORKERS, len(countries)))
+    # Split the cores between workers so XGBoost threads don't oversubscribe,
+    # and render plots inline: a worker process can't host its own plot pool
+    nthread = max(1, (os.cpu_count() or 1) // workers)
+    plot_mode = "sync" if PLOT_MODE == "async" else PLOT_MODE
+
+    start = time.perf_counter()
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_country_safe, country, plot_mode, nthread, frequency): country for country in countries}
+        for future in as_completed(futures):
+            row = future.result()
+            rows[row["Country"]] = row
+            if row["Status"] == "ok":
+                print(f"✅ {row['Country']}: SARIMAX RMSE {row['SARIMAX RMSE']:.3f}, "
+                      f"residual RMSE {row['Residual RMSE']:.3f} ({row['Seconds']:.1f}s)")
+            else:
+                print(f"❌ {row['Country']}: {row['Status']}")
+
+    summary = pd.DataFrame([rows[country] for country in countries])
+    _ensure_dir(summary_path)
+    summary.to_csv(summary_path, index=False)
+    print(f"📊 {len(countries)} {frequency} countries in {time.perf_counter() - start:.1f}s with {workers} worker(s). "
+          f"Combined results saved to {summary_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    run_countries()
@@ -1,33 +1,57 @@
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-import matplotlib.pyplot as plt
 from sklearn.preprocessing import MinMaxScaler
 import os
+import sys
+from series_fitting import FIT_DRIFT, FIT_ENGINE, forecast_with_budget
+from panel_arima import panel_forecasts
+from result_store import STORE_FILENAME, compact_series, update_section
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from render_service import PlotQueue
+from typed_loaders import load_typed
+from driver_forecasts import EXOG_MODE, driver_paths
+
+# Define paths
+IT_PLOT_PATH = r"D:\Projects\GDP\results\sectoral\IT\plots"
+STRATEGY_REPORT_PATH = r"D:\Projects\GDP\results\sectoral\IT\reports\top3_investment_strategy.txt"
+RESULT_STORE_PATH = os.path.join(r"D:\Projects\GDP\results\sectoral", STORE_FILENAME)
+
+CORE_ALLOCATION = [
+    (50, "established IT firms"),
+    (30, "digital infrastructure"),
+    (20, "workforce development")
+]
+
+# Plot output: "png" renders full-size charts, "data" only stores the forecast
+# series (the dashboard draws them client-side) plus low-res thumbnails
+PLOT_MODE = os.environ.get("SECTORAL_PLOT_MODE", "png")
+THUMB_PATH = os.path.join(IT_PLOT_PATH, "thumbs")
+THUMB_DPI = 40
+os.makedirs(THUMB_PATH, exist_ok=True)
+plots = PlotQueue()
 
 # Load and clean data
-it_df = pd.read_csv(r"D:\Projects\GDP\data\raw\IT_Sector_India_2010_2020.csv")
+it_df = load_typed(r"D:\Projects\GDP\data\raw\IT_Sector_India_2010_2020.csv", "it_sector")
 it_df.replace([np.inf, -np.inf], np.nan, inplace=True)
 it_df.dropna(inplace=True)
 
-def analyze_state(state_name, state_df, forecast_years=10):
+def analyze_state(state_name, state_df, forecast_years=10, panel_fit=None, future_exog=None):
     try:
         state_df['Revenue_Growth'] = state_df['State_IT_Revenue(Cr)'].pct_change().fillna(0)
-        
-        model = SARIMAX(
-            state_df['State_IT_Revenue(Cr)'],
-            exog=state_df[['Repo_Rate(%)', 'Global_Economic_Index']],
-            order=(1, 1, 1),
-            seasonal_order=(0, 0, 0, 0)
-        )
-        model_fit = model.fit(disp=False)
-        
-        forecast = model_fit.get_forecast(
-            steps=forecast_years,
-            exog=pd.DataFrame({
+
+        # Exogs held at their last value unless a projected driver path is given
+        if future_exog is None:
+            future_exog = pd.DataFrame({
                 'Repo_Rate(%)': [state_df['Repo_Rate(%)'].iloc[-1]] * forecast_years,
                 'Global_Economic_Index': [state_df['Global_Economic_Index'].iloc[-1]] * forecast_years
             })
+        fit = panel_fit or forecast_with_budget(
+            state_df['State_IT_Revenue(Cr)'],
+            state_df[['Repo_Rate(%)', 'Global_Economic_Index']],
+            pd.DataFrame(future_exog, columns=['Repo_Rate(%)', 'Global_Economic_Index']),
+            steps=forecast_years,
+            label=state_name
         )
         
         return {
@@ -37,8 +61,9 @@ def analyze_state(state_name, state_df, forecast_years=10):
             'unemployment': state_df['Urban_Unemployment_Rate(%)'].iloc[-1],
             'internet_penetration': state_df['Internet_Penetration(%)'].iloc[-1],
             'historical_revenue': state_df['State_IT_Revenue(Cr)'].values,
-            'forecast_revenue': forecast.predicted_mean.values,
-            'conf_int': forecast.conf_int(),
+            'forecast_revenue': fit['mean'].values,
+            'conf_int': fit['conf_int'],
+            'fit_method': fit['method'],
             'historical_years': state_df['Year'].values,
             'forecast_years': [state_df['Year'].iloc[-1] + i + 1 for i in range(forecast_years)]
         }
@@ -46,6 +71,13 @@ def analyze_state(state_name, state_df, forecast_years=10):
         print(f"Error processing {state_name}: {str(e)}")
         return None
 
+def save_plot(kind, filename, **data):
+    # Figures are rendered by the background plot queue, not inline
+    if PLOT_MODE == "data":
+        plots.submit(kind, os.path.join(THUMB_PATH, filename), savefig={"dpi": THUMB_DPI}, **data)
+    else:
+        plots.submit(kind, os.path.join(IT_PLOT_PATH, filename), **data)
+
 def print_state_details(results):
     print("\n" + "="*80)
     print("DETAILED STATE-WISE IT SECTOR PERFORMANCE")
@@ -60,34 +92,31 @@ def print_state_details(results):
             print(f"• Urban Unemployment: {state['unemployment']:.2f}%")
             print(f"• Internet Penetration: {state['internet_penetration']:.2f}%")
             print(f"• 10-Year Projected Growth: {growth:.2%}")
+            if state['fit_method'] == FIT_DRIFT:
+                print(f"⚠️ Forecast Model: {state['fit_method']}")
 
 def plot_combined_line_graph(results):
-    plt.figure(figsize=(14, 7))
+    series = []
     for state in results:
         if state:
-            all_years = list(state['historical_years']) + state['forecast_years']
-            all_revenue = list(state['historical_revenue']) + list(state['forecast_revenue'])
-            
-            plt.plot(state['historical_years'], 
-                     state['historical_revenue'], 
-                     label=f"{state['state']} (Historical)")
-            plt.plot(state['forecast_years'], 
-                     state['forecast_revenue'], 
-                     linestyle='--', 
-                     label=f"{state['state']} (Forecast)")
-    
-    plt.title("IT Revenue Trends Across All States (10-Year Forecast)", pad=20)
-    plt.xlabel("Year")
-    plt.ylabel("Revenue (₹ Cr)")
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(r"D:\Projects\GDP\results\sectoral\IT\plots\combined_forecast_trends.png")
-    plt.close()
+            series.append({"x": state['historical_years'], "y": state['historical_revenue'],
+                           "style": {"label": f"{state['state']} (Historical)"}})
+            series.append({"x": state['forecast_years'], "y": state['forecast_revenue'],
+                           "style": {"label": f"{state['state']} (Forecast)", "linestyle": "--"}})
+
+    save_plot(
+        "lines", "combined_forecast_trends.png",
+        series=series,
+        figsize=(14, 7),
+        title="IT Revenue Trends Across All States (10-Year Forecast)",
+        title_kwargs={"pad": 20},
+        xlabel="Year",
+        ylabel="Revenue (₹ Cr)",
+        legend_kwargs={"bbox_to_anchor": (1.05, 1), "loc": "upper left"},
+        grid={"linestyle": "--", "alpha": 0.7}
+    )
 
 def plot_top3_bar_chart(top_states):
-    plt.figure(figsize=(10, 6))
-    
     states = [s['state'] for s in top_states if s]
     growth_rates = [
         (s['forecast_revenue'].mean() - s['current_revenue']) / s['current_revenue']
@@ -98,72 +127,120 @@ def plot_top3_bar_chart(top_states):
         print("No valid states for bar chart")
         return
     
-    bars = plt.bar(states, growth_rates, color=['gold', 'silver', 'lightblue'])
-    
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width() / 2., height,
-                 f'{height:.2%}',
-                 ha='center', va='bottom')
-    
-    plt.title("Top 3 States by Projected Growth Rate", pad=20)
-    plt.ylabel("10-Year Growth Projection")
-    plt.xticks(rotation=45)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(r"D:\Projects\GDP\results\sectoral\IT\plots\top3_growth_bar_chart.png")
-    plt.close()
+    save_plot(
+        "bar", "top3_growth_bar_chart.png",
+        labels=states,
+        values=growth_rates,
+        colors=['gold', 'silver', 'lightblue'],
+        value_format='.2%',
+        title="Top 3 States by Projected Growth Rate",
+        ylabel="10-Year Growth Projection",
+        xtick_rotation=45
+    )
+
+def projected_growth(state):
+    return (state['forecast_revenue'].mean() - state['current_revenue']) / state['current_revenue']
+
+def build_investment_strategy(top_states):
+    all_states = [s for s in top_states if s]
+    national_unemployment = np.mean([s['unemployment'] for s in all_states])
+    national_internet_penetration = np.mean([s['internet_penetration'] for s in all_states])
+    national_growth = np.mean([projected_growth(s) for s in all_states])
+
+    strategies = []
+    for i, state in enumerate(all_states[:3], 1):
+        growth_rate = projected_growth(state)
+        conf_int = state['conf_int']
+
+        if growth_rate > 0.2:
+            initiatives = ["Create special economic zone for tech companies", "Offer 5-year tax holiday for new IT investments"]
+        elif growth_rate > 0.1:
+            initiatives = ["Upgrade existing IT parks with 5G infrastructure", "Subsidize tech education programs"]
+        else:
+            initiatives = ["Implement business retention grants", "Develop regional innovation hubs"]
+
+        strategies.append({
+            'rank': i,
+            'state': state['state'],
+            'growth_rate': growth_rate,
+            'national_growth': national_growth,
+            'unemployment': state['unemployment'],
+            'national_unemployment': national_unemployment,
+            'internet_penetration': state['internet_penetration'],
+            'national_internet_penetration': national_internet_penetration,
+            'revenue_volatility': np.std(state['historical_revenue']) / np.mean(state['historical_revenue']),
+            'conf_width': (conf_int.iloc[:, 1] - conf_int.iloc[:, 0]).mean(),
+            'allocation': CORE_ALLOCATION,
+            'initiatives': initiatives
+        })
+    return strategies
 
 def generate_investment_strategy(top_states):
-    output_path = r"D:\Projects\GDP\results\sectoral\IT\reports\top3_investment_strategy.txt"
-    with open(output_path, "w", encoding="utf-8") as f:
+    strategies = build_investment_strategy(top_states)
+    with open(STRATEGY_REPORT_PATH, "w", encoding="utf-8") as f:
         f.write("="*80 + "\nSTRATEGIC INVESTMENT PLAN FOR TOP 3 STATES\n" + "="*80 + "\n")
-        
-        all_states = [s for s in top_states if s]
-        national_unemployment = np.mean([s['unemployment'] for s in all_states])
-        national_internet_penetration = np.mean([s['internet_penetration'] for s in all_states])
-        national_growth = np.mean([
-            (s['forecast_revenue'].mean() - s['current_revenue']) / s['current_revenue']
-            for s in all_states
-        ])
-        
-        for i, state in enumerate(all_states[:3], 1):
-            growth_rate = (
-                (state['forecast_revenue'].mean() - state['current_revenue']) / state['current_revenue']
-            )
-            revenue_volatility = np.std(state['historical_revenue']) / np.mean(state['historical_revenue'])
-            conf_int = state['conf_int']
-            conf_width = (conf_int.iloc[:, 1] - conf_int.iloc[:, 0]).mean()
-
-            f.write(f"\n🏆 #{i}: {state['state'].upper()} (Projected Growth: {growth_rate:.2%})\n")
+
+        for plan in strategies:
+            growth_rate = plan['growth_rate']
+            f.write(f"\n🏆 #{plan['rank']}: {plan['state'].upper()} (Projected Growth: {growth_rate:.2%})\n")
             f.write("\nWHY INVEST HERE?\n")
-            f.write(f"• Growth rate ({growth_rate:.2%}) {'exceeds' if growth_rate > national_growth else 'is below'} the national average ({national_growth:.2%})\n")
-            f.write(f"• Urban Unemployment Rate: {state['unemployment']:.2f}% (National Avg: {national_unemployment:.2f}%)\n")
-            f.write(f"• Internet Penetration: {state['internet_penetration']:.2f}% (National Avg: {national_internet_penetration:.2f}%)\n")
-            f.write(f"• Revenue Volatility: {revenue_volatility:.2%}\n")
-            f.write(f"• Forecast Confidence Interval Width: ₹±{conf_width:.2f} Cr\n")
+            f.write(f"• Growth rate ({growth_rate:.2%}) {'exceeds' if growth_rate > plan['national_growth'] else 'is below'} the national average ({plan['national_growth']:.2%})\n")
+            f.write(f"• Urban Unemployment Rate: {plan['unemployment']:.2f}% (National Avg: {plan['national_unemployment']:.2f}%)\n")
+            f.write(f"• Internet Penetration: {plan['internet_penetration']:.2f}% (National Avg: {plan['national_internet_penetration']:.2f}%)\n")
+            f.write(f"• Revenue Volatility: {plan['revenue_volatility']:.2%}\n")
+            f.write(f"• Forecast Confidence Interval Width: ₹±{plan['conf_width']:.2f} Cr\n")
 
             f.write("\nCORE ALLOCATION:\n")
-            f.write(f"• 50% to established IT firms\n")
-            f.write(f"• 30% to digital infrastructure\n")
-            f.write(f"• 20% to workforce development\n")
-            
+            for share, target in plan['allocation']:
+                f.write(f"• {share}% to {target}\n")
+
             f.write("\nSPECIAL INITIATIVES:\n")
-            if growth_rate > 0.2:
-                f.write("- Create special economic zone for tech companies\n- Offer 5-year tax holiday for new IT investments\n")
-            elif growth_rate > 0.1:
-                f.write("- Upgrade existing IT parks with 5G infrastructure\n- Subsidize tech education programs\n")
-            else:
-                f.write("- Implement business retention grants\n- Develop regional innovation hubs\n")
+            f.write("".join(f"- {item}\n" for item in plan['initiatives']))
+    return strategies
+
+def save_structured_results(all_results, strategies):
+    update_section(RESULT_STORE_PATH, "it", {
+        "states": [
+            {
+                'state': state['state'],
+                'current_revenue': state['current_revenue'],
+                'avg_growth': state['avg_growth'],
+                'unemployment': state['unemployment'],
+                'internet_penetration': state['internet_penetration'],
+                'projected_growth': projected_growth(state),
+                'fit_method': state['fit_method']
+            }
+            for state in all_results if state
+        ],
+        "top_strategies": strategies,
+        "series": {
+            state['state']: compact_series(state['historical_years'], state['historical_revenue'],
+                                           state['forecast_years'], state['forecast_revenue'], state['conf_int'])
+            for state in all_results if state
+        }
+    })
 
 if __name__ == "__main__":
     print("INDIAN IT SECTOR INVESTMENT ANALYSIS")
     print("="*80)
 
+    # Driver mode: project repo rate and the global index per state instead of holding them flat
+    future_exogs = {}
+    if EXOG_MODE == "driver":
+        future_exogs = driver_paths(it_df, 'State', 'Year', ['Repo_Rate(%)', 'Global_Economic_Index'], steps=10)
+
+    # Panel engine: fit every state series in one batched estimation
+    panel_fits = {}
+    if FIT_ENGINE == "panel":
+        panel_fits = panel_forecasts(it_df, 'State', 'Year', 'State_IT_Revenue(Cr)',
+                                     ['Repo_Rate(%)', 'Global_Economic_Index'], steps=10,
+                                     future_exog=future_exogs or None)
+
     all_results = []
     for state_name in it_df['State'].unique():
         state_data = it_df[it_df['State'] == state_name].sort_values('Year')
-        result = analyze_state(state_name, state_data)
+        result = analyze_state(state_name, state_data, panel_fit=panel_fits.get(state_name),
+                               future_exog=future_exogs.get(state_name))
         all_results.append(result)
 
     print_state_details(all_results)
@@ -174,6 +251,8 @@ if __name__ == "__main__":
 
     plot_combined_line_graph(valid_results)
     plot_top3_bar_chart(top3)
-    generate_investment_strategy(top3)
+    strategies = generate_investment_strategy(top3)
+    save_structured_results(all_results, strategies)
+    plots.close()
 
     print("\nAnalysis completed successfully!")
@@ -1,132 +1,189 @@
 import os
+import sys
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from statsmodels.tsa.statespace.sarimax import SARIMAX
+from series_fitting import FIT_DRIFT, FIT_ENGINE, forecast_with_budget
+from panel_arima import panel_forecasts
+from climate_index import load_climate_index
+from result_store import STORE_FILENAME, compact_series, records, update_section
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from render_service import PlotQueue
+from typed_loaders import load_typed
+from driver_forecasts import EXOG_MODE, driver_paths
 
 # Define paths
 BASE_PLOT_PATH = r"D:\Projects\GDP\results\sectoral\agriculture\plots"
 BASE_REPORT_PATH = r"D:\Projects\GDP\results\sectoral\agriculture\reports"
+RESULT_STORE_PATH = os.path.join(r"D:\Projects\GDP\results\sectoral", STORE_FILENAME)
 os.makedirs(BASE_PLOT_PATH, exist_ok=True)
 os.makedirs(BASE_REPORT_PATH, exist_ok=True)
 
-# Load datasets
-production_df = pd.read_csv(r"D:\Projects\GDP\data\raw\crop_export_production_stable.csv")
-climate_df = pd.read_csv(r"D:\Projects\GDP\data\raw\india_climate_soil_1961_2017.csv")
-merged_df = pd.merge(production_df, climate_df, on=['State', 'Year'], how='left')
-merged_df.replace([np.inf, -np.inf], np.nan, inplace=True)
-merged_df.dropna(subset=['Production Quantity', 'Export Volume', 'Annual Rainfall (mm)'], inplace=True)
-
-def save_plot(fig, filename):
-    fig.savefig(os.path.join(BASE_PLOT_PATH, filename), dpi=300)
-    plt.close(fig)
+# Plot output: "png" renders full 300-dpi charts, "data" only stores the forecast
+# series (the dashboard draws them client-side) plus low-res thumbnails
+PLOT_MODE = os.environ.get("SECTORAL_PLOT_MODE", "png")
+THUMB_PATH = os.path.join(BASE_PLOT_PATH, "thumbs")
+THUMB_DPI = 40
+os.makedirs(THUMB_PATH, exist_ok=True)
+plots = PlotQueue()
+
+# Each (State, Crop) pair is one production series; shorter series are not scored
+SERIES_KEYS = ['State', 'Crop']
+MIN_YEARS = 5
+
+# Datasets: climate rows come from a persisted (State, Year) join index that is
+# only rebuilt when its source CSVs change. Extra climate files (years after
+# 2017) can be listed in CLIMATE_EXTRA_CSVS, separated by os.pathsep.
+PRODUCTION_PATH = r"D:\Projects\GDP\data\raw\crop_export_production_stable.csv"
+CLIMATE_PATH = r"D:\Projects\GDP\data\raw\india_climate_soil_1961_2017.csv"
+CLIMATE_INDEX_PATH = r"D:\Projects\GDP\data\processed\climate_join_index.npz"
+CLIMATE_EXTRA_PATHS = [p for p in os.environ.get("CLIMATE_EXTRA_CSVS", "").split(os.pathsep) if p]
+
+@lru_cache(maxsize=None)
+def load_merged():
+    production_df = load_typed(PRODUCTION_PATH, "crop_production")
+    climate_index = load_climate_index(CLIMATE_PATH, CLIMATE_INDEX_PATH, CLIMATE_EXTRA_PATHS)
+    merged_df = climate_index.join(production_df)
+    merged_df.replace([np.inf, -np.inf], np.nan, inplace=True)
+    merged_df.dropna(subset=['Production Quantity', 'Export Volume', 'Annual Rainfall (mm)'], inplace=True)
+    return merged_df
+
+def save_plot(kind, filename, **data):
+    # Figures are rendered by the background plot queue, not inline
+    if PLOT_MODE == "data":
+        plots.submit(kind, os.path.join(THUMB_PATH, filename), savefig={"dpi": THUMB_DPI}, **data)
+    else:
+        plots.submit(kind, os.path.join(BASE_PLOT_PATH, filename), savefig={"dpi": 300}, **data)
 
 def save_report(text, filename):
     with open(os.path.join(BASE_REPORT_PATH, filename), 'w', encoding='utf-8') as f:
         f.write(text)
 
-def analyze_state(state_name, state_df):
-    crop_results = []
+def soil_scores(soil_ph, organic_matter):
+    # pH: 3 points if 6-7, 2 if 5.5-6 or 7-7.5; organic matter: 2 points if >= 2%, 1 if 1-2%
+    ph_points = np.select(
+        [(soil_ph >= 6) & (soil_ph <= 7), ((soil_ph >= 5.5) & (soil_ph < 6)) | ((soil_ph > 7) & (soil_ph <= 7.5))],
+        [3, 2], default=0)
+    organic_points = np.select([organic_matter >= 2, (organic_matter >= 1) & (organic_matter < 2)], [2, 1], default=0)
+    return ph_points + organic_points
+
+def crop_metrics(df):
+    # All per-series statistics for every (State, Crop) pair in one grouped pass
+    df = df.sort_values(SERIES_KEYS + ['Year'], kind='stable')
+    metrics = df.groupby(SERIES_KEYS, sort=False, observed=True).agg(
+        Years=('Year', 'size'),
+        Current_Production=('Production Quantity', 'last'),
+        Mean_Production=('Production Quantity', 'mean'),
+        Avg_Price=('Wholesale Price', 'mean'),
+        Price_Std=('Wholesale Price', 'std'),
+        Mean_Export=('Export Volume', 'mean'),
+        Rainfall_Mean=('Annual Rainfall (mm)', 'mean'),
+        Rainfall_Std=('Annual Rainfall (mm)', 'std'),
+        Soil_pH=('Soil pH Level', 'mean'),
+        Organic_Matter=('Organic Matter (%)', 'mean')
+    )
+
+    # Dominant soil type: most frequent per series, ties to the first in sort order (as Series.mode)
+    soil_counts = df.groupby(SERIES_KEYS + ['Soil Type'], observed=True).size().rename('Count').reset_index()
+    dominant = (soil_counts.sort_values(['Count', 'Soil Type'], ascending=[False, True], kind='stable')
+                .drop_duplicates(SERIES_KEYS).set_index(SERIES_KEYS)['Soil Type'])
+    metrics['Dominant_Soil'] = dominant.reindex(metrics.index).astype(object).fillna("Unknown")
+
+    metrics['Price_Volatility'] = metrics['Price_Std'] / metrics['Avg_Price']
+    metrics['Export_Dependence'] = metrics['Mean_Export'] / metrics['Mean_Production']
+    metrics['Rainfall_Variability'] = metrics['Rainfall_Std'] / metrics['Rainfall_Mean']
+    metrics['Soil_Score'] = soil_scores(metrics['Soil_pH'].values, metrics['Organic_Matter'].values)
+    return metrics
+
+def forecast_crops(df, series_index, panel_fits=None, future_exogs=None):
+    # 10-year forecast per (State, Crop) series (drift fallback if a fit blows its budget).
+    # Exogs are held at their 3-year mean unless projected driver paths are given
+    fits = {}
     forecast_data = {}
-
-    for crop in state_df['Crop'].unique():
-        crop_df = state_df[state_df['Crop'] == crop].sort_values('Year')
-        if len(crop_df) < 5:
+    for (state_name, crop), crop_df in df.groupby(SERIES_KEYS, sort=False, observed=True):
+        if (state_name, crop) not in series_index:
             continue
+        crop_df = crop_df.sort_values('Year')
         try:
-            model = SARIMAX(
-                endog=crop_df['Production Quantity'],
-                exog=crop_df[['Export Volume', 'Annual Rainfall (mm)']],
-                order=(1, 1, 1),
-                seasonal_order=(0, 0, 0, 0)
-            )
-            model_fit = model.fit(disp=False)
-            future_exog = pd.DataFrame({
-                'Export Volume': [crop_df['Export Volume'].iloc[-3:].mean()] * 10,
-                'Annual Rainfall (mm)': [crop_df['Annual Rainfall (mm)'].iloc[-3:].mean()] * 10
-            })
-            
-            # Forecast next 10 years
-            forecast = model_fit.get_forecast(steps=10, exog=future_exog)
-            forecast_mean = forecast.predicted_mean
-            conf_int = forecast.conf_int()
-            
-            # Calculate metrics
-            avg_price = crop_df['Wholesale Price'].mean()
-            growth_rate = (forecast_mean.mean() - crop_df['Production Quantity'].iloc[-1]) / crop_df['Production Quantity'].iloc[-1]
-            price_volatility = crop_df['Wholesale Price'].std() / crop_df['Wholesale Price'].mean()
-            export_dependence = crop_df['Export Volume'].mean() / crop_df['Production Quantity'].mean()
-            rainfall_variability = crop_df['Annual Rainfall (mm)'].std() / crop_df['Annual Rainfall (mm)'].mean()
-            
-            # Soil analysis
-            soil_ph = crop_df['Soil pH Level'].mean()
-            organic_matter = crop_df['Organic Matter (%)'].mean()
-            dominant_soil = crop_df['Soil Type'].mode()[0] if not crop_df['Soil Type'].mode().empty else "Unknown"
-            soil_score = 0
-            if 6 <= soil_ph <= 7:
-                soil_score += 3
-            elif 5.5 <= soil_ph < 6 or 7 < soil_ph <= 7.5:
-                soil_score += 2
-            if organic_matter >= 2:
-                soil_score += 2
-            elif 1 <= organic_matter < 2:
-                soil_score += 1
-            
-            # Calculate final score
-            base_score = forecast_mean.mean() * avg_price * (1 + growth_rate)
-            adjusted_score = base_score * (1 + soil_score/5) * (1 - price_volatility/2)
-
-            crop_results.append({
-                'State': state_name,
-                'Crop': crop,
-                'Current_Production': crop_df['Production Quantity'].iloc[-1],
-                'Forecasted_Production': forecast_mean.mean(),
-                'Growth_Rate': growth_rate,
-                'Avg_Price': avg_price,
-                'Price_Volatility': price_volatility,
-                'Export_Dependence': export_dependence,
-                'Rainfall_Variability': rainfall_variability,
-                'Soil_pH': soil_ph,
-                'Organic_Matter': organic_matter,
-                'Soil_Score': soil_score,
-                'Score': adjusted_score
-            })
-
-            # Store forecast data for plotting
-            forecast_data[crop] = {
-                'history': crop_df['Production Quantity'],
-                'forecast': forecast_mean,
-                'conf_int': conf_int,
-                'years': crop_df['Year'].tolist() + [max(crop_df['Year'])+i+1 for i in range(10)]
-            }
-        except Exception:
+            if panel_fits is not None:
+                fit = panel_fits[(state_name, crop)]
+            else:
+                if future_exogs is not None:
+                    future_exog = pd.DataFrame(future_exogs[(state_name, crop)],
+                                               columns=['Export Volume', 'Annual Rainfall (mm)'])
+                else:
+                    future_exog = pd.DataFrame({
+                        'Export Volume': [crop_df['Export Volume'].iloc[-3:].mean()] * 10,
+                        'Annual Rainfall (mm)': [crop_df['Annual Rainfall (mm)'].iloc[-3:].mean()] * 10
+                    })
+                fit = forecast_with_budget(
+                    crop_df['Production Quantity'],
+                    crop_df[['Export Volume', 'Annual Rainfall (mm)']],
+                    future_exog,
+                    steps=10,
+                    label=f"{crop} in {state_name}"
+                )
+        except Exception as e:
+            print(f"⚠️ Skipping {crop} in {state_name}: {type(e).__name__}: {e}")
             continue
 
-    if not crop_results:
+        fits[(state_name, crop)] = fit
+        # Store forecast data for plotting
+        forecast_data.setdefault(state_name, {})[crop] = {
+            'history': crop_df['Production Quantity'],
+            'forecast': fit['mean'],
+            'conf_int': fit['conf_int'],
+            'years': crop_df['Year'].tolist() + [max(crop_df['Year'])+i+1 for i in range(10)]
+        }
+    return fits, forecast_data
+
+def score_crops(metrics, fits):
+    # Scoring table for all forecast series at once
+    scored = metrics.loc[list(fits.keys())].copy()
+    scored['Forecasted_Production'] = [fit['mean'].mean() for fit in fits.values()]
+    scored['Fit_Method'] = [fit['method'] for fit in fits.values()]
+    scored['Growth_Rate'] = (scored['Forecasted_Production'] - scored['Current_Production']) / scored['Current_Production']
+
+    base_score = scored['Forecasted_Production'] * scored['Avg_Price'] * (1 + scored['Growth_Rate'])
+    scored['Score'] = base_score * (1 + scored['Soil_Score'] / 5) * (1 - scored['Price_Volatility'] / 2)
+    scored['State_Rank'] = scored.groupby(level='State', observed=True)['Score'].rank(ascending=False)
+
+    columns = ['Current_Production', 'Forecasted_Production', 'Growth_Rate', 'Avg_Price', 'Price_Volatility',
+               'Export_Dependence', 'Rainfall_Variability', 'Soil_pH', 'Organic_Matter', 'Soil_Score',
+               'Dominant_Soil', 'Score', 'Fit_Method', 'State_Rank']
+    return scored[columns].reset_index().sort_values(['State', 'State_Rank'], kind='stable')
+
+def analyze_crops(df, panel_fits=None, future_exogs=None):
+    # Metrics, forecasts and scores for every (State, Crop) series with enough history
+    metrics = crop_metrics(df)
+    metrics = metrics[metrics['Years'] >= MIN_YEARS]
+    fits, forecast_data = forecast_crops(df, set(metrics.index), panel_fits, future_exogs)
+    if not fits:
+        return None, forecast_data
+    return score_crops(metrics, fits), forecast_data
+
+def analyze_state(state_name, state_df, panel_fits=None, future_exogs=None):
+    results_df, forecast_data = analyze_crops(state_df, panel_fits, future_exogs)
+    if results_df is None:
         return None, None
-
-    # Create results dataframe and rank crops
-    results_df = pd.DataFrame(crop_results)
-    results_df['State_Rank'] = results_df['Score'].rank(ascending=False)
-    results_df = results_df.sort_values('State_Rank')
-    
-    return results_df, forecast_data
+    return results_df.reset_index(drop=True), forecast_data.get(state_name, {})
 
 def plot_state_forecast(state_name, top_crop, forecast_data):
     data = forecast_data[top_crop['Crop']]
-    fig, ax = plt.subplots(figsize=(14, 7))
-    ax.plot(data['years'][:-10], data['history'], 'b-', label='Historical', linewidth=2)
-    ax.plot(data['years'][-10:], data['forecast'], 'r--', label='10-Year Forecast', linewidth=2)
-    ax.fill_between(data['years'][-10:], data['conf_int'].iloc[:, 0], data['conf_int'].iloc[:, 1],
-                    color='pink', alpha=0.3, label='Confidence Interval')
-    ax.set_title(f'{top_crop["Crop"]} Production Forecast in {state_name}', pad=20)
-    ax.set_xlabel('Year')
-    ax.set_ylabel('Production (tonnes)')
-    ax.legend()
-    ax.grid(True, linestyle='--', alpha=0.7)
-    fig.tight_layout()
     filename = f"{state_name}_{top_crop['Crop']}_forecast.png".replace(" ", "_")
-    save_plot(fig, filename)
+    save_plot(
+        "forecast_band", filename,
+        history_years=data['years'][:-10],
+        history=np.asarray(data['history']),
+        forecast_years=data['years'][-10:],
+        forecast=np.asarray(data['forecast']),
+        lower=data['conf_int'].iloc[:, 0].values,
+        upper=data['conf_int'].iloc[:, 1].values,
+        title=f'{top_crop["Crop"]} Production Forecast in {state_name}',
+        xlabel='Year',
+        ylabel='Production (tonnes)'
+    )
 
 def print_state_report(state_name, state_results, forecast_data):
     report_lines = []
@@ -149,6 +206,8 @@ def print_state_report(state_name, state_results, forecast_data):
     report_lines.append(f"💰 Average Price: ₹{top_crop['Avg_Price']:,.2f}")
     report_lines.append(f"🌱 Soil Score: {top_crop['Soil_Score']}/5")
     report_lines.append(f"🏆 10-Year Investment Score: {top_crop['Score']:,.2f}")
+    if top_crop['Fit_Method'] == FIT_DRIFT:
+        report_lines.append(f"⚠️ Forecast Model: {top_crop['Fit_Method']}")
     
     # Top 3 crops summary
     report_lines.append("\nTOP 3 CROPS IN THIS STATE:")
@@ -156,6 +215,7 @@ def print_state_report(state_name, state_results, forecast_data):
     for _, row in top3.iterrows():
         report_lines.append(
             f" - {row['Crop']}: Score={row['Score']:,.2f}, Growth={row['Growth_Rate']:.2%}, Price=₹{row['Avg_Price']:,.2f}"
+            + (f" [{row['Fit_Method']}]" if row['Fit_Method'] == FIT_DRIFT else "")
         )
 
     # Print to console
@@ -266,33 +326,40 @@ def generate_investment_rationale(state, crop, merged_df, national_results):
         return [f"Error generating rationale: {str(e)}"]
 
 def analyze_all_states():
-    all_results = []
-    all_forecasts = {}
+    merged_df = load_merged()
     available_states = merged_df['State'].unique()
     
     print("\n" + "="*100)
     print("COMPREHENSIVE AGRICULTURAL ANALYSIS ACROSS ALL INDIAN STATES (10-YEAR FORECAST)")
     print("="*100)
     print(f"\nAvailable states: {', '.join(available_states)}\n")
-    
-    for state_name in available_states:
-        state_df = merged_df[merged_df['State'] == state_name]
-        state_results, state_forecasts = analyze_state(state_name, state_df)
-
-        if state_results is not None:
-            print_state_report(state_name, state_results, state_forecasts)
-            all_results.append(state_results)
-            all_forecasts[state_name] = state_forecasts
 
-    if not all_results:
+    # Driver mode: project exports and rainfall for every series instead of holding them flat
+    future_exogs = None
+    if EXOG_MODE == "driver":
+        future_exogs = driver_paths(merged_df, SERIES_KEYS, 'Year', ['Export Volume', 'Annual Rainfall (mm)'], steps=10)
+
+    # Panel engine: fit every state/crop series in one batched estimation
+    panel_fits = None
+    if FIT_ENGINE == "panel":
+        panel_fits = panel_forecasts(merged_df, ['State', 'Crop'], 'Year', 'Production Quantity',
+                                     ['Export Volume', 'Annual Rainfall (mm)'], steps=10, exog_window=3,
+                                     future_exog=future_exogs)
+    
+    # Score every (State, Crop) pair at once, then report state by state
+    national_results, all_forecasts = analyze_crops(merged_df, panel_fits, future_exogs)
+    if national_results is None:
         print("\nNo valid data available for any state.")
         return None, None
 
-    # Combine all results and find top 5 nationally
-    national_results = pd.concat(all_results)
-    national_results['National_Rank'] = national_results['Score'].rank(ascending=False)
-    national_results = national_results.sort_values('National_Rank')
-    top_5_national = national_results.head(5)
+    results_by_state = dict(tuple(national_results.groupby('State', sort=False, observed=True)))
+    for state_name in available_states:
+        if state_name in results_by_state:
+            print_state_report(state_name, results_by_state[state_name], all_forecasts[state_name])
+
+    # Top 5 nationally: partial selection instead of ranking every pair
+    top_5_national = national_results.nlargest(5, 'Score')
+    top_5_national = top_5_national.assign(National_Rank=np.arange(1, len(top_5_national) + 1))
 
     # === National Recommendations Summary ===
     national_lines = []
@@ -308,6 +375,8 @@ def analyze_all_states():
         national_lines.append(f"💰 Average Price: ₹{row['Avg_Price']:,.2f}")
         national_lines.append(f"🌱 Soil Score: {row['Soil_Score']}/5")
         national_lines.append(f"🏆 10-Year Investment Score: {row['Score']:,.2f}")
+        if row['Fit_Method'] == FIT_DRIFT:
+            national_lines.append(f"⚠️ Forecast Model: {row['Fit_Method']}")
     
     print("\n".join(national_lines))
 
@@ -317,10 +386,12 @@ def analyze_all_states():
     rationale_lines.append("💡 DATA-DRIVEN INVESTMENT RATIONALE")
     rationale_lines.append("="*100)
 
+    top_5_records = records(top_5_national)
     for i, (_, row) in enumerate(top_5_national.iterrows(), 1):
         rationale_lines.append(f"\n🔍 Why invest in {row['Crop']} in {row['State']}?")
         rationale = generate_investment_rationale(row['State'], row['Crop'], merged_df, national_results)
         rationale_lines.extend(rationale)
+        top_5_records[i - 1]['Rationale'] = [point.lstrip('• ') for point in rationale]
 
     print("\n".join(rationale_lines))
 
@@ -328,21 +399,36 @@ def analyze_all_states():
     full_national_report = "\n".join(national_lines + rationale_lines)
     save_report(full_national_report, "national_top_5_report.txt")
 
+    # Save the same results in structured form for the dashboard
+    update_section(RESULT_STORE_PATH, "agriculture", {
+        "states": {
+            state: records(state_df)
+            for state, state_df in national_results.groupby('State', sort=True, observed=True)
+        },
+        "national_top": top_5_records,
+        "series": {
+            state: {
+                crop: compact_series(data['years'][:-10], data['history'], data['years'][-10:],
+                                     data['forecast'], data['conf_int'])
+                for crop, data in state_forecasts.items()
+            }
+            for state, state_forecasts in all_forecasts.items()
+        }
+    })
+
     # === Plot Top 5 National Bar Chart ===
-    fig, ax = plt.subplots(figsize=(14, 8))
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-    
-    for i, (_, row) in enumerate(top_5_national.iterrows()):
-        ax.bar(f"{row['Crop']}\n({row['State']})", row['Score'], color=colors[i], label=f"#{i+1}")
-    
-    ax.set_title("Top 5 Agricultural Investment Opportunities Across India\n(10-Year Forecast Period)", pad=20)
-    ax.set_xlabel("Crop and State", labelpad=10)
-    ax.set_ylabel("10-Year Investment Potential Score", labelpad=10)
-    ax.grid(axis='y', linestyle='--', alpha=0.7)
-    ax.legend(title="Ranking")
-    fig.tight_layout()
-    
-    save_plot(fig, "national_top_5_bar_chart.png")
+    save_plot(
+        "bar", "national_top_5_bar_chart.png",
+        labels=[f"{row['Crop']}\n({row['State']})" for _, row in top_5_national.iterrows()],
+        values=top_5_national['Score'].tolist(),
+        colors=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd'],
+        bar_labels=[f"#{i+1}" for i in range(len(top_5_national))],
+        legend_title="Ranking",
+        title="Top 5 Agricultural Investment Opportunities Across India\n(10-Year Forecast Period)",
+        xlabel="Crop and State",
+        ylabel="10-Year Investment Potential Score",
+        figsize=(14, 8)
+    )
 
     # === Plot 10-Year Forecast Graphs for Top 5 ===
     print("\n" + "="*100)
@@ -361,4 +447,5 @@ def analyze_all_states():
 
 if __name__ == "__main__":
     analyze_all_states()
+    plots.close()
     print("✅ All reports and plots saved to results/sectoral/agriculture folders.")
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from typed_loaders import load_typed
+
+# === Persisted (State, Year) join index for climate & soil data ===
+# Climate rows are stored sorted by (state code, year), so each state's years
+# are one contiguous block (offsets[s]:offsets[s + 1]). A composite int64 key
+# state_code * KEY_STRIDE + year turns the crop/climate join into a single
+# searchsorted + gather instead of a hash join on every run. The index is
+# saved as .npz next to the processed data and rebuilt only when its sources
+# change. Extra climate files (years after 2017) are merged in incrementally.
+KEY_STRIDE = 10000
+INDEX_VERSION = 1
+
+
+def source_signature(path):
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+class ClimateIndex:
+    def __init__(self, states, keys, columns, categories, sources=()):
+        self.states = np.asarray(states, dtype=str)
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.columns = dict(columns)
+        self.categories = dict(categories)
+        self.sources = [list(source) for source in sources]
+        self.offsets = np.searchsorted(self.keys, np.arange(len(self.states) + 1) * KEY_STRIDE)
+
+    # --- building ---
+    @classmethod
+    def from_frame(cls, df, sources=()):
+        return cls([], [], {}, {}).add_rows(df, sources)
+
+    def _encode(self, df):
+        # State names -> codes, new states get the next free code
+        state_pos = {state: code for code, state in enumerate(self.states)}
+        new_states = [s for s in pd.unique(df['State'].astype(str)) if s not in state_pos]
+        for state in new_states:
+            state_pos[state] = len(state_pos)
+        self.states = np.concatenate([self.states, np.asarray(new_states, dtype=str)])
+        codes = df['State'].astype(str).map(state_pos).values.astype(np.int64)
+        return codes * KEY_STRIDE + df['Year'].values.astype(np.int64)
+
+    def add_rows(self, df, sources=()):
+        # Insert new (State, Year) rows; a key that already exists is replaced
+        new_keys = self._encode(df)
+        n_old, n_new = len(self.keys), len(new_keys)
+        # Union of the index's and the new file's columns: rows without a
+        # column get NaN (code -1 for categorical columns)
+        value_cols = list(dict.fromkeys(list(self.columns) + [col for col in df.columns if col not in ('State', 'Year')]))
+        new_columns = {}
+        for col in value_cols:
+            present = col in df.columns
+            if col in self.categories or (present and (isinstance(df[col].dtype, pd.CategoricalDtype) or df[col].dtype == object)):
+                added = df[col].dropna().astype(str).unique() if present else []
+                categories = np.union1d(self.categories.get(col, np.array([], dtype=str)), added).astype(str)
+                old = self.columns.get(col, np.full(n_old, -1, dtype=np.int16))
+                if col in self.categories:
+                    # Re-code existing rows against the merged category list
+                    old = np.where(old >= 0, np.searchsorted(categories, self.categories[col][np.maximum(old, 0)]), -1)
+                if present:
+                    new = pd.Categorical(df[col].astype(str).where(df[col].notna()), categories=categories).codes
+                else:
+                    new = np.full(n_new, -1)
+                self.categories[col] = categories
+                new_columns[col] = (old.astype(np.int16), new.astype(np.int16))
+            else:
+                # concatenate promotes an int column to float when NaN fill is needed
+                old = self.columns.get(col, np.full(n_old, np.nan))
+                new = df[col].values if present else np.full(n_new, np.nan)
+                new_columns[col] = (old, new)
+
+        keys = np.concatenate([self.keys, new_keys])
+        for col, parts in new_columns.items():
+            assert sum(len(part) for part in parts) == len(keys), f"climate column {col} is misaligned with the keys"
+        # Stable sort keeps the new row after the old one for a duplicate key
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        keep = np.append(keys[1:] != keys[:-1], True)
+        self.keys = keys[keep]
+        self.columns = {col: np.ascontiguousarray(np.concatenate(parts)[order][keep])
+                        for col, parts in new_columns.items()}
+        self.offsets = np.searchsorted(self.keys, np.arange(len(self.states) + 1) * KEY_STRIDE)
+        self.sources.extend(list(source) for source in sources)
+        return self
+
+    # --- persistence ---
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {
+            'version': np.array(INDEX_VERSION),
+            'states': self.states,
+            'keys': self.keys,
+            'column_names': np.asarray(list(self.columns), dtype=str),
+            'sources': np.array(json.dumps(self.sources))
+        }
+        for i, (col, values) in enumerate(self.columns.items()):
+            arrays[f'column_{i}'] = values
+            if col in self.categories:
+                arrays[f'categories_{i}'] = self.categories[col]
+        # Write then rename so a reader never loads a half-written index
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data['version']) != INDEX_VERSION:
+                raise ValueError(f"climate index version {int(data['version'])} != {INDEX_VERSION}")
+            columns, categories = {}, {}
+            for i, col in enumerate(data['column_names']):
+                columns[str(col)] = data[f'column_{i}']
+                if f'categories_{i}' in data.files:
+                    categories[str(col)] = data[f'categories_{i}']
+            sources = json.loads(str(data['sources']))
+            return cls(data['states'], data['keys'], columns, categories, sources)
+
+    # --- lookups ---
+    def lookup(self, states, years):
+        # Row position for each (state, year) query, -1 where there is no climate row
+        codes = pd.Categorical(np.asarray(states, dtype=object).astype(str), categories=self.states).codes
+        keys = codes.astype(np.int64) * KEY_STRIDE + np.asarray(years, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.keys, keys), max(len(self.keys) - 1, 0))
+        found = (codes >= 0) & (len(self.keys) > 0) & (self.keys[pos] == keys)
+        return np.where(found, pos, -1)
+
+    def state_rows(self, state):
+        # Contiguous block of one state's climate rows, ordered by year
+        code = np.flatnonzero(self.states == state)
+        if not len(code):
+            return slice(0, 0)
+        return slice(self.offsets[code[0]], self.offsets[code[0] + 1])
+
+    def years(self):
+        return self.keys % KEY_STRIDE
+
+    def join(self, df, state_col='State', year_col='Year'):
+        # Left join: climate columns gathered by position, NaN where missing
+        pos = self.lookup(df[state_col].values, df[year_col].values)
+        missing = pos < 0
+        take = np.maximum(pos, 0)
+        joined = {}
+        for col, values in self.columns.items():
+            if col in self.categories:
+                codes = np.where(missing, -1, values[take] if len(values) else -1)
+                joined[col] = pd.Categorical.from_codes(codes, categories=self.categories[col])
+            else:
+                gathered = values[take].astype(np.result_type(values.dtype, np.float32)) if len(values) \
+                    else np.full(len(df), np.nan)
+                gathered[missing] = np.nan
+                joined[col] = gathered
+        return df.assign(**joined)
+
+    def to_frame(self):
+        codes = self.keys // KEY_STRIDE
+        frame = pd.DataFrame({'State': pd.Categorical.from_codes(codes, categories=self.states),
+                              'Year': self.years()})
+        return self.join(frame)
+
+
+def read_climate(path):
+    df = load_typed(path, "climate_soil")
+    return df.replace([np.inf, -np.inf], np.nan)
+
+
+def load_climate_index(csv_path, index_path, extra_paths=()):
+    # Reuse the persisted index when its sources are unchanged. New extra files
+    # are added incrementally; a changed source triggers a full rebuild.
+    paths = [csv_path] + [p for p in extra_paths if p]
+    signatures = [source_signature(p) for p in paths]
+    if os.path.exists(index_path):
+        try:
+            index = ClimateIndex.load(index_path)
+            known = index.sources
+            if known == signatures[:len(known)]:
+                if len(known) < len(signatures):
+                    for path, signature in zip(paths[len(known):], signatures[len(known):]):
+                        index.add_rows(read_climate(path), [signature])
+                    index.save(index_path)
+                return index
+        except Exception as e:
+            print(f"⚠️ Rebuilding climate index: {type(e).__name__}: {e}")
+
+    index = ClimateIndex.from_frame(read_climate(csv_path), [signatures[0]])
+    for path, signature in zip(paths[1:], signatures[1:]):
+        index.add_rows(read_climate(path), [signature])
+    index.save(index_path)
+    return index
+
+
+if __name__ == "__main__":
+    CLIMATE_CSV = r"D:\Projects\GDP\data\raw\india_climate_soil_1961_2017.csv"
+    INDEX_PATH = r"D:\Projects\GDP\data\processed\climate_join_index.npz"
+    PRODUCTION_CSV = r"D:\Projects\GDP\data\raw\crop_export_production_stable.csv"
+    extra = os.environ.get("CLIMATE_EXTRA_CSVS", "").split(os.pathsep)
+
+    start = time.perf_counter()
+    index = load_climate_index(CLIMATE_CSV, INDEX_PATH, extra)
+    print(f"📦 Climate index: {len(index.keys)} rows, {len(index.states)} states, "
+          f"{index.years().min()}-{index.years().max()} ({time.perf_counter() - start:.3f}s)")
+
+    production_df = load_typed(PRODUCTION_CSV, "crop_production")
+    climate_df = read_climate(CLIMATE_CSV)
+    start = time.perf_counter()
+    hash_join = pd.merge(production_df.astype({'State': str}), climate_df.astype({'State': str}),
+                         on=['State', 'Year'], how='left')
+    hash_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = index.join(production_df)
+    index_seconds = time.perf_counter() - start
+    same = np.allclose(hash_join['Annual Rainfall (mm)'].values, indexed['Annual Rainfall (mm)'].values,
+                       equal_nan=True)
+    print(f"⚡ Join: hash merge {hash_seconds * 1000:.1f} ms, index lookup {index_seconds * 1000:.1f} ms "
+          f"(results match: {same})")
@@ -0,0 +1,329 @@
+import time
+import numpy as np
+import pandas as pd
+from series_fitting import FIT_DRIFT, drift_forecast
+
+# === Batched ARIMAX(1,1,1) engine for panels of short series ===
+# Model per series i (same form as SARIMAX(order=(1, 1, 1)) with exog, no trend):
+#   y_t = x_t b + u_t,   (1 - phi L)(1 - L) u_t = (1 + theta L) e_t
+# Differencing once gives dy_t = dx_t b + w_t with w an ARMA(1,1). Every series of
+# the panel is estimated at once: the recursions loop over time only and each
+# step is a vector operation over a padded (series x time) array.
+#
+# 1. Conditional sum of squares, Levenberg-Marquardt with an analytic Jacobian
+#    (cheap, lands close to the optimum)
+# 2. Exact Gaussian likelihood from a vectorized Kalman filter on the ARMA(1,1)
+#    state with the scale concentrated out, refined from the CSS solution. This
+#    is the likelihood statsmodels maximises, which matters for ~10-point series.
+Z_95 = 1.959963984540054
+BOUND = 0.99
+FIT_PANEL = "Panel ARIMAX"
+
+
+def pad_panel(df, key_cols, time_col, endog_col, exog_cols):
+    # Right-align every series in a NaN-padded (series x time) array
+    key_cols = [key_cols] if isinstance(key_cols, str) else list(key_cols)
+    df = df.sort_values(key_cols + [time_col], kind='stable')
+    groups = df.groupby(key_cols if len(key_cols) > 1 else key_cols[0], sort=False, observed=True)
+    keys = list(groups.groups.keys())
+    lengths = groups.size().values
+    n, t = len(keys), lengths.max()
+
+    series_idx = np.repeat(np.arange(n), lengths)
+    pos = groups.cumcount().values + (t - lengths)[series_idx]
+
+    endog = np.full((n, t), np.nan)
+    exog = np.full((n, t, len(exog_cols)), np.nan)
+    endog[series_idx, pos] = df[endog_col].values
+    exog[series_idx, pos] = df[exog_cols].values
+    last_time = groups[time_col].max().values
+    return keys, endog, exog, last_time
+
+
+class PanelARIMAX:
+    def __init__(self, method="exact", max_iter=60, tol=1e-8):
+        self.method = method
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def _unpack(self, params):
+        # tanh keeps phi / theta inside the stationary / invertible region
+        k = self._k
+        return params[:, :k], BOUND * np.tanh(params[:, k]), BOUND * np.tanh(params[:, k + 1])
+
+    def _errors(self, params, rows):
+        beta, phi, theta = self._unpack(params)
+        w = self._dy[rows] - np.einsum('ntk,nk->nt', self._dx[rows], beta)
+        return np.where(self._mask[rows], w, 0.0), phi, theta
+
+    # --- conditional sum of squares ---
+    def _css_residuals(self, params, rows, jacobian=False):
+        # e_t = w_t - phi w_{t-1} - theta e_{t-1}; optionally carries the Jacobian along
+        w, phi, theta = self._errors(params, rows)
+        mask, dx = self._mask[rows], self._dx[rows]
+        n, steps = w.shape
+        k = self._k
+        resid = np.zeros_like(w)
+        w_prev = np.zeros(n)
+        e_prev = np.zeros(n)
+        if jacobian:
+            jac = np.zeros((n, steps, k + 2))
+            d_prev = np.zeros((n, k + 2))
+            dx_prev = np.zeros((n, k))
+        for t in range(steps):
+            valid = mask[:, t]
+            e = np.where(valid, w[:, t] - phi * w_prev - theta * e_prev, 0.0)
+            if jacobian:
+                d = np.empty((n, k + 2))
+                d[:, :k] = -dx[:, t] + phi[:, None] * dx_prev
+                d[:, k] = -w_prev
+                d[:, k + 1] = -e_prev
+                d -= theta[:, None] * d_prev
+                d[~valid] = 0.0
+                jac[:, t] = d
+                d_prev, dx_prev = d, np.where(valid[:, None], dx[:, t], 0.0)
+            resid[:, t] = e
+            w_prev, e_prev = w[:, t], e
+        if not jacobian:
+            return resid
+        # Chain rule through the tanh reparameterisation
+        jac[..., k] *= (BOUND - phi ** 2 / BOUND)[:, None]
+        jac[..., k + 1] *= (BOUND - theta ** 2 / BOUND)[:, None]
+        return resid, jac
+
+    # --- exact likelihood ---
+    def _kalman(self, params, rows):
+        # Harvey form: state (w_t, theta e_t), T = [[phi, 1], [0, 0]], R = (1, theta)'.
+        # Only the (1,1) element of the state covariance changes over time:
+        # P12 = theta and P22 = theta^2 throughout. Unit innovation variance,
+        # sigma^2 is concentrated out by the caller.
+        w, phi, theta = self._errors(params, rows)
+        mask = self._mask[rows]
+        n, steps = w.shape
+        p11 = (1 + 2 * phi * theta + theta ** 2) / (1 - phi ** 2)
+        a = np.zeros(n)
+        v = np.zeros((n, steps))
+        f = np.ones((n, steps))
+        for t in range(steps):
+            valid = mask[:, t]
+            innovation = w[:, t] - a
+            gain = (phi * p11 + theta) / p11
+            v[:, t] = np.where(valid, innovation, 0.0)
+            f[:, t] = np.where(valid, p11, 1.0)
+            a = np.where(valid, phi * a + gain * innovation, a)
+            p11 = np.where(valid, phi ** 2 * p11 + 2 * phi * theta + theta ** 2 + 1 - gain ** 2 * p11, p11)
+        return v, f, a
+
+    def _exact_residuals(self, params, rows):
+        # Concentrated likelihood n log(sum v^2/F / n) + sum log F written as a
+        # sum of squares, so the same least-squares solver applies
+        v, f, _ = self._kalman(params, rows)
+        n_obs = np.maximum(self._n_obs[rows], 1)
+        log_det = (np.log(f) * self._mask[rows]).sum(axis=1)
+        return v / np.sqrt(f) * np.exp(log_det / (2 * n_obs))[:, None]
+
+    def _numeric_jacobian(self, residual_fn, params, rows):
+        resid = residual_fn(params, rows)
+        jac = np.empty(resid.shape + (params.shape[1],))
+        step = 1e-6 * np.maximum(1.0, np.abs(params))
+        for j in range(params.shape[1]):
+            shifted = params.copy()
+            shifted[:, j] += step[:, j]
+            jac[..., j] = (residual_fn(shifted, rows) - resid) / step[:, j, None]
+        return resid, jac
+
+    def _levenberg_marquardt(self, params, active, residual_fn, jacobian_fn):
+        # Batched LM: only the series that are still improving take part in an iteration
+        n, p = params.shape
+        sse = (residual_fn(params, np.arange(n)) ** 2).sum(axis=1)
+        damping = np.full(n, 1e-3)
+        iteration = 0
+        for iteration in range(1, self.max_iter + 1):
+            rows = np.flatnonzero(active)
+            if not len(rows):
+                break
+            r, jac = jacobian_fn(params[rows], rows)
+            jtj = np.einsum('ntp,ntq->npq', jac, jac)
+            jtr = np.einsum('ntp,nt->np', jac, r)
+            diag = np.maximum(np.einsum('npp->np', jtj), 1e-12)
+            lhs = jtj + (damping[rows, None] * diag)[:, :, None] * np.eye(p)
+            trial = params[rows] - np.linalg.solve(lhs, jtr[..., None])[..., 0]
+
+            trial_sse = (residual_fn(trial, rows) ** 2).sum(axis=1)
+            better = trial_sse < sse[rows]
+            improvement = np.where(better, (sse[rows] - trial_sse) / np.maximum(sse[rows], 1e-300), 0.0)
+
+            params[rows[better]] = trial[better]
+            sse[rows[better]] = trial_sse[better]
+            damping[rows] = np.where(better, damping[rows] / 3, damping[rows] * 4)
+            active[rows] = ~(better & (improvement < self.tol)) & (damping[rows] < 1e10)
+        return params, active, iteration
+
+    def fit(self, endog, exog):
+        endog = np.asarray(endog, dtype=float)
+        exog = np.asarray(exog, dtype=float)
+        n, _, k = exog.shape
+        self._k = k
+
+        valid = np.isfinite(endog) & np.isfinite(exog).all(axis=2)
+        self._mask = valid[:, 1:] & valid[:, :-1]
+        self._dy = np.where(self._mask, np.diff(np.nan_to_num(endog), axis=1), 0.0)
+        self._dx = np.where(self._mask[..., None], np.diff(np.nan_to_num(exog), axis=1), 0.0)
+        self._n_obs = self._mask.sum(axis=1)
+        fittable = self._n_obs > k + 2
+
+        # Start from per-series OLS of dy on dx (batched normal equations)
+        xtx = np.einsum('ntk,ntj->nkj', self._dx, self._dx) + 1e-8 * np.eye(k)
+        xty = np.einsum('ntk,nt->nk', self._dx, self._dy)
+        params = np.zeros((n, k + 2))
+        params[:, :k] = np.linalg.solve(xtx, xty[..., None])[..., 0]
+
+        params, active, iterations = self._levenberg_marquardt(
+            params, fittable.copy(), self._css_residuals,
+            lambda p, rows: self._css_residuals(p, rows, jacobian=True))
+        if self.method == "exact":
+            params, active, refine = self._levenberg_marquardt(
+                params, fittable.copy(), self._exact_residuals,
+                lambda p, rows: self._numeric_jacobian(self._exact_residuals, p, rows))
+            iterations += refine
+
+        rows = np.arange(n)
+        self.params_ = params
+        self.beta_, self.phi_, self.theta_ = self._unpack(params)
+        self.converged_ = ~active
+        self.iterations_ = iterations
+        self.n_obs_ = self._n_obs
+        if self.method == "exact":
+            v, f, w_next = self._kalman(params, rows)
+            self.sigma2_ = (v ** 2 / f).sum(axis=1) / np.maximum(self._n_obs, 1)
+        else:
+            resid = self._css_residuals(params, rows)
+            w, _, _ = self._errors(params, rows)
+            self.sigma2_ = (resid ** 2).sum(axis=1) / np.maximum(self._n_obs, 1)
+            w_next = self.phi_ * w[:, -1] + self.theta_ * resid[:, -1]
+
+        # State needed to forecast from the last observation of each series
+        self._w_next = w_next
+        self._last_y = endog[:, -1]
+        self._last_x = exog[:, -1]
+        return self
+
+    def forecast(self, future_exog):
+        future_exog = np.asarray(future_exog, dtype=float)
+        steps = future_exog.shape[1]
+        dx = np.diff(np.concatenate([self._last_x[:, None], future_exog], axis=1), axis=1)
+
+        # ARMA(1,1) point forecasts of the differenced error
+        w_hat = self._w_next[:, None] * self.phi_[:, None] ** np.arange(steps)[None, :]
+        mean = self._last_y[:, None] + np.cumsum(np.einsum('nhk,nk->nh', dx, self.beta_) + w_hat, axis=1)
+
+        # Integrated psi-weights give the level forecast variance
+        powers = self.phi_[:, None] ** np.arange(steps - 1)[None, :]
+        psi = np.concatenate([np.ones((len(dx), 1)), (self.phi_ + self.theta_)[:, None] * powers], axis=1)
+        variance = self.sigma2_[:, None] * np.cumsum(np.cumsum(psi, axis=1) ** 2, axis=1)
+        half_width = Z_95 * np.sqrt(variance)
+        return mean, mean - half_width, mean + half_width
+
+
+def panel_forecasts(df, key_cols, time_col, endog_col, exog_cols, steps, exog_window=1, future_exog=None):
+    # One batched fit for every series in df. Future exog is held at the mean of
+    # the last `exog_window` observations, unless future_exog maps each key to a
+    # (steps, exogs) path. Returns fit dicts shaped like
+    # series_fitting.forecast_with_budget, keyed like df.groupby(key_cols).
+    start = time.perf_counter()
+    keys, endog, exog, _ = pad_panel(df, key_cols, time_col, endog_col, exog_cols)
+    if future_exog is not None:
+        future_exog = np.stack([np.asarray(future_exog[key], dtype=float)[:steps] for key in keys])
+    else:
+        future_exog = np.repeat(np.nanmean(exog[:, -exog_window:], axis=1)[:, None], steps, axis=1)
+    model = PanelARIMAX().fit(endog, exog)
+    mean, lower, upper = model.forecast(future_exog)
+    seconds = (time.perf_counter() - start) / max(len(keys), 1)
+
+    fits = {}
+    for i, key in enumerate(keys):
+        finite = np.isfinite(mean[i]).all() and np.isfinite(lower[i]).all() and np.isfinite(upper[i]).all()
+        if finite and model.n_obs_[i] > exog.shape[2] + 2:
+            series_mean, conf_int = mean[i], np.column_stack([lower[i], upper[i]])
+            method, note = FIT_PANEL, "" if model.converged_[i] else "iteration limit reached"
+        else:
+            series_mean, conf_int = drift_forecast(endog[i][np.isfinite(endog[i])], steps)
+            method, note = FIT_DRIFT, "too few observations or non-finite panel forecast"
+        fits[key] = {
+            'mean': pd.Series(series_mean),
+            'conf_int': pd.DataFrame(conf_int, columns=['lower', 'upper']),
+            'method': method,
+            'note': note,
+            'seconds': seconds
+        }
+    return fits
+
+
+def validate_against_statsmodels(endog, exog, future_exog, sample=None, method="exact"):
+    # Fit a sample of series one by one with statsmodels and compare forecasts
+    import warnings
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    warnings.filterwarnings("ignore")
+
+    panel = PanelARIMAX(method=method).fit(endog, exog)
+    mean, _, _ = panel.forecast(future_exog)
+    rows = range(len(endog)) if sample is None else sample
+    report = []
+    for i in rows:
+        # statsmodels' approximate-diffuse prior on the level has a fixed variance
+        # (1e6), which is not diffuse for revenue-sized series; fit in std units
+        valid = np.isfinite(endog[i])
+        scale = np.std(endog[i][valid]) or 1.0
+        model = SARIMAX(endog[i][valid] / scale, exog=exog[i][valid], order=(1, 1, 1))
+        model_fit = model.fit(disp=False)
+        reference = scale * model_fit.get_forecast(steps=future_exog.shape[1], exog=future_exog[i]).predicted_mean
+        # Score the panel estimate with statsmodels' own likelihood
+        panel_params = np.r_[panel.beta_[i] / scale, panel.phi_[i], panel.theta_[i], panel.sigma2_[i] / scale ** 2]
+        report.append({
+            'series': i,
+            'phi_panel': panel.phi_[i], 'phi_statsmodels': model_fit.params[-3],
+            'theta_panel': panel.theta_[i], 'theta_statsmodels': model_fit.params[-2],
+            'llf_panel': model.loglike(panel_params), 'llf_statsmodels': model_fit.llf,
+            'forecast_rel_diff': np.max(np.abs(mean[i] - reference) / np.maximum(np.abs(reference), 1e-9))
+        })
+    return pd.DataFrame(report)
+
+
+def benchmark(endog, exog, future_exog, n_series=5000, method="exact", seed=0):
+    # Throughput on a large synthetic panel built by jittering the real series
+    rng = np.random.default_rng(seed)
+    reps = max(1, n_series // len(endog))
+    big_endog = np.tile(endog, (reps, 1)) * rng.normal(1.0, 0.02, (reps * len(endog), 1))
+    big_exog = np.tile(exog, (reps, 1, 1))
+    start = time.perf_counter()
+    PanelARIMAX(method=method).fit(big_endog, big_exog).forecast(np.tile(future_exog, (reps, 1, 1)))
+    return len(big_endog), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    production_df = pd.read_csv(r"D:\Projects\GDP\data\raw\crop_export_production_stable.csv")
+    climate_df = pd.read_csv(r"D:\Projects\GDP\data\raw\india_climate_soil_1961_2017.csv")
+    merged = pd.merge(production_df, climate_df, on=['State', 'Year'], how='left')
+    merged = merged.replace([np.inf, -np.inf], np.nan).dropna(
+        subset=['Production Quantity', 'Export Volume', 'Annual Rainfall (mm)'])
+    it_df = pd.read_csv(r"D:\Projects\GDP\data\raw\IT_Sector_India_2010_2020.csv")
+    it_df = it_df.replace([np.inf, -np.inf], np.nan).dropna()
+
+    panels = {
+        "Agriculture (State x Crop)": pad_panel(merged, ['State', 'Crop'], 'Year', 'Production Quantity',
+                                                ['Export Volume', 'Annual Rainfall (mm)']),
+        "IT (State)": pad_panel(it_df, 'State', 'Year', 'State_IT_Revenue(Cr)',
+                                ['Repo_Rate(%)', 'Global_Economic_Index'])
+    }
+    for name, (keys, endog, exog, _) in panels.items():
+        future_exog = np.repeat(np.nanmean(exog[:, -3:], axis=1)[:, None], 10, axis=1)
+        print(f"\n=== {name}: {len(keys)} series ===")
+        for method in ("css", "exact"):
+            report = validate_against_statsmodels(endog, exog, future_exog, method=method)
+            at_least = (report['llf_panel'] >= report['llf_statsmodels'] - 1e-3).sum()
+            print(f"🔎 {method}: median / max relative forecast difference vs statsmodels: "
+                  f"{report['forecast_rel_diff'].median():.2%} / {report['forecast_rel_diff'].max():.2%}, "
+                  f"log-likelihood at least as high on {at_least}/{len(report)} series")
+            n_series, elapsed = benchmark(endog, exog, future_exog, method=method)
+            print(f"⚡ {method}: {n_series} series fitted + forecast in {elapsed:.2f}s "
+                  f"({n_series / elapsed:,.0f} series/s)")
@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+
+# === Structured sectoral result store ===
+# agriculture.py and ITsector.py each own one top-level section of a shared
+# JSON document that sits next to the text reports. Dashboard.py reads the
+# whole file with a single json.load instead of re-parsing the .txt reports.
+STORE_FILENAME = "sectoral_results.json"
+SCHEMA_VERSION = 1
+
+
+def _to_builtin(value):
+    # numpy / pandas scalars are not JSON serialisable
+    if isinstance(value, dict):
+        return {str(k): _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _to_builtin(value.tolist())
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def load_store(store_path):
+    if not os.path.exists(store_path):
+        return {}
+    with open(store_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_section(store_path, section, payload):
+    # Replace one section and keep the other pipeline's results untouched
+    store = load_store(store_path)
+    store["schema_version"] = SCHEMA_VERSION
+    store[section] = _to_builtin(payload)
+
+    # Write to a temp file first so readers never see a half-written store
+    os.makedirs(os.path.dirname(store_path) or ".", exist_ok=True)
+    tmp_path = store_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False)
+    os.replace(tmp_path, store_path)
+
+
+def records(df):
+    # DataFrame -> list of plain dicts in row order
+    return _to_builtin(df.to_dict(orient="records"))
+
+
+def compact_series(history_years, history, forecast_years, forecast, conf_int, decimals=2):
+    # Forecast series in the smallest form the dashboard needs to draw a chart
+    conf_int = np.asarray(conf_int, dtype=float)
+    return {
+        "history_years": [int(y) for y in history_years],
+        "history": np.round(np.asarray(history, dtype=float), decimals),
+        "forecast_years": [int(y) for y in forecast_years],
+        "forecast": np.round(np.asarray(forecast, dtype=float), decimals),
+        "lower": np.round(conf_int[:, 0], decimals),
+        "upper": np.round(conf_int[:, 1], decimals)
+    }
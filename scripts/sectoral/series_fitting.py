@@ -0,0 +1,119 @@
+import os
+import time
+import threading
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+# === Per-series fit budget ===
+# A slow-converging or pathological series must not stall a sectoral run: each
+# SARIMAX fit gets a wall-clock and optimizer-iteration budget, and series that
+# exceed it (or fail) fall back to a closed-form drift forecast and are flagged.
+# The fit and forecast run in a daemon thread and the caller waits at most the
+# wall-clock budget for them, so a single slow likelihood evaluation can't hold
+# the run up. A thread can't be interrupted: an abandoned fit stops at its next
+# optimizer iteration, when the callback sees the budget is gone. The next fit
+# waits for that before its own clock starts, so two fits never share the CPU
+# and a timeout can't eat into the next series' budget.
+FIT_TIME_BUDGET = float(os.environ.get("SECTORAL_FIT_SECONDS", 5.0))
+FIT_MAX_ITER = int(os.environ.get("SECTORAL_FIT_MAXITER", 200))
+# "sarimax" fits each series on its own; "panel" fits all series of a run in one
+# batched ARIMAX(1,1,1) estimation (see panel_arima.py)
+FIT_ENGINE = os.environ.get("SECTORAL_FIT_ENGINE", "sarimax").lower()
+Z_95 = 1.959963984540054
+
+FIT_SARIMAX = "SARIMAX"
+FIT_DRIFT = "Drift (fallback)"
+
+
+class FitBudgetExceeded(Exception):
+    pass
+
+
+# Fits past their budget that haven't reached their next iteration yet
+_abandoned = []
+
+
+def _wait_for_abandoned():
+    while _abandoned:
+        _abandoned.pop().join()
+
+
+def drift_forecast(endog, steps):
+    # Random walk with drift: last value + mean historical change per step
+    y = np.asarray(endog, dtype=float)
+    diffs = np.diff(y)
+    n = len(diffs)
+    drift = diffs.mean() if n else 0.0
+    sigma = diffs.std(ddof=1) if n > 1 else 0.0
+    h = np.arange(1, steps + 1)
+    mean = y[-1] + drift * h
+    se = sigma * np.sqrt(h * (1 + h / max(n, 1)))
+    return mean, np.column_stack([mean - Z_95 * se, mean + Z_95 * se])
+
+
+def _fit_and_forecast(endog, exog, future_exog, steps, order, max_iter, callback):
+    # Plain arrays: the forecast exog never shares the history's index
+    model = SARIMAX(
+        np.asarray(endog, dtype=float),
+        exog=np.asarray(exog, dtype=float),
+        order=order,
+        seasonal_order=(0, 0, 0, 0)
+    )
+    model_fit = model.fit(disp=False, maxiter=max_iter, callback=callback)
+    if not model_fit.mle_retvals.get("converged", True):
+        raise FitBudgetExceeded(f"no convergence within {max_iter} iterations")
+
+    forecast = model_fit.get_forecast(steps=steps, exog=np.asarray(future_exog, dtype=float))
+    mean = np.asarray(forecast.predicted_mean)
+    conf_int = np.asarray(forecast.conf_int())
+    if not (np.isfinite(mean).all() and np.isfinite(conf_int).all()):
+        raise ValueError("non-finite forecast")
+    return mean, conf_int
+
+
+def forecast_with_budget(endog, exog, future_exog, steps, label, order=(1, 1, 1),
+                         time_budget=None, max_iter=None):
+    time_budget = FIT_TIME_BUDGET if time_budget is None else time_budget
+    max_iter = FIT_MAX_ITER if max_iter is None else max_iter
+    budget_note = f"exceeded {time_budget:.1f}s fit budget"
+    _wait_for_abandoned()
+    start = time.perf_counter()
+
+    def check_budget(params):
+        if time.perf_counter() - start > time_budget:
+            raise FitBudgetExceeded(budget_note)
+
+    outcome = {}
+
+    def fit():
+        try:
+            outcome["forecast"] = _fit_and_forecast(endog, exog, future_exog, steps, order, max_iter, check_budget)
+        except Exception as e:
+            outcome["error"] = e
+
+    # Daemon: a fit still running at interpreter exit never holds the process open
+    worker = threading.Thread(target=fit, name=f"fit {label}", daemon=True)
+    worker.start()
+    worker.join(time_budget)
+    try:
+        if worker.is_alive():
+            _abandoned.append(worker)
+            raise FitBudgetExceeded(budget_note)
+        if "error" in outcome:
+            raise outcome["error"]
+        mean, conf_int = outcome["forecast"]
+        method, note = FIT_SARIMAX, ""
+    except Exception as e:
+        note = str(e) if isinstance(e, FitBudgetExceeded) else f"{type(e).__name__}: {e}"
+        print(f"⚠️ {label}: {note} — using drift fallback")
+        mean, conf_int = drift_forecast(endog, steps)
+        method = FIT_DRIFT
+
+    return {
+        'mean': pd.Series(mean),
+        'conf_int': pd.DataFrame(conf_int, columns=['lower', 'upper']),
+        'method': method,
+        'note': note,
+        'seconds': time.perf_counter() - start
+    }
@@ -2,25 +2,21 @@ import pandas as pd
 import numpy as np
 import xgboost as xgb
 import os
+import sys
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "national"))
+from pipeline import country_paths
+from design_matrix import load_design_matrix
+
 print("\n📊 Backtesting GDP Forecasts (2020–2024) with Custom Drift Weights...\n")
 
 # === Load Residual XGBoost Model ===
 xgb_model = xgb.Booster()
 xgb_model.load_model(r"D:\Projects\GDP\models\xgb_residual.json")
 
-# === Load SARIMAX Predictions ===
-sarimax_preds = pd.read_csv(r"D:\Projects\GDP\data\processed\sarimax_predictions.csv")
-sarimax_preds.columns = sarimax_preds.columns.str.strip()
-sarimax_preds["Year"] = sarimax_preds["Year"].astype(int)
-prediction_col = [col for col in sarimax_preds.columns if col.lower() != "year"][0]
-
-# === Load Feature Set ===
-features_df = pd.read_csv(r"D:\Projects\GDP\data\processed\processed_data.csv")
-features_df.columns = features_df.columns.str.strip()
-features_df["Year"] = features_df["Year"].astype(int)
-features_df.set_index("Year", inplace=True)
+# === SARIMAX fit and booster features, aligned by year in the shared design matrix ===
+design = load_design_matrix(country_paths())
 
 # === Actual GDP Growth (Ground Truth) ===
 actual_gdp_growth = {
@@ -45,9 +41,9 @@ results = []
 
 for year in range(2020, 2025):
     try:
-        sarimax_point = sarimax_preds[sarimax_preds["Year"] == year][prediction_col].values[0]
-        xgb_features = features_df.loc[[year]].drop(columns=["GDP Growth (%)"], errors='ignore')
-        dmatrix = xgb.DMatrix(xgb_features, feature_names=xgb_features.columns.tolist())
+        row = design.rows([year])
+        sarimax_point = design.column("SARIMAX_Pred")[row][0]
+        dmatrix = xgb.DMatrix(design.features[row], feature_names=design.feature_cols)
 
         residual = xgb_model.predict(dmatrix)[0]
         hybrid_forecast = sarimax_point + residual
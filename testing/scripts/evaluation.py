@@ -1,13 +1,20 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import os
+import sys
 
-# === Load datasets ===
-df = pd.read_csv("data/processed/processed_data.csv")
-sarimax_df = pd.read_csv("data/processed/sarimax_predictions.csv")
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "common"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "national"))
+from render_service import PlotQueue
+from pipeline import country_paths
+from design_matrix import load_design_matrix
+
+plots = PlotQueue()
+
+# === Load datasets (history with the SARIMAX fit already aligned) ===
+design = load_design_matrix(country_paths())
+df = design.frame(["Year", "GDP Growth (%)", "SARIMAX_Pred"])
 baseline_df = pd.read_csv("results/national/gdp_forecast_baseline_2025_2026.csv")
 reform_df = pd.read_csv("results/national/gdp_forecast_reform_2027_2030.csv")
 crisis_df = pd.read_csv("results/national/gdp_forecast_crisis_2027_2030.csv")
@@ -23,8 +30,7 @@ scenario_df = pd.concat([reform_df, crisis_df, mixed_df], ignore_index=True)
 # Correct GDP contraction for COVID year
 df.loc[df["Year"] == 2020, "GDP Growth (%)"] = -7.3
 
-# === Merge SARIMAX predictions and compute residuals ===
-df = df.merge(sarimax_df[["Year", "SARIMAX_Pred"]], on="Year", how="left")
+# === Residuals against the corrected history ===
 df["Residual"] = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
 
 # === Evaluation metrics: SARIMAX (1980–2024) ===
@@ -45,30 +51,22 @@ hybrid_rmse = mean_squared_error(final_baseline, final_forecast) ** 0.5
 hybrid_mae = mean_absolute_error(final_baseline, final_forecast)
 hybrid_mape = np.mean(np.abs((final_forecast - final_baseline) / final_baseline)) * 100
 
-# === Output directory ===
-os.makedirs("plots", exist_ok=True)
-
 # === Plot 1: GDP Forecasts by Scenario (2025–2030) ===
-plt.figure(figsize=(12, 6))
-for scenario in forecast_df["Scenario"].dropna().unique():
-    subset = forecast_df[forecast_df["Scenario"] == scenario]
-    plt.plot(subset["Year"], subset["Final GDP Forecast (%)"], marker='o', label=scenario)
-plt.title("GDP Forecasts by Scenario (2025–2030)")
-plt.xlabel("Year")
-plt.ylabel("Final GDP Forecast (%)")
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.savefig("results/national/plots/gdp_forecast_scenarios.png", bbox_inches='tight')
-plt.close()
+scenario_series = [
+    {"x": subset["Year"].values, "y": subset["Final GDP Forecast (%)"].values,
+     "style": {"marker": "o", "label": scenario}}
+    for scenario, subset in forecast_df.groupby("Scenario", sort=False)
+]
+plots.submit(
+    "lines", "results/national/plots/gdp_forecast_scenarios.png",
+    savefig={"bbox_inches": "tight"},
+    series=scenario_series,
+    title="GDP Forecasts by Scenario (2025–2030)",
+    xlabel="Year",
+    ylabel="Final GDP Forecast (%)"
+)
 
 # === Plot 2: Actual vs Final Forecast (1980–2030) ===
-plt.figure(figsize=(12, 6))
-
-# Plot actual GDP (1980–2024)
-plt.plot(df["Year"], df["GDP Growth (%)"], label="Actual GDP (1980–2024)", color='black', linewidth=2)
-
-# Plot each scenario's final forecast (2025–2030)
 scenario_colors = {
     "Baseline": "green",
     "Reform": "orange",
@@ -76,89 +74,82 @@ scenario_colors = {
     "Mixed": "purple"
 }
 
-for scenario in forecast_df["Scenario"].dropna().unique():
-    subset = forecast_df[forecast_df["Scenario"] == scenario]
-    plt.plot(
-        subset["Year"],
-        subset["Final GDP Forecast (%)"],
-        label=f"{scenario} Forecast",
-        linestyle='--',
-        marker='o',
-        color=scenario_colors.get(scenario, 'gray')
-    )
-
-plt.xlabel("Year")
-plt.ylabel("GDP Growth (%)")
-plt.title("Actual vs GDP Forecast (1980–2030)")
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig("results/national/plots/gdp_forecast_comparison.png", bbox_inches='tight')
-plt.close()
-
-
+# Actual GDP (1980–2024) followed by each scenario's final forecast (2025–2030)
+comparison_series = [
+    {"x": df["Year"].values, "y": df["GDP Growth (%)"].values,
+     "style": {"label": "Actual GDP (1980–2024)", "color": "black", "linewidth": 2}}
+]
+for scenario, subset in forecast_df.groupby("Scenario", sort=False):
+    comparison_series.append({
+        "x": subset["Year"].values,
+        "y": subset["Final GDP Forecast (%)"].values,
+        "style": {"label": f"{scenario} Forecast", "linestyle": "--", "marker": "o",
+                  "color": scenario_colors.get(scenario, "gray")}
+    })
+plots.submit(
+    "lines", "results/national/plots/gdp_forecast_comparison.png",
+    savefig={"bbox_inches": "tight"},
+    series=comparison_series,
+    title="Actual vs GDP Forecast (1980–2030)",
+    xlabel="Year",
+    ylabel="GDP Growth (%)"
+)
 
 # === Plot 3: SARIMAX Residual Histogram ===
-plt.figure(figsize=(8, 5))
-sns.histplot(df["Residual"], kde=True, color="skyblue", bins=20)
-plt.title("SARIMAX Residual Distribution")
-plt.xlabel("Residual (Actual - Predicted)")
-plt.grid(True)
-plt.tight_layout()
-plt.savefig("results/national/plots/sarimax_residual_histogram.png", bbox_inches='tight')
-plt.close()
+plots.submit(
+    "histogram", "results/national/plots/sarimax_residual_histogram.png",
+    savefig={"bbox_inches": "tight"},
+    values=df["Residual"].values,
+    title="SARIMAX Residual Distribution",
+    xlabel="Residual (Actual - Predicted)"
+)
 
 # === Plot 4: Top 25 Correlation Matrix ===
-exclude_cols = ["Year", "GDP Growth (%)", "SARIMAX_Pred", "Residual"]
-numeric_cols = df.drop(columns=exclude_cols, errors='ignore').select_dtypes(include=[np.number])
-corr = numeric_cols.corr()
+# The booster's feature columns (Year, GDP and the SARIMAX fit are not among them)
+corr = design.feature_frame().corr()
 top_corr = corr.iloc[:25, :25]
 
-plt.figure(figsize=(16, 12))
-sns.heatmap(top_corr, annot=True, fmt=".2f", cmap="coolwarm", square=True,
-            annot_kws={"size": 8}, cbar_kws={"shrink": 0.7})
-plt.xticks(rotation=45, ha='right', fontsize=9)
-plt.yticks(fontsize=9)
-plt.title("Top 25 Correlated Macroeconomic Features", fontsize=14)
-plt.tight_layout()
-plt.savefig("results/national/plots/feature_correlation_top25.png", dpi=300, bbox_inches='tight')
-plt.close()
+plots.submit(
+    "heatmap", "results/national/plots/feature_correlation_top25.png",
+    savefig={"dpi": 300, "bbox_inches": "tight"},
+    matrix=top_corr,
+    title="Top 25 Correlated Macroeconomic Features",
+    heatmap_kwargs={"annot": True, "fmt": ".2f", "cmap": "coolwarm", "square": True,
+                    "annot_kws": {"size": 8}, "cbar_kws": {"shrink": 0.7}}
+)
 
 # === Plot 5: Model Evaluation Bar Chart ===
 metrics = ['RMSE', 'MAE', 'MAPE']
 sarimax_vals = [sarimax_rmse, sarimax_mae, sarimax_mape]
 hybrid_vals = [hybrid_rmse, hybrid_mae, hybrid_mape]
 
-x = np.arange(len(metrics))
-width = 0.35
-
-plt.figure(figsize=(8, 5))
-plt.bar(x - width/2, sarimax_vals, width, label='SARIMAX', color='skyblue')
-plt.bar(x + width/2, hybrid_vals, width, label='Hybrid', color='seagreen')
-plt.xticks(x, metrics)
-plt.ylabel("Error")
-plt.title("Model Evaluation: SARIMAX vs Hybrid")
-plt.legend()
-plt.tight_layout()
-plt.savefig("results/national/plots/model_evaluation_bar.png", bbox_inches='tight')
-plt.close()
+plots.submit(
+    "grouped_bar", "results/national/plots/model_evaluation_bar.png",
+    savefig={"bbox_inches": "tight"},
+    categories=metrics,
+    groups=[
+        {"values": sarimax_vals, "label": "SARIMAX", "color": "skyblue"},
+        {"values": hybrid_vals, "label": "Hybrid", "color": "seagreen"}
+    ],
+    ylabel="Error",
+    title="Model Evaluation: SARIMAX vs Hybrid"
+)
 
 # === Plot 6: Actual GDP Growth (1980–2030) ===
 actual_years = df[["Year", "GDP Growth (%)"]].copy()
 actual_years.rename(columns={"GDP Growth (%)": "GDP Growth"}, inplace=True)
 actual_years.loc[actual_years["Year"] == 2020, "GDP Growth"] = -7.3
 
-plt.figure(figsize=(12, 6))
-plt.plot(actual_years["Year"], actual_years["GDP Growth"], label="Actual GDP", color='black')
-plt.xlabel("Year")
-plt.ylabel("GDP Growth (%)")
-plt.title("Actual GDP Growth (1980–2030)")
-plt.grid(True)
-plt.legend()
-plt.ylim(-6.5, 10)
-plt.tight_layout()
-plt.savefig("results/national/plots/actual_gdp_growth_1980_2030.png", bbox_inches='tight')
-plt.close()
+plots.submit(
+    "lines", "results/national/plots/actual_gdp_growth_1980_2030.png",
+    savefig={"bbox_inches": "tight"},
+    series=[{"x": actual_years["Year"].values, "y": actual_years["GDP Growth"].values,
+             "style": {"label": "Actual GDP", "color": "black"}}],
+    title="Actual GDP Growth (1980–2030)",
+    xlabel="Year",
+    ylabel="GDP Growth (%)",
+    ylim=(-6.5, 10)
+)
 
 # === Print Final Evaluation Summary ===
 print("\n📊 MODEL EVALUATION SUMMARY\n")
@@ -174,10 +165,8 @@ print(f"   RMSE  : {hybrid_rmse:.3f}")
 print(f"   MAE   : {hybrid_mae:.3f}")
 print(f"   MAPE  : {hybrid_mape:.2f}%")
 
-print("\n📈 Plots saved to 'plots/' directory:")
-print("- gdp_forecast_scenarios.png")
-print("- gdp_forecast_comparison.png")
-print("- sarimax_residual_histogram.png")
-print("- feature_correlation_top25.png")
-print("- model_evaluation_bar.png")
-print("- actual_gdp_growth_1980_2030.png")
+saved_plots = plots.close()
+if saved_plots:
+    print("\n📈 Plots saved to 'results/national/plots/' directory:")
+    for plot_path in saved_plots:
+        print(f"- {os.path.basename(plot_path)}")
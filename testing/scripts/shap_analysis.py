@@ -1,19 +1,15 @@
 import shap
 import xgboost as xgb
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
 
-# === Load processed data ===
-df = pd.read_csv("data/processed/processed_data.csv")
-sarimax_df = pd.read_csv("data/processed/sarimax_predictions.csv")
-df = df.merge(sarimax_df[["Year", "SARIMAX_Pred"]], on="Year", how="left")
-df["Residual"] = df["GDP Growth (%)"] - df["SARIMAX_Pred"]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "national"))
+from pipeline import country_paths
+from design_matrix import load_design_matrix
 
-# === Feature selection ===
-exclude_cols = ["Year", "GDP Growth (%)", "SARIMAX_Pred", "Residual"]
-feature_cols = [col for col in df.columns if col not in exclude_cols and df[col].dtype in [float, int]]
-X = df[feature_cols]
+# === Booster features from the shared design matrix (pruned or not) ===
+X = load_design_matrix(country_paths()).feature_frame()
 
 # === Load trained booster ===
 booster = xgb.Booster()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conformal import CORRECTION_CLIP, add_intervals, calibrate, interval_columns, oof_errors
+
+
+@pytest.mark.parametrize("level", [0.8, 0.95])
+def test_split_conformal_coverage(level):
+    # Exchangeable errors: the band from n calibration errors covers a new one
+    # with probability >= level, averaged over calibration draws
+    rng = np.random.default_rng(0)
+    trials, n = 4000, 40
+    errors = rng.standard_t(df=4, size=(trials, n + 1))
+    covered = 0
+    for calibration_errors, new_error in zip(errors[:, :n], errors[:, n]):
+        lower, upper = calibrate(calibration_errors, [level])["intervals"][f"{level:g}"]
+        covered += lower <= new_error <= upper
+    coverage = covered / trials
+    assert level - 0.02 <= coverage <= level + 0.06
+
+
+def test_small_sample_gets_widest_errors():
+    calibration = calibrate([-0.5, 0.2, 1.5], [0.95])
+    assert calibration["n_calibration"] == 3
+    assert calibration["intervals"]["0.95"] == [-0.5, 1.5]
+
+
+def test_oof_errors_clip_correction():
+    predictions = pd.DataFrame({"True_Residual": [1.0, -2.0], "Predicted_Residual": [3.0, -0.5]})
+    np.testing.assert_allclose(oof_errors(predictions), [1.0 - CORRECTION_CLIP, -1.5])
+
+
+def test_add_intervals_offsets_point_forecast():
+    df = pd.DataFrame({"Final GDP Forecast (%)": [6.0, 7.0]})
+    add_intervals(df, {"n_calibration": 10, "intervals": {"0.8": [-1.0, 0.5]}})
+    lower_col, upper_col = interval_columns("0.8")
+    np.testing.assert_allclose(df[lower_col], [5.0, 6.0])
+    np.testing.assert_allclose(df[upper_col], [6.5, 7.5])
+
+
+@pytest.mark.parametrize("level, label", [(0.8, "80%"), (0.95, "95%"), (0.954, "95.4%"), (0.975, "97.5%"),
+                                          (0.995, "99.5%"), (0.7, "70%")])
+def test_interval_columns_keep_every_digit(level, label):
+    assert interval_columns(level) == (f"Lower {label}", f"Upper {label}")
+
+
+def test_repeated_level_rejected():
+    with pytest.raises(ValueError):
+        calibrate([-1.0, 0.0, 1.0], [0.95, 0.95])
+
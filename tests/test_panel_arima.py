@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from panel_arima import validate_against_statsmodels
+
+
+def synthetic_panel(n_series=8, n_years=40, steps=5, seed=0):
+    # ARIMAX(1,1,1) series with two exogenous drivers and random coefficients
+    rng = np.random.default_rng(seed)
+    exog = rng.normal(size=(n_series, n_years + steps, 2))
+    endog = np.empty((n_series, n_years))
+    for i in range(n_series):
+        phi, theta = rng.uniform(-0.6, 0.6, 2)
+        beta = rng.normal(size=2)
+        shocks = rng.normal(size=n_years)
+        change = np.zeros(n_years)
+        for t in range(1, n_years):
+            change[t] = phi * change[t - 1] + shocks[t] + theta * shocks[t - 1]
+        endog[i] = 100 + np.cumsum(change) + exog[i, :n_years] @ beta
+    return endog, exog[:, :n_years], exog[:, n_years:]
+
+
+@pytest.fixture(scope="module")
+def panel():
+    return synthetic_panel()
+
+
+def test_exact_matches_statsmodels(panel):
+    report = validate_against_statsmodels(*panel, method="exact")
+    assert report["forecast_rel_diff"].max() < 5e-3
+    # The panel optimum is at least as good as statsmodels' up to optimizer noise
+    assert (report["llf_panel"] >= report["llf_statsmodels"] - 0.05).all()
+
+
+def test_css_close_to_statsmodels(panel):
+    # Conditional sum of squares drops the first residual's prior, so it only approximates the MLE
+    report = validate_against_statsmodels(*panel, method="css")
+    assert report["forecast_rel_diff"].median() < 5e-3
+    assert report["forecast_rel_diff"].max() < 1e-2
+    assert (report["llf_panel"] >= report["llf_statsmodels"] - 0.25).all()
+
+
+def test_ragged_series_match_statsmodels(panel):
+    # pad_panel left-pads shorter series with NaN
+    endog, exog, future_exog = panel
+    endog = endog.copy()
+    endog[::2, :10] = np.nan
+    report = validate_against_statsmodels(endog, exog, future_exog, method="exact")
+    # On 30 points either optimizer can stop at a slightly different optimum (either side)
+    assert report["forecast_rel_diff"].median() < 1e-3
+    assert report["forecast_rel_diff"].max() < 2e-2
+    assert (report["llf_panel"] >= report["llf_statsmodels"] - 0.25).all()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from reconciliation import HIERARCHIES, Hierarchy, benchmark, block_cg
+
+
+def small_hierarchy(n_states=4, n_crops=3):
+    keys = [(f"S{s}", f"C{c}") for s in range(n_states) for c in range(n_crops)]
+    return Hierarchy(keys, HIERARCHIES["agriculture"]["levels"], HIERARCHIES["agriculture"]["key_names"])
+
+
+def dense_reconcile(hierarchy, base, weights):
+    # S (S' W^-1 S)^-1 S' W^-1 base, one column at a time
+    S = hierarchy.S.toarray()
+    weights = np.broadcast_to(weights, base.shape)
+    columns = []
+    for j in range(base.shape[1]):
+        winv = 1.0 / weights[:, j]
+        columns.append(S @ np.linalg.solve(S.T @ (winv[:, None] * S), S.T @ (winv * base[:, j])))
+    return np.column_stack(columns)
+
+
+def test_summing_matrix():
+    hierarchy = small_hierarchy()
+    # India, 4 states, 3 crops, then the 12 bottom series
+    assert hierarchy.S.shape == (1 + 4 + 3 + 12, 12)
+    assert hierarchy.n_aggregate == 8
+    assert hierarchy.S[0].sum() == 12
+    np.testing.assert_array_equal(hierarchy.S[hierarchy.n_aggregate:].toarray(), np.eye(12))
+
+
+def test_block_cg_solves_spd_system():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(30, 30))
+    A = M @ M.T + 30 * np.eye(30)
+    B = rng.normal(size=(30, 4))
+    X, iterations = block_cg(lambda P: A @ P, B, np.diag(A)[:, None])
+    assert iterations < 30
+    np.testing.assert_allclose(X, np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
+
+
+@pytest.mark.parametrize("method", ["ols", "wls_struct", "mint_diag"])
+def test_reconcile_matches_dense_solve(method):
+    hierarchy = small_hierarchy()
+    rng = np.random.default_rng(1)
+    bottom = rng.gamma(2.0, 50.0, (hierarchy.n_bottom, 6))
+    base = hierarchy.aggregate(bottom) * (1 + rng.normal(0.0, 0.1, (len(hierarchy.nodes), 6)))
+    variances = (0.1 * np.abs(base)) ** 2
+    reconciled, _ = hierarchy.reconcile(base, method, variances)
+
+    expected = dense_reconcile(hierarchy, base, hierarchy.weights(method, variances))
+    np.testing.assert_allclose(reconciled, expected, rtol=1e-8)
+    # Coherent: every aggregate is the sum of its reconciled bottom series
+    np.testing.assert_allclose(hierarchy.aggregate(reconciled[hierarchy.n_aggregate:]), reconciled, rtol=1e-12)
+
+
+def test_bottom_up_keeps_bottom_forecasts():
+    hierarchy = small_hierarchy()
+    base = np.random.default_rng(2).gamma(2.0, 50.0, (len(hierarchy.nodes), 3))
+    reconciled, iterations = hierarchy.reconcile(base, "bottom_up")
+    assert iterations == 0
+    np.testing.assert_array_equal(reconciled[hierarchy.n_aggregate:], base[hierarchy.n_aggregate:])
+    np.testing.assert_allclose(reconciled[0], base[hierarchy.n_aggregate:].sum(axis=0))
+
+
+def test_benchmark_coherent_and_close_to_dense():
+    stats = benchmark(n_states=20, n_crops=10, scenarios=2, steps=5)
+    assert stats["bottom"] == 200
+    assert stats["coherence"] < 1e-6
+    assert stats["dense_rel_gap"] < 1e-8